@@ -3,21 +3,37 @@
 # See the file COPYING for more details.
 # Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
 
+# The start time is taken before the rest of the imports, which are part of the startup cost
+# ruff: noqa: E402
+import time
+
+# The moment the import of the add-on started, used to measure its startup cost
+_importStart: float = time.perf_counter()
+
+import os
+import sys
 from collections.abc import Callable
-from typing import override
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, override
 
 import addonHandler
 import config
 import globalPluginHandler
 import gui
+import inputCore
+import ui
 import wx  # type: ignore
 from globalVars import appArgs
 from inputCore import InputGesture
 from logHandler import log
 from scriptHandler import script
 
-from . import base
-from .graphui import DuplicatedGesturesDialog, UnsignedGesturesDialog
+from .watcher import ConflictWatcher
+
+# The scan machinery and the dialogs are imported on first use, so they do not slow down the NVDA startup
+if TYPE_CHECKING:
+	from . import base
+	from .graphui import ScanProgressDialog
 
 try:
 	addonHandler.initTranslation()
@@ -30,14 +46,28 @@ ADDON_NAME: str = _addon.manifest["name"]
 ADDON_SUMMARY: str = _addon.manifest["summary"]
 
 
-class Duplicates(base.Duplicates):
-	# Translators: The title of the gestures list dialog and menu item
-	name: str = _("Search for &duplicate gestures")
+# Translators: The title of the gestures list dialog and menu item
+DUPLICATES: str = _("Search for &duplicate gestures")
+# Translators: The title of the gestures list dialog and menu item
+PROFILE_DUPLICATES: str = _("Duplicate gestures in all &profiles and layouts")
+# Translators: The title of the gestures list dialog and menu item
+UNSIGNED: str = _("Gestures &without description")
 
 
-class Unsigned(base.Unsigned):
-	# Translators: The title of the gestures list dialog and menu item
-	name: str = _("Gestures &without description")
+def filteredGestures(kind: str, name: str) -> "base.FilteredGestures":
+	"""Create a filtered collection of input gestures, importing the scan machinery on first use.
+	@param kind: the name of the collection class in the base module, e.g. "Duplicates"
+	@type kind: str
+	@param name: the title of the gestures list dialog and menu item
+	@type name: str
+	@return: an empty collection that will be filled on first access
+	@rtype: base.FilteredGestures
+	"""
+	from . import base
+
+	gestures: base.FilteredGestures = getattr(base, kind)()
+	gestures.name = name
+	return gestures
 
 
 class GlobalPlugin(globalPluginHandler.GlobalPlugin):
@@ -49,44 +79,169 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 	def __init__(self, *args, **kwargs) -> None:
 		"""Initialization of the add-on global plugin."""
 		super(GlobalPlugin, self).__init__(*args, **kwargs)
-		if appArgs.secure or config.isAppX:
-			return
-		self.createMenu()
+		self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=ADDON_NAME)
+		self._progress: "ScanProgressDialog | None" = None
+		self._scan: Future[None] | None = None
+		self._watcher: ConflictWatcher | None = None
+		config.post_configProfileSwitch.register(self.onConfigChanged)
+		config.post_configReset.register(self.onConfigChanged)
+		if not (appArgs.secure or config.isAppX):
+			self.createMenu()
+			self._watcher = ConflictWatcher(self._executor)
+			self._watcher.start()
+		log.debug(
+			"%s started in %.1f ms, dialogs loaded: %s, scan machinery loaded: %s",
+			ADDON_NAME,
+			(time.perf_counter() - _importStart) * 1000,
+			__name__ + ".graphui" in sys.modules,
+			__name__ + ".base" in sys.modules,
+		)
+
+	def onConfigChanged(self) -> None:
+		"""Mark the cached inventory as outdated after a configuration profile switch or reset.
+		Nothing is done if the inventory has not been scanned yet, so the scan machinery is not imported.
+		"""
+		base = sys.modules.get(__name__ + ".base")
+		if base is not None:
+			base.inventory.invalidate()
 
 	def createMenu(self) -> None:
 		"""Build a submenu in the NVDA "tools" menu."""
 		self.menu: wx.Menu = gui.mainFrame.sysTrayIcon.toolsMenu
 		subMenu = wx.Menu()
 		self.mainItem: wx.MenuItem = self.menu.AppendSubMenu(subMenu, ADDON_SUMMARY)
-		checkDuplicatesItem: wx.MenuItem = subMenu.Append(wx.ID_ANY, Duplicates().menuItem)
+		checkDuplicatesItem: wx.MenuItem = subMenu.Append(wx.ID_ANY, DUPLICATES + "...")
 		gui.mainFrame.sysTrayIcon.Bind(wx.EVT_MENU, self.onCheckDuplicates, checkDuplicatesItem)
-		checkUnsignedItem: wx.MenuItem = subMenu.Append(wx.ID_ANY, Unsigned().menuItem)
+		checkProfilesItem: wx.MenuItem = subMenu.Append(wx.ID_ANY, PROFILE_DUPLICATES + "...")
+		gui.mainFrame.sysTrayIcon.Bind(wx.EVT_MENU, self.onCheckProfiles, checkProfilesItem)
+		checkUnsignedItem: wx.MenuItem = subMenu.Append(wx.ID_ANY, UNSIGNED + "...")
 		gui.mainFrame.sysTrayIcon.Bind(wx.EVT_MENU, self.onCheckUnsigned, checkUnsignedItem)
 		# Translators: the name of a submenu item
+		viewsItem: wx.MenuItem = subMenu.Append(wx.ID_ANY, _("Custom &views..."))
+		gui.mainFrame.sysTrayIcon.Bind(wx.EVT_MENU, self.onCustomViews, viewsItem)
+		# Translators: the name of a submenu item
+		exportItem: wx.MenuItem = subMenu.Append(wx.ID_ANY, _("&Export input gestures..."))
+		gui.mainFrame.sysTrayIcon.Bind(wx.EVT_MENU, self.onExport, exportItem)
+		# Translators: the name of a submenu item
 		helpItem: wx.MenuItem = subMenu.Append(wx.ID_ANY, _("&Help"))
 		gui.mainFrame.sysTrayIcon.Bind(wx.EVT_MENU, self.onHelp, helpItem)
 
 	@override
 	def terminate(self) -> None:
 		"""This will be called when NVDA is finished with this global plugin"""
+		config.post_configProfileSwitch.unregister(self.onConfigChanged)
+		config.post_configReset.unregister(self.onConfigChanged)
+		if self._watcher is not None:
+			self._watcher.stop()
+		self._executor.shutdown(wait=False, cancel_futures=True)
 		try:
 			self.menu.Remove(self.mainItem)
 		except (RuntimeError, AttributeError):
 			pass
 		super().terminate()
 
-	def checkGestures(self, gestures: base.FilteredGestures) -> None:
+	def checkGestures(self, gestures: "base.FilteredGestures") -> None:
+		"""Scan input gestures in the background and then show the found ones.
+		Only data that is available exclusively in the main thread is read here,
+		the rest of the work is done in a worker thread while the progress dialog is displayed.
+		@param gestures: filtered collection of input gestures
+		@type gestures: base.FilteredGestures
+		"""
+		from . import base
+
+		if self._progress is not None:
+			return
+		with base.timings.phase("prepare"):
+			complete = gestures.prepare()
+		self.runInBackground(
+			gestures.title,
+			# Translators: Message displayed while the input gestures are being checked
+			_("Checking input gestures..."),
+			complete,
+			lambda: self.showGestures(gestures),
+		)
+
+	def runInBackground(
+		self,
+		title: str,
+		message: str,
+		task: Callable[[], None],
+		onDone: Callable[[], None],
+	) -> None:
+		"""Perform the task in a worker thread while the progress dialog is displayed.
+		@param title: the title of the progress dialog
+		@type title: str
+		@param message: the message displayed in the progress dialog
+		@type message: str
+		@param task: function that does not access NVDA objects available only in the main thread
+		@type task: Callable[[], None]
+		@param onDone: function called in the main thread when the task has been completed successfully
+		@type onDone: Callable[[], None]
+		"""
+		from .graphui import ScanProgressDialog
+
+		if self._progress is not None:
+			return
+		future = self._scan = self._executor.submit(task)
+		self._progress = ScanProgressDialog(
+			gui.mainFrame,
+			title=title,
+			message=message,
+			onCancel=lambda: self.onScanCancel(future),
+		)
+		future.add_done_callback(lambda done: wx.CallAfter(self.onScanDone, done, onDone))
+
+	def onScanCancel(self, future: Future[None]) -> None:
+		"""Discard the background task cancelled by the user.
+		@param future: the background task
+		@type future: Future[None]
+		"""
+		self._progress = self._scan = None
+		future.cancel()
+
+	def onScanDone(self, future: Future[None], onDone: Callable[[], None]) -> None:
+		"""Called in the main thread when the background task is finished.
+		@param future: the background task
+		@type future: Future[None]
+		@param onDone: function called when the task has been completed successfully
+		@type onDone: Callable[[], None]
+		"""
+		if future is not self._scan or self._progress is None or future.cancelled():
+			return
+		self._progress.done()
+		self._progress = self._scan = None
+		if future.exception() is not None:
+			log.error("Error while checking input gestures", exc_info=future.exception())
+			gui.messageBox(
+				# Translators: Notification of an error that occurred while processing input gestures
+				message=_("An error occurred while processing input gestures, see the NVDA log for details"),
+				caption=ADDON_SUMMARY,
+				style=wx.OK | wx.ICON_ERROR,
+				parent=gui.mainFrame,
+			)
+			return
+		onDone()
+
+	def showGestures(self, gestures: "base.FilteredGestures") -> None:
 		"""Show a list of gestures in a separate window,
 		if the gesture collection is empty, a warning is displayed.
 		@param gestures: filtered collection of input gestures
 		@type gestures: base.FilteredGestures
 		"""
-		if len(gestures) > 0:
-			GesturesDialog = (
-				DuplicatedGesturesDialog if isinstance(gestures, Duplicates) else UnsignedGesturesDialog
-			)
+		from . import base
+		from .graphui import DuplicatedGesturesDialog, GesturesListDialog, UnsignedGesturesDialog
+
+		if gestures:
+			if isinstance(gestures, base.Duplicates):
+				GesturesDialog = DuplicatedGesturesDialog
+			elif isinstance(gestures, base.Unsigned):
+				GesturesDialog = UnsignedGesturesDialog
+			else:
+				GesturesDialog = GesturesListDialog
 			gui.mainFrame.popupSettingsDialog(GesturesDialog, title=gestures.title, gestures=gestures)
+			base.timings.report(gestures.title)
 		else:
+			base.timings.report(gestures.title)
 			gui.messageBox(
 				# Translators: Notification of no search results
 				message=_("Target gestures not found"),
@@ -100,14 +255,142 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		@param event: event binder object that specifies the activation of wx.Menu item
 		@type event: wx.PyEvent
 		"""
-		self.checkGestures(Duplicates())
+		self.checkGestures(filteredGestures("Duplicates", DUPLICATES))
+
+	def onCheckProfiles(self, event: wx.PyEvent) -> None:
+		"""Show the gestures duplicated in any of the configuration profiles or keyboard layouts.
+		@param event: event binder object that specifies the activation of wx.Menu item
+		@type event: wx.PyEvent
+		"""
+		self.checkGestures(filteredGestures("ProfileDuplicates", PROFILE_DUPLICATES))
 
 	def onCheckUnsigned(self, event: wx.PyEvent) -> None:
 		"""Show the collection of gestures wich binded to features without description in separate window.
 		@param event: event binder object that specifies the activation of wx.Menu item
 		@type event: wx.PyEvent
 		"""
-		self.checkGestures(Unsigned())
+		self.checkGestures(filteredGestures("Unsigned", UNSIGNED))
+
+	def onCustomViews(self, event: wx.PyEvent) -> None:
+		"""Show the gestures that match a saved query or a new one entered by the user.
+		The saved views are stored in the NVDA configuration directory and can be distributed by administrators.
+		@param event: event binder object that specifies the activation of wx.Menu item
+		@type event: wx.PyEvent
+		"""
+		from . import query
+
+		path = os.path.join(appArgs.configPath, "checkGesturesViews.json")
+		views = query.loadViews(path)
+		with wx.SingleChoiceDialog(
+			gui.mainFrame,
+			# Translators: The prompt of the dialog for selecting a custom view of input gestures
+			_("Select a saved view or create a new one"),
+			# Translators: The title of the dialog for selecting a custom view of input gestures
+			_("Custom views"),
+			# Translators: The item of the custom views list that allows entering a new query
+			[_("New query...")] + [name for name, _query in views],
+		) as dialog:
+			if dialog.ShowModal() != wx.ID_OK:
+				return
+			selection: int = dialog.GetSelection()
+		if selection > 0:
+			name, text = views[selection - 1]
+			self.checkGestures(query.QueryGestures(text, name))
+			return
+		text = wx.GetTextFromUser(
+			# Translators: The prompt of the dialog for entering a query, the example should not be translated
+			_("Query, for example: module:globalPlugins.* and gesture:kb:* and not category:"),
+			# Translators: The title of the dialog for entering a query
+			_("New query"),
+			parent=gui.mainFrame,
+		).strip()
+		if not text:
+			return
+		try:
+			gestures = query.QueryGestures(text)
+		except query.QuerySyntaxError as e:
+			gui.messageBox(
+				# Translators: Notification of an error in the query entered by the user
+				message=_("Invalid query: {error}").format(error=e),
+				caption=ADDON_SUMMARY,
+				style=wx.OK | wx.ICON_ERROR,
+				parent=gui.mainFrame,
+			)
+			return
+		name = wx.GetTextFromUser(
+			# Translators: The prompt of the dialog for saving a query as a custom view
+			_("Name of the view to save the query, leave empty to not save it"),
+			# Translators: The title of the dialog for entering a query
+			_("New query"),
+			parent=gui.mainFrame,
+		).strip()
+		if name:
+			try:
+				query.saveView(path, name, text)
+			except OSError:
+				log.error("Unable to save the view of input gestures to %s", path, exc_info=True)
+			gestures.name = name
+		self.checkGestures(gestures)
+
+	def onExport(self, event: wx.PyEvent) -> None:
+		"""Export the inventory of input gestures and the conflict groups to the file selected by the user.
+		@param event: event binder object that specifies the activation of wx.Menu item
+		@type event: wx.PyEvent
+		"""
+		from . import base, export
+
+		formats = (
+			# Translators: The name of the file type in the export dialog
+			(_("JSON Lines"), export.JSONLinesFormat.extension),
+			# Translators: The name of the file type in the export dialog
+			(_("CSV table"), export.CSVFormat.extension),
+			# Translators: The name of the file type in the export dialog
+			(_("Compact binary format"), export.ColumnarFormat.extension),
+		)
+		with wx.FileDialog(
+			gui.mainFrame,
+			# Translators: The title of the dialog for selecting the file to export input gestures
+			message=_("Export input gestures"),
+			wildcard="|".join(f"{name} (*{ext})|*{ext}" for name, ext in formats),
+			style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
+		) as dialog:
+			if dialog.ShowModal() != wx.ID_OK:
+				return
+			path: str = dialog.GetPath()
+			extension = formats[dialog.GetFilterIndex()][1]
+		if not path.lower().endswith(extension):
+			# The dialog has asked about overwriting the file without the extension, not this one
+			path += extension
+			if (
+				os.path.exists(path)
+				and gui.messageBox(
+					# Translators: The question asked before overwriting an existing file
+					message=_("The file {path} already exists. Do you want to replace it?").format(path=path),
+					caption=ADDON_SUMMARY,
+					style=wx.YES_NO | wx.ICON_WARNING,
+					parent=gui.mainFrame,
+				)
+				!= wx.YES
+			):
+				return
+		layout: str = config.conf["keyboard"]["keyboardLayout"]
+		meta = export.metadata(layout)
+		build = base.inventory.prepare()
+
+		def task() -> None:
+			with base.inventory.lock:
+				gestures = build()
+				export.exportInventory(path, gestures, gestures.index(layout), meta)
+
+		self.runInBackground(
+			# Translators: The title of the progress dialog displayed while the input gestures are exported
+			_("Export input gestures"),
+			# Translators: Message displayed while the input gestures are exported
+			_("Exporting input gestures..."),
+			task,
+			# Translators: Message announced when the input gestures have been exported
+			lambda: ui.message(_("Input gestures exported")),
+		)
 
 	def onHelp(self, event: wx.PyEvent) -> None:
 		"""Open the add-on help page in the default browser.
@@ -118,7 +401,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 
 		webbrowser.open(_addon.getDocFilePath())
 
-	@script(description=Duplicates().title)
+	@script(description=DUPLICATES.replace("&", ""))
 	def script_duplicates(self, gesture: InputGesture) -> None:
 		"""Check the NVDA configuration and display all detected duplicated input gestures.
 		@param gesture: the input gesture in question
@@ -126,10 +409,93 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		"""
 		wx.CallAfter(self.onCheckDuplicates, None)
 
-	@script(description=Unsigned().title)
+	@script(description=UNSIGNED.replace("&", ""))
 	def script_unsigned(self, gesture: InputGesture) -> None:
 		"""Check the NVDA configuration and display all detected unsigned input gestures.
 		@param gesture: the input gesture in question
 		@type gesture: InputGesture
 		"""
 		wx.CallAfter(self.onCheckUnsigned, None)
+
+	@script(
+		# Translators: Description of the script that reports conflicts of the next pressed gesture
+		description=_("Reports the conflicting functions binded to the next pressed gesture"),
+	)
+	def script_conflictsForNextGesture(self, gesture: InputGesture) -> None:
+		"""Wait for the next input gesture and report the functions binded to it if they conflict.
+		@param gesture: the input gesture in question
+		@type gesture: InputGesture
+		"""
+		inputCore.manager._captureFunc = self._captureGesture
+		# Translators: Message announced while waiting for the gesture to check
+		ui.message(_("Press the gesture to check"))
+
+	def _captureGesture(self, gesture: InputGesture) -> bool:
+		"""Intercept the next input gesture instead of executing it.
+		@param gesture: the pressed input gesture
+		@type gesture: InputGesture
+		@return: whether the gesture should be executed
+		@rtype: bool
+		"""
+		if gesture.isModifier:
+			return False
+		inputCore.manager._captureFunc = None
+		wx.CallAfter(self.reportConflicts, gesture.displayName, gesture.normalizedIdentifiers)
+		return False
+
+	def reportConflicts(self, name: str, identifiers: list[str]) -> None:
+		"""Look up the functions binded to the input gesture in the background and announce them.
+		@param name: display name of the input gesture
+		@type name: str
+		@param identifiers: normalized identifiers of the input gesture
+		@type identifiers: list[str]
+		"""
+		from . import base
+
+		future = self._executor.submit(base.inventory.conflictsFor(identifiers))
+		future.add_done_callback(lambda done: wx.CallAfter(self.announceConflicts, name, done))
+
+	def announceConflicts(self, name: str, future: "Future[list[base.Gesture]]") -> None:
+		"""Announce the functions binded to the input gesture if there are several of them.
+		Called in the main thread when the lookup is finished.
+		@param name: display name of the input gesture
+		@type name: str
+		@param future: the background lookup of the conflicting bindings
+		@type future: Future[list[base.Gesture]]
+		"""
+		if future.cancelled():
+			return
+		if future.exception() is not None:
+			log.error("Error while checking input gestures", exc_info=future.exception())
+			return
+		bindings = future.result()
+		if bindings:
+			ui.message(
+				# Translators: Message that lists the functions binded to the same gesture
+				_("{gesture} is binded to: {functions}").format(
+					gesture=name,
+					functions="; ".join(gest.displayName or gest.scriptName for gest in bindings),
+				),
+			)
+		else:
+			# Translators: Message announced when the pressed gesture has no conflicts
+			ui.message(_("{gesture} has no conflicts").format(gesture=name))
+
+	@script(
+		# Translators: Description of the script that toggles the measurement of the gesture checks duration
+		description=_("Toggles logging of the duration of each phase of the input gestures checks"),
+	)
+	def script_toggleTimings(self, gesture: InputGesture) -> None:
+		"""Enable or disable the measurement of the gesture checks phases, which is written to the NVDA log.
+		@param gesture: the input gesture in question
+		@type gesture: InputGesture
+		"""
+		from . import base
+
+		base.timings.enabled = not base.timings.enabled
+		if base.timings.enabled:
+			# Translators: Message announced when the measurement of the gesture checks is enabled
+			ui.message(_("Logging of the gesture checks duration enabled"))
+		else:
+			# Translators: Message announced when the measurement of the gesture checks is disabled
+			ui.message(_("Logging of the gesture checks duration disabled"))
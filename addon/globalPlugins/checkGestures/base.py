@@ -5,12 +5,157 @@
 # See the file COPYING for more details.
 # Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
 
-from collections.abc import Iterator
-from typing import override
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from types import TracebackType
+from typing import Any, NewType, override
+
+GestureFields = tuple[str, str | None, str | None, str | None, str | None, str | None]
+GestureKey = NewType("GestureKey", str)
+
+# Keyboard layouts supported by NVDA
+LAYOUTS: tuple[str, ...] = ("desktop", "laptop")
+
+_gestureKeys: dict[tuple[str, str], GestureKey] = {}
+
+
+def gestureKey(identifier: str, layout: str = "") -> GestureKey:
+	"""Canonical form of the input gesture identifier, used to compare gestures with each other.
+	The identifier is lowercased, all its parts joined with "+" are sorted, as NVDA does it,
+	since the main key is not always the last one, and the keyboard layout is dropped
+	if it matches the given one. The result is interned and cached for each raw identifier,
+	so the keys can be compared cheaply.
+	@param identifier: raw gesture identifier, e.g. "kb(laptop):NVDA+shift+d"
+	@type identifier: str
+	@param layout: the name of the current keyboard layout, e.g. "laptop"
+	@type layout: str
+	@return: canonical gesture key, e.g. "kb:d+nvda+shift"
+	@rtype: GestureKey
+	"""
+	key = _gestureKeys.get((identifier, layout))
+	if key is None:
+		prefix, sep, main = identifier.lower().partition(":")
+		if prefix == "kb(%s)" % layout.lower():
+			prefix = "kb"
+		canonical = "%s%s%s" % (prefix, sep, "+".join(sorted(main.split("+"))))
+		key = _gestureKeys[(identifier, layout)] = GestureKey(sys.intern(canonical))
+	return key
+
+
+class Phase:
+	"""Measurement of the duration of one phase of the gestures check.
+	Used as a context manager, the number of processed items can be assigned to the count attribute.
+	"""
+
+	__slots__ = ("_timings", "name", "count", "_start")
+
+	def __init__(self, timings: "Timings | None", name: str) -> None:
+		"""Initialization of the measurement.
+		@param timings: the storage of the measurements or None if the measurement is disabled
+		@type timings: Timings | None
+		@param name: the name of the phase
+		@type name: str
+		"""
+		self._timings = timings
+		self.name = name
+		self.count = 0
+		self._start = 0.0
+
+	def __enter__(self) -> "Phase":
+		"""Start the measurement.
+		@return: the measurement itself
+		@rtype: Phase
+		"""
+		if self._timings is not None:
+			self._start = time.perf_counter()
+		return self
+
+	def __exit__(
+		self,
+		excType: type[BaseException] | None,
+		excValue: BaseException | None,
+		traceback: TracebackType | None,
+	) -> None:
+		"""Stop the measurement and store its result."""
+		if self._timings is not None:
+			self._timings.record(self.name, time.perf_counter() - self._start, self.count)
+
+
+class Timings:
+	"""Durations and item counts of the phases of the gestures check.
+	Disabled by default, in which case the measurements are not stored.
+	@ivar enabled: whether the measurements are stored
+	@type enabled: bool
+	"""
+
+	def __init__(self) -> None:
+		"""Initialization of internal fields."""
+		self.enabled: bool = False
+		self._lock = threading.Lock()
+		self._phases: dict[str, dict[str, Any]] = {}
+
+	def phase(self, name: str) -> Phase:
+		"""Measurement of the phase, which is used as a context manager.
+		@param name: the name of the phase
+		@type name: str
+		@return: measurement of the phase
+		@rtype: Phase
+		"""
+		return Phase(self if self.enabled else None, name)
+
+	def record(self, name: str, seconds: float, count: int = 0) -> None:
+		"""Add the duration of the phase to the accumulated results.
+		@param name: the name of the phase
+		@type name: str
+		@param seconds: the duration of the phase
+		@type seconds: float
+		@param count: the number of items processed in the phase
+		@type count: int
+		"""
+		with self._lock:
+			phase = self._phases.setdefault(name, {"calls": 0, "seconds": 0.0, "count": 0})
+			phase["calls"] += 1
+			phase["seconds"] += seconds
+			phase["count"] += count
+
+	def summary(self) -> dict[str, dict[str, Any]]:
+		"""Accumulated results of all measured phases.
+		@return: the names of the phases mapped to the number of calls, total duration and item count
+		@rtype: dict[str, dict[str, Any]]
+		"""
+		with self._lock:
+			return {name: dict(phase) for name, phase in self._phases.items()}
+
+	def report(self, title: str) -> None:
+		"""Write the accumulated results to the NVDA log and start accumulating again.
+		@param title: the name of the check to which the results belong
+		@type title: str
+		"""
+		if not self.enabled:
+			return
+		import json
+
+		from logHandler import log
+
+		with self._lock:
+			phases, self._phases = self._phases, {}
+		log.info("Timings of the %s: %s", title, json.dumps(phases, sort_keys=True))
+
+
+timings = Timings()
 
 
 class Gesture:
-	"""Representation of one input gesture."""
+	"""Representation of one input gesture.
+	Instances are immutable, since they are hashed and shared between the collections and their indexes,
+	and store their fields in slots, which keeps large collections compact.
+	"""
+
+	__slots__ = ("_gesture", "_category", "_displayName", "_className", "_moduleName", "_scriptName")
 
 	def __init__(
 		self,
@@ -35,12 +180,39 @@ class Gesture:
 		@param scriptName: the script name of the gesture-bound function
 		@type scriptName: str | None
 		"""
-		self._gesture = gesture or ""
-		self._category = category or ""
-		self._displayName = displayName or ""
-		self._className = className or ""
-		self._moduleName = moduleName or ""
-		self._scriptName = scriptName or ""
+		init = object.__setattr__
+		init(self, "_gesture", gesture or "")
+		init(self, "_category", category or "")
+		init(self, "_displayName", displayName or "")
+		init(self, "_className", className or "")
+		init(self, "_moduleName", moduleName or "")
+		init(self, "_scriptName", scriptName or "")
+
+	def __setattr__(self, name: str, value: object) -> None:
+		"""Prevent changing the fields after initialization.
+		@raise AttributeError: always
+		"""
+		raise AttributeError("Gesture is immutable")
+
+	def __delattr__(self, name: str) -> None:
+		"""Prevent deleting the fields.
+		@raise AttributeError: always
+		"""
+		raise AttributeError("Gesture is immutable")
+
+	def __reduce__(self) -> tuple[type["Gesture"], GestureFields]:
+		"""Pickle the gesture by its constructor arguments, since the fields cannot be set one by one.
+		@return: the class and the fields of the gesture
+		@rtype: tuple[type[Gesture], GestureFields]
+		"""
+		return Gesture, (
+			self._gesture,
+			self._category,
+			self._displayName,
+			self._className,
+			self._moduleName,
+			self._scriptName,
+		)
 
 	@property
 	def gesture(self) -> str:
@@ -100,12 +272,19 @@ class Gesture:
 		if not isinstance(other, Gesture):
 			return False
 		return (
-			self.gesture == other.gesture
-			and self.displayName == other.displayName
-			and self.moduleName == other.moduleName
-			and self.scriptName == other.scriptName
+			self._gesture == other._gesture
+			and self._displayName == other._displayName
+			and self._moduleName == other._moduleName
+			and self._scriptName == other._scriptName
 		)
 
+	def __hash__(self) -> int:
+		"""Hash value consistent with the comparison of objects for equality.
+		@return: hash of the fields that are taken into account when comparing gestures
+		@rtype: int
+		"""
+		return hash((self._gesture, self._displayName, self._moduleName, self._scriptName))
+
 	def __repr__(self) -> str:
 		"""Text presentation of input gesture object.
 		@return: text presentation
@@ -118,12 +297,129 @@ class Gesture:
 		)
 
 
+class GestureIndex:
+	"""Index of input gestures by their canonical keys.
+	The index is updated in place when gestures are added or removed,
+	and keeps track of the keys shared by several gestures.
+	"""
+
+	def __init__(self, layout: str, gestures: Iterable[Gesture] = ()) -> None:
+		"""Initialization of the index.
+		@param layout: the name of the keyboard layout used to build the canonical keys
+		@type layout: str
+		@param gestures: input gestures that will be added to the index
+		@type gestures: Iterable[Gesture]
+		"""
+		self.layout = layout
+		self._groups: dict[GestureKey, list[Gesture]] = {}
+		self._conflicts: dict[GestureKey, None] = {}
+		for gesture in gestures:
+			self.add(gesture)
+
+	def add(self, gesture: Gesture) -> None:
+		"""Add the input gesture to the index.
+		@param gesture: an input gesture that will be added to the index
+		@type gesture: Gesture
+		"""
+		key = gestureKey(gesture.gesture, self.layout)
+		group = self._groups.setdefault(key, [])
+		group.append(gesture)
+		if len(group) > 1:
+			self._conflicts[key] = None
+
+	def remove(self, gesture: Gesture) -> None:
+		"""Remove the input gesture from the index.
+		@param gesture: an input gesture that will be removed from the index
+		@type gesture: Gesture
+		"""
+		key = gestureKey(gesture.gesture, self.layout)
+		group = self._groups.get(key, [])
+		if gesture not in group:
+			return
+		group.remove(gesture)
+		if len(group) < 2:
+			self._conflicts.pop(key, None)
+		if not group:
+			del self._groups[key]
+
+	def get(self, key: GestureKey) -> list[Gesture]:
+		"""All input gestures that share the canonical key.
+		@param key: canonical gesture key
+		@type key: GestureKey
+		@return: input gestures with the given key
+		@rtype: list[Gesture]
+		"""
+		return list(self._groups.get(key, []))
+
+	def count(self, key: GestureKey) -> int:
+		"""The number of input gestures that share the canonical key.
+		@param key: canonical gesture key
+		@type key: GestureKey
+		@return: the number of gestures with the given key
+		@rtype: int
+		"""
+		return len(self._groups.get(key, ()))
+
+	def duplicates(self) -> dict[GestureKey, list[Gesture]]:
+		"""Groups of the input gestures that share the same canonical key.
+		@return: canonical gesture keys mapped to the lists of all gestures that share them
+		@rtype: dict[GestureKey, list[Gesture]]
+		"""
+		return {key: list(self._groups[key]) for key in self._conflicts}
+
+	def keys(self) -> Iterator[GestureKey]:
+		"""All canonical keys present in the index.
+		@return: iterator of the canonical gesture keys
+		@rtype: Iterator[GestureKey]
+		"""
+		return iter(self._groups)
+
+
+def conflictMatrix(
+	gestures: Iterable[Gesture], layouts: Iterable[str] = LAYOUTS
+) -> dict[str, dict[GestureKey, list[Gesture]]]:
+	"""Conflicting input gestures for each of the keyboard layouts, computed in one pass.
+	The gestures are normalized and grouped only once, without dropping the layout from the identifiers.
+	Then for each layout only the groups bound to this layout are merged with the common keyboard groups,
+	the rest of the conflicts do not depend on the layout and are shared by all of them.
+	@param gestures: all input gestures of the inventory
+	@type gestures: Iterable[Gesture]
+	@param layouts: the names of the keyboard layouts
+	@type layouts: Iterable[str]
+	@return: for each layout, canonical gesture keys mapped to the lists of all gestures that share them
+	@rtype: dict[str, dict[GestureKey, list[Gesture]]]
+	"""
+	neutral = GestureIndex("", gestures)
+	merges: dict[str, dict[GestureKey, GestureKey]] = {layout: {} for layout in layouts}
+	prefixes = {"kb(%s)" % layout.lower(): layout for layout in merges}
+	for key in neutral.keys():
+		prefix, _sep, main = key.partition(":")
+		if prefix in prefixes:
+			merges[prefixes[prefix]][key] = GestureKey(sys.intern("kb:" + main))
+	common = neutral.duplicates()
+	matrix: dict[str, dict[GestureKey, list[Gesture]]] = {}
+	for layout, merged in merges.items():
+		conflicts = {key: group for key, group in common.items() if key not in merged}
+		for key, target in merged.items():
+			group = neutral.get(target) + neutral.get(key)
+			if len(group) > 1:
+				conflicts[target] = group
+		matrix[layout] = conflicts
+	return matrix
+
+
 class Gestures:
-	"""Presentation of the input gestures collection."""
+	"""Presentation of the input gestures collection.
+	The collection can be updated incrementally from the gestures read from NVDA,
+	in which case only the sources of gestures that have changed since the previous update are processed.
+	"""
 
 	def __init__(self) -> None:
 		"""Initialization of internal fields."""
-		self._all: list[Gesture] = []
+		self._all: dict[Gesture, int] = {}
+		self._list: list[Gesture] | None = None
+		self._sources: dict[Hashable, frozenset[GestureFields]] = {}
+		self._keyIndex: GestureIndex | None = None
 
 	def __len__(self) -> int:
 		"""The number of gestures in collection.
@@ -139,15 +435,16 @@ class Gestures:
 		@return: input gesture from collection under a given index
 		@rtype: Gesture
 		"""
-		return self._all[index]
+		if self._list is None:
+			self._list = list(self._all)
+		return self._list[index]
 
 	def __iter__(self) -> Iterator[Gesture]:
 		"""Iterator of Gesture objects from collection.
 		@return: all Gesture objects from collection
 		@rtype: Iterator[Gesture]
 		"""
-		for gesture in self._all:
-			yield gesture
+		return iter(self._all)
 
 	def __contains__(self, obj: Gesture | None) -> bool:
 		"""Indication of whether an Gesture object is present in the collection.
@@ -156,73 +453,843 @@ class Gestures:
 		@return: whether there is an object in the collection
 		@rtype: bool
 		"""
-		for gesture in self._all:
-			if obj == gesture:
-				return True
-		return False
+		return obj in self._all
 
 	def append(self, obj: Gesture) -> None:
 		"""Add Gesture object to the collection.
+		Repeated additions of the same gesture are counted, but the collection contains it only once.
 		@param obj: an input gesture that will be added to the collection
 		@type obj: Gesture
 		"""
-		if not obj or obj in self:
+		if not obj:
+			return
+		if obj in self._all:
+			self._all[obj] += 1
+			return
+		self._all[obj] = 1
+		self._list = None
+		if self._keyIndex is not None:
+			self._keyIndex.add(obj)
+
+	def remove(self, obj: Gesture) -> None:
+		"""Remove Gesture object from the collection.
+		The gesture stays in the collection until it has been removed as many times as it was added.
+		@param obj: an input gesture that will be removed from the collection
+		@type obj: Gesture
+		"""
+		count = self._all.get(obj, 0)
+		if count > 1:
+			self._all[obj] = count - 1
 			return
-		self._all.append(obj)
+		if not count:
+			return
+		del self._all[obj]
+		self._list = None
+		if self._keyIndex is not None:
+			self._keyIndex.remove(obj)
+
+	def index(self, layout: str) -> GestureIndex:
+		"""Index of the gestures from the collection by their canonical keys.
+		The index is built on first request and then maintained together with the collection.
+		@param layout: the name of the keyboard layout used to build the canonical keys
+		@type layout: str
+		@return: index of the gestures by the canonical keys
+		@rtype: GestureIndex
+		"""
+		if self._keyIndex is None or self._keyIndex.layout != layout:
+			self._keyIndex = GestureIndex(layout, self._all)
+		return self._keyIndex
+
+	def update(self, sources: dict[Hashable, Iterable[GestureFields]]) -> tuple[int, int]:
+		"""Bring the collection in line with the gestures read from NVDA.
+		Gestures of the sources that have not changed since the previous update are not processed at all,
+		for the rest only the added and removed gestures are processed.
+		@param sources: raw fields of the gestures grouped by the source they come from
+		@type sources: dict[Hashable, Iterable[GestureFields]]
+		@return: the number of added and removed gestures
+		@rtype: tuple[int, int]
+		"""
+		added = removed = 0
+		for source in [source for source in self._sources if source not in sources]:
+			for row in self._sources.pop(source):
+				self.remove(Gesture(*row))
+				removed += 1
+		for source, rows in sources.items():
+			current = rows if isinstance(rows, frozenset) else frozenset(rows)
+			previous = self._sources.get(source, frozenset())
+			if current is previous or current == previous:
+				continue
+			for row in previous - current:
+				self.remove(Gesture(*row))
+				removed += 1
+			for row in current - previous:
+				self.append(Gesture(*row))
+				added += 1
+			self._sources[source] = current
+		return added, removed
+
+	def extend(self, rows: Iterable[GestureFields]) -> None:
+		"""Add gestures created from the raw fields to the collection.
+		@param rows: fields of the Gesture objects in the order of its constructor arguments
+		@type rows: Iterable[GestureFields]
+		"""
+		for row in rows:
+			self.append(Gesture(*row))
+
+
+def unsignedFields(bindings: Iterable[tuple[str, Any]]) -> Iterator[GestureFields]:
+	"""Raw fields of the gestures binded to script functions without text description.
+	@param bindings: gesture identifiers and script functions from the gesture map of a scriptable object
+	@type bindings: Iterable[tuple[str, Any]]
+	@return: fields of the gestures in the order of the Gesture constructor arguments
+	@rtype: Iterator[GestureFields]
+	"""
+	for gest, obj in bindings:
+		if obj and not obj.__doc__:
+			yield gest, None, obj.__doc__, None, obj.__module__, obj.__name__.replace("script_", "")
 
-	def initialize(self) -> None:
-		"""Scan all input gestures used in NVDA.
-		Procedure for scanning input gestures:
-		1. Gestures binded to functions with text description (displayed in the "Input Gestures" dialog).
-		2. Gestures related to functions without a text description.
+
+class GestureScanner:
+	"""Basic class for the sources of input gestures, e.g. the running global plugins.
+	The fingerprint and the snapshot are taken in the main thread and must be cheap,
+	the snapshot is then converted to the raw gesture fields by the scan method in a worker thread,
+	so the independent scanners can work in parallel.
+	"""
+
+	name: str = ""
+
+	def fingerprint(self) -> Hashable:
+		"""Lightweight description of the NVDA state on which the gestures of this source depend.
+		Must be called from the main thread.
+		@return: a value that changes whenever the source needs to be scanned again
+		@rtype: Hashable
+		"""
+		raise NotImplementedError
+
+	def snapshot(self) -> Any:
+		"""Take the NVDA objects required to scan the source.
+		Must be called from the main thread.
+		@return: data passed to the scan method
+		@rtype: Any
+		"""
+		raise NotImplementedError
+
+	def scan(self, snapshot: Any) -> dict[Hashable, list[GestureFields]]:
+		"""Convert the snapshot to the raw fields of the gestures, can be called from any thread.
+		@param snapshot: data returned by the snapshot method
+		@type snapshot: Any
+		@return: raw fields of the gestures grouped by the source they come from
+		@rtype: dict[Hashable, list[GestureFields]]
 		"""
-		self.signed()
-		self.unsigned()
+		raise NotImplementedError
+
+
+class SignedScanner(GestureScanner):
+	"""Gestures binded to functions with text description, as displayed in the "Input Gestures" dialog."""
 
-	def signed(self) -> None:
-		"""Scan gestures binded to functions with text description
-		wich displayed in the "Input Gestures" dialog.
+	name: str = "signed"
+
+	@override
+	def fingerprint(self) -> Hashable:
+		"""State of the gesture maps, the running global plugins and everything the mappings depend on:
+		the focused application, tree interceptor, object and its ancestors,
+		the braille display driver and the vision enhancement providers.
+		@return: a value that changes whenever the source needs to be scanned again
+		@rtype: Hashable
 		"""
+		import api
+		import braille
+		import globalPluginHandler
 		import inputCore
+		import vision
+
+		maps = tuple(
+			hash(tuple((gest, tuple(scripts)) for gest, scripts in gestureMap._map.items()))
+			for gestureMap in (inputCore.manager.userGestureMap, inputCore.manager.localeGestureMap)
+		)
+		plugins = frozenset(
+			(type(plugin).__module__, type(plugin).__qualname__, id(plugin), len(plugin._gestureMap))
+			for plugin in globalPluginHandler.runningPlugins
+		)
+		focus = api.getFocusObject()
+		context = None
+		if focus:
+			# The classes of the objects, since the overlay classes define their own gestures
+			chain = tuple(type(obj) for obj in (focus, *api.getFocusAncestors()))
+			context = (id(focus.appModule), type(focus.treeInterceptor), chain)
+		display = braille.handler.display if braille.handler else None
+		providers = vision.handler.getActiveProviderInstances() if vision.handler else ()
+		drivers = (id(display), tuple(map(id, providers)))
+		return maps, plugins, context, drivers
+
+	@override
+	def snapshot(self) -> Any:
+		"""All gesture mappings of the NVDA input manager.
+		@return: scripts grouped by category
+		@rtype: Any
+		"""
+		import inputCore
+
+		return inputCore.manager.getAllGestureMappings()
+
+	@override
+	def scan(self, snapshot: Any) -> dict[Hashable, list[GestureFields]]:
+		"""Raw fields of the gestures grouped by category.
+		@param snapshot: scripts grouped by category
+		@type snapshot: Any
+		@return: raw fields of the gestures grouped by category
+		@rtype: dict[Hashable, list[GestureFields]]
+		"""
+		sources: dict[Hashable, list[GestureFields]] = {}
+		for category, scripts in snapshot.items():
+			sources[category] = [
+				(gest, obj.category, obj.displayName, obj.className, obj.moduleName, obj.scriptName)
+				for obj in scripts.values()
+				for gest in obj.gestures
+			]
+		return sources
+
+
+class ScriptableObjectsScanner(GestureScanner):
+	"""Basic class for the sources of gestures binded to the scripts of scriptable objects without text description.
+	Gestures of these scripts do not appear in the "Input Gestures" dialog.
+	"""
+
+	def objects(self) -> list[Any]:
+		"""Scriptable objects of this source.
+		Must be called from the main thread.
+		@return: the objects that have a gesture map
+		@rtype: list[Any]
+		"""
+		raise NotImplementedError
+
+	@override
+	def fingerprint(self) -> Hashable:
+		"""Identity of the objects and the size of their gesture maps.
+		@return: a value that changes whenever the source needs to be scanned again
+		@rtype: Hashable
+		"""
+		return frozenset((id(obj), len(getattr(obj, "_gestureMap", ()))) for obj in self.objects())
+
+	@override
+	def snapshot(self) -> Any:
+		"""Copies of the gesture maps of the objects.
+		@return: lists of gesture identifiers and script functions
+		@rtype: Any
+		"""
+		return [list(getattr(obj, "_gestureMap", {}).items()) for obj in self.objects()]
+
+	@override
+	def scan(self, snapshot: Any) -> dict[Hashable, list[GestureFields]]:
+		"""Raw fields of the gestures grouped by the module of the script.
+		@param snapshot: lists of gesture identifiers and script functions
+		@type snapshot: Any
+		@return: raw fields of the gestures grouped by module
+		@rtype: dict[Hashable, list[GestureFields]]
+		"""
+		sources: dict[Hashable, list[GestureFields]] = {}
+		for bindings in snapshot:
+			for row in unsignedFields(bindings):
+				sources.setdefault(row[4], []).append(row)
+		return sources
+
+
+class GlobalPluginsScanner(ScriptableObjectsScanner):
+	"""Gestures binded to the scripts of the running global plugins without text description."""
+
+	name: str = "globalPlugins"
 
-		mapping = inputCore.manager.getAllGestureMappings()
-		for category in list(mapping):
-			for script in mapping[category]:
-				obj = mapping[category][script]
-				for gest in obj.gestures:
-					gesture = Gesture(
-						gesture=gest,
-						category=obj.category,
-						displayName=obj.displayName,
-						className=obj.className,
-						moduleName=obj.moduleName,
-						scriptName=obj.scriptName,
-					)
-					self.append(gesture)
-
-	def unsigned(self) -> None:
-		"""Scan gestures binded to functions without text description
-		wich not displayed in the "Input Gestures" dialog.
+	@override
+	def objects(self) -> list[Any]:
+		"""The running global plugins.
+		@return: the objects that have a gesture map
+		@rtype: list[Any]
 		"""
 		import globalPluginHandler
 
-		for plugin in globalPluginHandler.runningPlugins:
-			for gest, obj in plugin._gestureMap.items():
-				if obj and not obj.__doc__:
-					gesture = Gesture(
-						gesture=gest,
-						displayName=obj.__doc__,
-						moduleName=obj.__module__,
-						scriptName=obj.__name__.replace("script_", ""),
-					)
-					self.append(gesture)
+		return list(globalPluginHandler.runningPlugins)
+
+
+class AppModulesScanner(ScriptableObjectsScanner):
+	"""Gestures binded to the scripts of the application module in focus without text description.
+	Only one application module handles the gestures at a time, so the modules of other running
+	applications cannot conflict with it and are not scanned.
+	"""
+
+	name: str = "appModules"
+
+	@override
+	def objects(self) -> list[Any]:
+		"""The application module of the focused object.
+		@return: the objects that have a gesture map
+		@rtype: list[Any]
+		"""
+		import api
+
+		focus = api.getFocusObject()
+		appModule = focus.appModule if focus else None
+		return [appModule] if appModule is not None else []
+
+
+class BrailleDisplayScanner(ScriptableObjectsScanner):
+	"""Gestures binded to the scripts of the active braille display driver without text description."""
+
+	name: str = "brailleDisplay"
+
+	@override
+	def objects(self) -> list[Any]:
+		"""The active braille display driver.
+		@return: the objects that have a gesture map
+		@rtype: list[Any]
+		"""
+		import braille
+
+		display = braille.handler.display if braille.handler else None
+		return [display] if display is not None else []
+
+
+class VisionProvidersScanner(ScriptableObjectsScanner):
+	"""Gestures binded to the scripts of the active vision enhancement providers without text description."""
+
+	name: str = "visionProviders"
+
+	@override
+	def objects(self) -> list[Any]:
+		"""The active vision enhancement providers.
+		@return: the objects that have a gesture map
+		@rtype: list[Any]
+		"""
+		import vision
+
+		return list(vision.handler.getActiveProviderInstances()) if vision.handler else []
+
+
+class ScannerRegistry:
+	"""Registry of the sources of input gestures.
+	The result of each scanner is cached together with its fingerprint, so only the sources
+	that have changed since the previous scan are scanned again, and they are scanned in parallel.
+	"""
+
+	def __init__(self, scanners: Iterable[GestureScanner] = ()) -> None:
+		"""Initialization of the registry.
+		@param scanners: the scanners registered initially
+		@type scanners: Iterable[GestureScanner]
+		"""
+		self._lock = threading.Lock()
+		self._scanners: dict[str, GestureScanner] = {}
+		self._results: dict[str, tuple[Hashable, dict[Hashable, frozenset[GestureFields]]]] = {}
+		for scanner in scanners:
+			self.register(scanner)
+
+	def register(self, scanner: GestureScanner) -> None:
+		"""Add the source of input gestures, replacing the one with the same name.
+		@param scanner: the scanner of the source
+		@type scanner: GestureScanner
+		"""
+		with self._lock:
+			self._scanners[scanner.name] = scanner
+			self._results.pop(scanner.name, None)
+
+	def unregister(self, name: str) -> None:
+		"""Remove the source of input gestures.
+		@param name: the name of the scanner
+		@type name: str
+		"""
+		with self._lock:
+			self._scanners.pop(name, None)
+			self._results.pop(name, None)
+
+	def fingerprint(self) -> dict[str, Hashable]:
+		"""Fingerprints of all sources. Must be called from the main thread.
+		A scanner that cannot be used, for example because the NVDA component it relies on is missing,
+		is skipped with a warning in the log.
+		@return: fingerprints of the scanners by their names
+		@rtype: dict[str, Hashable]
+		"""
+		fingerprints: dict[str, Hashable] = {}
+		for name, scanner in list(self._scanners.items()):
+			try:
+				fingerprints[name] = scanner.fingerprint()
+			except Exception:
+				from logHandler import log
+
+				log.warning("Unable to use the %s scanner of input gestures", name, exc_info=True)
+		return fingerprints
+
+	def prepare(
+		self, fingerprints: dict[str, Hashable]
+	) -> Callable[[], dict[Hashable, frozenset[GestureFields]]]:
+		"""Take the snapshots of the sources that have changed since the previous scan.
+		Must be called from the main thread, while the returned function can be called from any thread.
+		@param fingerprints: the fingerprints of the sources returned by the fingerprint method
+		@type fingerprints: dict[str, Hashable]
+		@return: function that scans the changed sources and returns the gestures of all sources
+		@rtype: Callable[[], dict[Hashable, frozenset[GestureFields]]]
+		"""
+		snapshots: dict[str, Any] = {}
+		for name, fingerprint in fingerprints.items():
+			cached = self._results.get(name)
+			if cached is None or cached[0] != fingerprint:
+				with timings.phase("snapshot:" + name):
+					snapshots[name] = self._scanners[name].snapshot()
+
+		def scan(name: str) -> dict[Hashable, frozenset[GestureFields]]:
+			with timings.phase("scan:" + name) as phase:
+				sources = self._scanners[name].scan(snapshots[name])
+				result = {(name, source): frozenset(rows) for source, rows in sources.items()}
+				phase.count = sum(map(len, result.values()))
+			return result
+
+		def complete() -> dict[Hashable, frozenset[GestureFields]]:
+			if len(snapshots) > 1:
+				from concurrent.futures import ThreadPoolExecutor
+
+				with ThreadPoolExecutor(max_workers=len(snapshots)) as executor:
+					scanned = dict(zip(snapshots, executor.map(scan, snapshots)))
+			else:
+				scanned = {name: scan(name) for name in snapshots}
+			sources: dict[Hashable, frozenset[GestureFields]] = {}
+			with self._lock:
+				for name, fingerprint in fingerprints.items():
+					if name in scanned:
+						self._results[name] = (fingerprint, scanned[name])
+					if name in self._results:
+						sources.update(self._results[name][1])
+			return sources
+
+		return complete
+
+	def invalidate(self) -> None:
+		"""Force all sources to be scanned again on the next request."""
+		with self._lock:
+			self._results.clear()
+
+
+scanners = ScannerRegistry(
+	(
+		SignedScanner(),
+		GlobalPluginsScanner(),
+		AppModulesScanner(),
+		BrailleDisplayScanner(),
+		VisionProvidersScanner(),
+	),
+)
+
+
+class GesturesPipeline:
+	"""Pipeline of input gestures from the raw fields to the conflicts: source, normalization and filtering,
+	used by the background check for new conflicts.
+	The source takes the gestures from the registered scanners, so the pipeline sees the same inventory
+	as the rest of the add-on, and the sources that have not changed since the previous scan are not scanned again.
+	The changed sources are scanned completely before the first stage runs, the rest of the stages are generators,
+	so the conflicts are found in a single pass, without building the collection of gestures and its indexes.
+	The pipeline must be created in the main thread, while its queries can be performed from any thread.
+	"""
+
+	def __init__(self, layout: str | None = None, registry: ScannerRegistry | None = None) -> None:
+		"""Initialization of the pipeline, the state of the sources of input gestures is read immediately.
+		@param layout: the name of the keyboard layout used to build the canonical keys,
+		the current layout is used if not specified
+		@type layout: str | None
+		@param registry: the sources of input gestures, the registry of the add-on is used if not specified
+		@type registry: ScannerRegistry | None
+		"""
+		if layout is None:
+			import config
+
+			layout = config.conf["keyboard"]["keyboardLayout"]
+		self.layout: str = layout
+		registry = registry or scanners
+		self._read = registry.prepare(registry.fingerprint())
+		self._sources: dict[Hashable, frozenset[GestureFields]] | None = None
+
+	def source(self) -> Iterator[GestureFields]:
+		"""Raw fields of all input gestures used in NVDA, grouped by the source they come from.
+		The changed sources are scanned on the first request, the result is reused by the next queries.
+		@return: fields of the gestures in the order of the Gesture constructor arguments
+		@rtype: Iterator[GestureFields]
+		"""
+		if self._sources is None:
+			self._sources = self._read()
+		for rows in self._sources.values():
+			yield from rows
+
+	def normalize(self, rows: Iterable[GestureFields]) -> Iterator[tuple[GestureKey, Gesture]]:
+		"""Create gestures from the raw fields, skip repeated ones and attach their canonical keys.
+		@param rows: fields of the gestures in the order of the Gesture constructor arguments
+		@type rows: Iterable[GestureFields]
+		@return: pairs of the canonical key and the gesture
+		@rtype: Iterator[tuple[GestureKey, Gesture]]
+		"""
+		seen: set[Gesture] = set()
+		for row in rows:
+			gesture = Gesture(*row)
+			if gesture in seen:
+				continue
+			seen.add(gesture)
+			yield gestureKey(gesture.gesture, self.layout), gesture
+
+	@staticmethod
+	def conflicting(items: Iterable[tuple[GestureKey, Gesture]]) -> Iterator[tuple[GestureKey, Gesture]]:
+		"""Pass only the gestures whose canonical key is shared with another gesture.
+		The first gesture with the key is passed as soon as the second one is found.
+		@param items: pairs of the canonical key and the gesture
+		@type items: Iterable[tuple[GestureKey, Gesture]]
+		@return: pairs of the canonical key and the conflicting gesture
+		@rtype: Iterator[tuple[GestureKey, Gesture]]
+		"""
+		first: dict[GestureKey, Gesture] = {}
+		reported: set[GestureKey] = set()
+		for key, gesture in items:
+			if key in reported:
+				yield key, gesture
+				continue
+			other = first.setdefault(key, gesture)
+			if other is not gesture:
+				reported.add(key)
+				yield key, other
+				yield key, gesture
+
+	def conflicts(self) -> dict[GestureKey, str]:
+		"""All input gestures binded to several functions, found in a single pass over the sources.
+		@return: canonical keys of the conflicting gestures mapped to the identifier of one of their bindings
+		@rtype: dict[GestureKey, str]
+		"""
+		found: dict[GestureKey, str] = {}
+		for key, gesture in self.conflicting(self.normalize(self.source())):
+			found.setdefault(key, gesture.gesture)
+		return found
+
+
+class GesturesCache:
+	"""Process-wide cache of the scanned input gestures inventory.
+	The inventory is scanned again only when the fingerprint of any of the registered scanners has changed,
+	and then only the changed sources are scanned.
+	The repeated scan updates the cached inventory incrementally, only changed gestures are processed.
+	@ivar hits: the number of requests served from the cache
+	@type hits: int
+	@ivar misses: the number of requests that required a new scan
+	@type misses: int
+	@ivar lock: must be held while the cached inventory is read or updated
+	@type lock: threading.RLock
+	"""
+
+	def __init__(self) -> None:
+		"""Initialization of internal fields."""
+		self.lock = threading.RLock()
+		self._gestures: Gestures | None = None
+		self._fingerprint: dict[str, Hashable] | None = None
+		self.hits: int = 0
+		self.misses: int = 0
+
+	def get(self) -> Gestures:
+		"""Inventory of all input gestures used in NVDA, scanned only if the cached one is out of date.
+		@return: collection of all input gestures
+		@rtype: Gestures
+		"""
+		return self.prepare()()
+
+	def prepare(self) -> Callable[[], Gestures]:
+		"""Read from NVDA everything required to obtain the inventory.
+		Must be called from the main thread, while the returned function can be called from any thread.
+		@return: function that returns the cached inventory or builds a new one from the data read
+		@rtype: Callable[[], Gestures]
+		"""
+		fingerprint = scanners.fingerprint()
+		cached = self._gestures
+		if cached is not None and fingerprint == self._fingerprint:
+			self.hits += 1
+			return lambda: cached
+		self.misses += 1
+		read = scanners.prepare(fingerprint)
+
+		def build() -> Gestures:
+			sources = read()
+			with self.lock, timings.phase("update") as phase:
+				gestures = Gestures() if self._gestures is None else self._gestures
+				phase.count = sum(gestures.update(sources))
+				self._gestures, self._fingerprint = gestures, fingerprint
+			return gestures
+
+		return build
+
+	def conflictsFor(
+		self, identifiers: Iterable[str], layout: str | None = None
+	) -> Callable[[], list[Gesture]]:
+		"""All bindings of the input gesture, if it is binded to several functions.
+		The answer is taken from the index of the inventory by canonical keys, which takes constant time
+		while the cached inventory is up to date, otherwise the changed sources are scanned first.
+		Must be called from the main thread, while the returned function can be called from any thread.
+		@param identifiers: the identifiers of the input gesture, e.g. all its normalized identifiers
+		@type identifiers: Iterable[str]
+		@param layout: the name of the keyboard layout, the current layout is used if not specified
+		@type layout: str | None
+		@return: function that returns the conflicting bindings of the gesture or an empty list if there are none
+		@rtype: Callable[[], list[Gesture]]
+		"""
+		if layout is None:
+			import config
+
+			layout = config.conf["keyboard"]["keyboardLayout"]
+		build = self.prepare()
+		keys = list(dict.fromkeys(gestureKey(identifier, layout) for identifier in identifiers))
+		current: str = layout
+
+		def lookup() -> list[Gesture]:
+			with self.lock:
+				index = build().index(current)
+				bindings = [gesture for key in keys if index.count(key) > 1 for gesture in index.get(key)]
+			return list(dict.fromkeys(bindings))
+
+		return lookup
+
+	def invalidate(self) -> None:
+		"""Force the next request to scan the input gestures again, for example after switching the profile.
+		The cached inventory is kept, so that it can be updated incrementally.
+		"""
+		self._fingerprint = None
+		scanners.invalidate()
+
+
+inventory = GesturesCache()
+
+
+class SearchIndex:
+	"""Full-text index of the rows of a gestures list, used to filter the list as the user types.
+	The texts of each row are split into lowercase words, the sorted list of all words
+	allows finding the words that start with a prefix by binary search.
+	A row matches the query if each word of the query is the beginning of a word of the row.
+	The rows found for each word of the query are cached, so typing the next character
+	only narrows down the previous result.
+	"""
+
+	_words = re.compile(r"\w+")
+
+	def __init__(self, rows: Iterable[Iterable[str | None]]) -> None:
+		"""Build the index.
+		@param rows: the texts of each row, e.g. the gesture, the script description and the category
+		@type rows: Iterable[Iterable[str | None]]
+		"""
+		postings: dict[str, set[int]] = {}
+		self._count = 0
+		for number, texts in enumerate(rows):
+			for text in texts:
+				for word in self._words.findall(text.lower()) if text else ():
+					postings.setdefault(word, set()).add(number)
+			self._count = number + 1
+		self._tokens: list[str] = sorted(postings)
+		self._postings: list[frozenset[int]] = [frozenset(postings[token]) for token in self._tokens]
+		self._cache: dict[str, frozenset[int]] = {}
+
+	def __len__(self) -> int:
+		"""The number of indexed rows.
+		@return: the number of rows
+		@rtype: int
+		"""
+		return self._count
+
+	def prefix(self, word: str) -> frozenset[int]:
+		"""Rows containing a word that starts with the given prefix.
+		@param word: lowercase prefix
+		@type word: str
+		@return: the numbers of the matching rows
+		@rtype: frozenset[int]
+		"""
+		rows = self._cache.get(word)
+		if rows is not None:
+			return rows
+		# Typing the next character can only narrow down the result of the previous prefix
+		rows = self._match(word, self._cache.get(word[:-1]))
+		if len(self._cache) > 1024:
+			self._cache.clear()
+		self._cache[word] = rows
+		return rows
+
+	def _match(self, word: str, within: frozenset[int] | None = None) -> frozenset[int]:
+		"""Rows containing a word that starts with the given prefix, found by binary search of the words.
+		@param word: lowercase prefix
+		@type word: str
+		@param within: if specified, only these rows are collected
+		@type within: frozenset[int] | None
+		@return: the numbers of the matching rows
+		@rtype: frozenset[int]
+		"""
+		rows: set[int] = set()
+		for position in range(bisect_left(self._tokens, word), len(self._tokens)):
+			if not self._tokens[position].startswith(word):
+				break
+			rows.update(self._postings[position] if within is None else self._postings[position] & within)
+		return frozenset(rows)
+
+	def search(self, query: str) -> list[int]:
+		"""Rows that match all words of the query.
+		@param query: search query
+		@type query: str
+		@return: the numbers of the matching rows in ascending order, all rows if the query is empty
+		@rtype: list[int]
+		"""
+		words = self._words.findall(query.lower())
+		if not words:
+			return list(range(self._count))
+		with timings.phase("search") as phase:
+			matches = sorted((self.prefix(word) for word in words), key=len)
+			rows = sorted(matches[0].intersection(*matches[1:]))
+			phase.count = len(rows)
+		return rows
+
+
+class DispatchResolver:
+	"""Determines which of the functions binded to the same gesture is actually executed by NVDA.
+	NVDA looks for the script of a gesture at the following levels: global plugins in the order they run,
+	the application module in focus, the braille display driver, the vision enhancement providers,
+	the tree interceptor, the focused object and its ancestors and finally the global commands.
+	At each level the bindings from the user gesture map take precedence over the other ones.
+	The bindings of the application module, the tree interceptor and the NVDA objects are reachable
+	only if their class is in the focus context, the rest of them cannot be executed at the moment.
+	The state of NVDA is read once, after which the rank of each binding is computed without lookups.
+	"""
+
+	# Levels of the script lookup in the order of precedence
+	LEVELS: dict[str, int] = {
+		"globalPlugins": 0,
+		"appModules": 1,
+		"brailleDisplayDrivers": 2,
+		"visionEnhancementProviders": 3,
+		"treeInterceptor": 4,
+		"focus": 5,
+		"globalCommands": 6,
+	}
+	# Levels determined by the first part of the module name of the bindings that are not found
+	# among the classes of the running global plugins and the focus context
+	MODULE_LEVELS: tuple[str, ...] = (
+		"brailleDisplayDrivers",
+		"visionEnhancementProviders",
+		"globalCommands",
+	)
+	# The level of the bindings that cannot be executed in the current context
+	INACTIVE_LEVEL: int = 7
+
+	def __init__(
+		self,
+		layout: str,
+		plugins: Iterable[Iterable[tuple[str, str]]],
+		appModule: Iterable[tuple[str, str]],
+		treeInterceptor: Iterable[tuple[str, str]],
+		focusChain: Iterable[Iterable[tuple[str, str]]],
+		userBindings: Iterable[tuple[str, ...]],
+	) -> None:
+		"""Initialization of the resolver with the state of NVDA.
+		@param layout: the name of the keyboard layout used to build the canonical keys
+		@type layout: str
+		@param plugins: module and class names of the classes of each running global plugin
+			in the order of the lookup
+		@type plugins: Iterable[Iterable[tuple[str, str]]]
+		@param appModule: module and class names of the classes of the application module in focus
+		@type appModule: Iterable[tuple[str, str]]
+		@param treeInterceptor: module and class names of the classes of the tree interceptor in focus
+		@type treeInterceptor: Iterable[tuple[str, str]]
+		@param focusChain: module and class names of the classes of the focused object and its ancestors,
+			starting from the focused object
+		@type focusChain: Iterable[Iterable[tuple[str, str]]]
+		@param userBindings: gesture identifiers, module, class and script names from the user gesture map
+		@type userBindings: Iterable[tuple[str, ...]]
+		"""
+		self.layout = layout
+		# Module and class names, as well as module names alone for the bindings without a class name,
+		# mapped to the level and the order within the level, the first occurrence takes precedence
+		self._context: dict[tuple[str, str | None], tuple[int, int]] = {}
+		# Other classes of the global plugin modules, such as the overlay classes of NVDA objects,
+		# are reachable only through the focus context
+		contexts = [(self.LEVELS["globalPlugins"], classes) for classes in plugins]
+		contexts.append((self.LEVELS["appModules"], appModule))
+		contexts.append((self.LEVELS["treeInterceptor"], treeInterceptor))
+		contexts.extend((self.LEVELS["focus"], classes) for classes in focusChain)
+		for order, (level, classes) in enumerate(contexts):
+			for module, className in classes:
+				self._context.setdefault((module, className), (level, order))
+				self._context.setdefault((module, None), (level, order))
+		self._user = frozenset((gestureKey(gest, layout), *rest) for gest, *rest in userBindings)
+
+	@classmethod
+	def read(cls, layout: str) -> "DispatchResolver":
+		"""Create the resolver with the current state of NVDA, the focus ancestry is read only once.
+		Must be called from the main thread.
+		@param layout: the name of the keyboard layout used to build the canonical keys
+		@type layout: str
+		@return: the resolver
+		@rtype: DispatchResolver
+		"""
+		import api
+		import globalPluginHandler
+		import inputCore
+
+		def classes(obj: Any) -> list[tuple[str, str]]:
+			return [(c.__module__, c.__name__) for c in type(obj).__mro__] if obj is not None else []
+
+		focus = api.getFocusObject()
+		chain = [focus, *reversed(api.getFocusAncestors())] if focus else []
+		return cls(
+			layout,
+			[classes(plugin) for plugin in globalPluginHandler.runningPlugins],
+			classes(focus.appModule if focus else None),
+			classes(focus.treeInterceptor if focus else None),
+			[classes(obj) for obj in chain],
+			[
+				(gest, module, className, script)
+				for gest, scripts in inputCore.manager.userGestureMap._map.items()
+				for module, className, script in scripts
+				if script
+			],
+		)
+
+	def rank(self, gesture: Gesture) -> tuple[int, int, int]:
+		"""Precedence of the binding, the binding with the smallest rank is executed.
+		@param gesture: the binding of the input gesture
+		@type gesture: Gesture
+		@return: the level of the lookup, the order within the level and whether it is not a user binding
+		@rtype: tuple[int, int, int]
+		"""
+		module = gesture.moduleName or ""
+		found = self._context.get((module, gesture.className or None))
+		if found is not None:
+			level, order = found
+		elif module.partition(".")[0] in self.MODULE_LEVELS:
+			level, order = self.LEVELS[module.partition(".")[0]], 0
+		else:
+			level, order = self.INACTIVE_LEVEL, 0
+		user = (gestureKey(gesture.gesture, self.layout), module, gesture.className, gesture.scriptName)
+		return level, order, 0 if user in self._user else 1
+
+	def resolve(self, groups: dict[GestureKey, list[Gesture]]) -> dict[GestureKey, Gesture]:
+		"""Build the dispatch table of the conflicting gestures and order each group by precedence.
+		The gestures none of whose bindings can be executed in the current context have no winner.
+		@param groups: canonical gesture keys mapped to the lists of all gestures that share them
+		@type groups: dict[GestureKey, list[Gesture]]
+		@return: canonical gesture keys mapped to the bindings executed by NVDA
+		@rtype: dict[GestureKey, Gesture]
+		"""
+		winners: dict[GestureKey, Gesture] = {}
+		for key, group in groups.items():
+			ranks = {id(gesture): self.rank(gesture) for gesture in group}
+			group.sort(key=lambda gesture: ranks[id(gesture)])
+			if ranks[id(group[0])][0] != self.INACTIVE_LEVEL:
+				winners[key] = group[0]
+		return winners
 
 
 class FilteredGestures:
-	"""Basic class for filtered collections of input gestures."""
+	"""Basic class for filtered collections of input gestures.
+	The filtered gestures are collected only once, on first access,
+	all further operations with the collection use the stored result.
+	"""
 
 	name: str = ""
 
+	def __init__(self) -> None:
+		"""Initialization of internal fields."""
+		self._gestures: list[Gesture] | None = None
+		self._layout: str = ""
+
 	@property
 	def title(self) -> str:
 		"""The title of the window that displays a list of input gestures from the collection.
@@ -239,16 +1306,84 @@ class FilteredGestures:
 		"""
 		return self.name + "..."
 
+	@property
+	def gestures(self) -> list[Gesture]:
+		"""Filtered input gestures, collected on first access.
+		@return: list of the filtered input gestures
+		@rtype: list[Gesture]
+		"""
+		if self._gestures is None:
+			self.prepare()()
+		return self._gestures or []
+
+	def prepare(self) -> Callable[[], None]:
+		"""Read from NVDA everything required to collect the filtered gestures.
+		Must be called from the main thread, while the returned function,
+		which completes the collection, can be called from a background thread.
+		@return: function that filters the inventory and stores the result
+		@rtype: Callable[[], None]
+		"""
+		import config
+
+		self._layout = config.conf["keyboard"]["keyboardLayout"]
+		build = inventory.prepare()
+
+		def complete() -> None:
+			gestures = build()
+			with inventory.lock, timings.phase("collect") as phase:
+				self._gestures = list(self.collect(gestures))
+				phase.count = len(self._gestures)
+
+		return complete
+
+	def reset(self) -> None:
+		"""Discard the collected result, so the next access will scan the input gestures again."""
+		self._gestures = None
+
+	def key(self, gesture: Gesture) -> GestureKey:
+		"""Canonical key of the input gesture for the keyboard layout used during the scan.
+		@param gesture: an input gesture from the collection
+		@type gesture: Gesture
+		@return: canonical gesture key
+		@rtype: GestureKey
+		"""
+		return gestureKey(gesture.gesture, self._layout)
+
 	def __len__(self) -> int:
 		"""The number of input gestures in the collection.
 		@return: length of the collection
 		@rtype: int
 		"""
-		return len([item for item in self])
+		return len(self.gestures)
+
+	def __bool__(self) -> bool:
+		"""Indication of whether the collection contains at least one input gesture.
+		@return: whether the collection is not empty
+		@rtype: bool
+		"""
+		return len(self.gestures) > 0
+
+	def __getitem__(self, index: int) -> Gesture:
+		"""Gesture from the collection under a given index.
+		@param index: index of the input gesture in the collection
+		@type index: int
+		@return: input gesture from collection under a given index
+		@rtype: Gesture
+		"""
+		return self.gestures[index]
 
 	def __iter__(self) -> Iterator[Gesture]:
+		"""Iterator of the filtered input gestures.
+		@return: iterator of the filtered input gestures
+		@rtype: Iterator[Gesture]
+		"""
+		return iter(self.gestures)
+
+	def collect(self, gestures: Gestures) -> Iterator[Gesture]:
 		"""Consistently returns input gestures from the collection filtered by a certain property.
 		The method must be overridden in the child class.
+		@param gestures: inventory of all input gestures used in NVDA
+		@type gestures: Gestures
 		@return: iterator of the filtered input gestures
 		@rtype: Iterator[Gesture]
 		"""
@@ -259,36 +1394,207 @@ class Duplicates(FilteredGestures):
 	"""Collection of duplicate input gestures."""
 
 	@override
-	def __iter__(self) -> Iterator[Gesture]:
+	def __init__(self) -> None:
+		"""Initialization of internal fields."""
+		super(Duplicates, self).__init__()
+		self._groups: dict[GestureKey, list[Gesture]] = {}
+		self._winners: dict[GestureKey, Gesture] = {}
+		self._resolver: DispatchResolver | None = None
+
+	@property
+	def groups(self) -> dict[GestureKey, list[Gesture]]:
+		"""Groups of the conflicting input gestures, collected together with the gestures.
+		@return: canonical gesture keys mapped to the lists of all gestures that share them
+		@rtype: dict[GestureKey, list[Gesture]]
+		"""
+		if self._gestures is None:
+			self.prepare()()
+		return self._groups
+
+	def winner(self, key: GestureKey) -> Gesture | None:
+		"""The binding of the conflicting gesture that is actually executed by NVDA,
+		the rest of the group is shadowed by it.
+		@param key: canonical gesture key
+		@type key: GestureKey
+		@return: the winning binding or None if the gesture is not conflicting
+		@rtype: Gesture | None
+		"""
+		if self._gestures is None:
+			self.prepare()()
+		return self._winners.get(key)
+
+	@override
+	def prepare(self) -> Callable[[], None]:
+		"""Read from NVDA everything required to collect the filtered gestures, including the dispatch order.
+		Must be called from the main thread, while the returned function,
+		which completes the collection, can be called from a background thread.
+		@return: function that filters the inventory and stores the result
+		@rtype: Callable[[], None]
+		"""
+		complete = super(Duplicates, self).prepare()
+		self._resolver = DispatchResolver.read(self._layout)
+		return complete
+
+	@override
+	def reset(self) -> None:
+		"""Discard the collected result, so the next access will scan the input gestures again."""
+		super(Duplicates, self).reset()
+		self._groups = {}
+		self._winners = {}
+
+	def resolve(self) -> None:
+		"""Order each group of the conflicting gestures by precedence and find the winning bindings."""
+		if self._resolver is None:
+			return
+		with timings.phase("resolve") as phase:
+			self._winners = self._resolver.resolve(self._groups)
+			phase.count = len(self._winners)
+
+	@override
+	def collect(self, gestures: Gestures) -> Iterator[Gesture]:
 		"""Collection of the duplicated input gestures.
+		The groups are taken from the index of the inventory by canonical keys, which is maintained incrementally.
+		@param gestures: inventory of all input gestures used in NVDA
+		@type gestures: Gestures
 		@return: iterator of the duplicated input gestures
 		@rtype: Iterator[Gesture]
 		"""
+		with timings.phase("grouping") as phase:
+			self._groups = gestures.index(self._layout).duplicates()
+			phase.count = len(self._groups)
+		self.resolve()
+		for group in self._groups.values():
+			yield from group
+
+
+class ProfileDuplicates(Duplicates):
+	"""Collection of input gestures duplicated in any of the configuration profiles or keyboard layouts.
+	The input gestures are the same in all profiles, which differ only in the keyboard layout,
+	so the conflicts are computed once for each layout and then attributed to the profiles that use it.
+	"""
+
+	@override
+	def __init__(self) -> None:
+		"""Initialization of internal fields."""
+		super(ProfileDuplicates, self).__init__()
+		self._profiles: dict[str, str] = {}
+		self._matrix: dict[str, dict[GestureKey, list[Gesture]]] = {}
+
+	@property
+	def profiles(self) -> dict[str, str]:
+		"""The keyboard layout used in each configuration profile, read during the scan.
+		@return: profile names mapped to the names of the layouts, the normal configuration has an empty name
+		@rtype: dict[str, str]
+		"""
+		return self._profiles
+
+	@property
+	def matrix(self) -> dict[str, dict[GestureKey, list[Gesture]]]:
+		"""Conflicting input gestures for each of the keyboard layouts.
+		@return: for each layout, canonical gesture keys mapped to the lists of all gestures that share them
+		@rtype: dict[str, dict[GestureKey, list[Gesture]]]
+		"""
+		if self._gestures is None:
+			self.prepare()()
+		return self._matrix
+
+	def where(self, key: GestureKey) -> dict[str, list[str]]:
+		"""The keyboard layouts in which the gesture is conflicting and the profiles that use them.
+		@param key: canonical gesture key
+		@type key: GestureKey
+		@return: layout names mapped to the names of the profiles that use the layout
+		@rtype: dict[str, list[str]]
+		"""
+		return {
+			layout: [name for name, used in self._profiles.items() if used == layout]
+			for layout, conflicts in self.matrix.items()
+			if key in conflicts
+		}
+
+	@staticmethod
+	def readProfiles() -> dict[str, str]:
+		"""Read the keyboard layout used in each configuration profile.
+		Must be called from the main thread, since it accesses the NVDA configuration.
+		@return: profile names mapped to the names of the layouts, the normal configuration has an empty name
+		@rtype: dict[str, str]
+		"""
 		import config
+		from logHandler import log
 
-		gestures = Gestures()
-		gestures.initialize()
-		collection = [
-			gt.gesture.replace("(%s)" % config.conf["keyboard"]["keyboardLayout"], "") for gt in gestures
-		]
-		for gest in gestures:
-			if (
-				collection.count(gest.gesture.replace("(%s)" % config.conf["keyboard"]["keyboardLayout"], ""))
-				> 1
-			):
-				yield gest
+		normal: str = config.conf.profiles[0].get("keyboard", {}).get("keyboardLayout", LAYOUTS[0])
+		profiles = {"": normal}
+		for name in config.conf.listProfiles():
+			try:
+				profile = config.conf._getProfile(name)
+			except Exception:
+				log.warning("Unable to read the configuration profile %s", name, exc_info=True)
+				continue
+			profiles[name] = profile.get("keyboard", {}).get("keyboardLayout", normal)
+		return profiles
+
+	@override
+	def prepare(self) -> Callable[[], None]:
+		"""Read from NVDA everything required to collect the filtered gestures, including the profiles.
+		Must be called from the main thread, while the returned function,
+		which completes the collection, can be called from a background thread.
+		@return: function that filters the inventory and stores the result
+		@rtype: Callable[[], None]
+		"""
+		self._profiles = self.readProfiles()
+		return super(ProfileDuplicates, self).prepare()
+
+	@override
+	def reset(self) -> None:
+		"""Discard the collected result, so the next access will scan the input gestures again."""
+		super(ProfileDuplicates, self).reset()
+		self._matrix = {}
+
+	@override
+	def resolve(self) -> None:
+		"""The executed bindings are not determined for this collection.
+		A group merges the conflicts of all keyboard layouts, which are never active at the same time,
+		so the dispatch order of the current layout does not apply to the whole group.
+		"""
+		self._winners = {}
+
+	@override
+	def collect(self, gestures: Gestures) -> Iterator[Gesture]:
+		"""Collection of the input gestures duplicated in any of the keyboard layouts.
+		Each group contains the gestures that conflict with each other in at least one layout.
+		@param gestures: inventory of all input gestures used in NVDA
+		@type gestures: Gestures
+		@return: iterator of the duplicated input gestures
+		@rtype: Iterator[Gesture]
+		"""
+		layouts = dict.fromkeys(LAYOUTS) | dict.fromkeys(self._profiles.values())
+		with timings.phase("matrix") as phase:
+			self._matrix = conflictMatrix(gestures, layouts)
+			groups: dict[GestureKey, dict[Gesture, None]] = {}
+			for conflicts in self._matrix.values():
+				for key, group in conflicts.items():
+					groups.setdefault(key, {}).update(dict.fromkeys(group))
+			self._groups = {key: list(group) for key, group in groups.items()}
+			phase.count = len(self._groups)
+		self.resolve()
+		yielded: set[Gesture] = set()
+		for group in self._groups.values():
+			for gesture in group:
+				if gesture not in yielded:
+					yielded.add(gesture)
+					yield gesture
 
 
 class Unsigned(FilteredGestures):
 	"""Collection of input gestures binded to functions without a text description."""
 
 	@override
-	def __iter__(self) -> Iterator[Gesture]:
+	def collect(self, gestures: Gestures) -> Iterator[Gesture]:
 		"""Collection of the unsigned input gestures.
+		@param gestures: inventory of all input gestures used in NVDA
+		@type gestures: Gestures
 		@return: iterator of the unsigned input gestures
 		@rtype: Iterator[Gesture]
 		"""
-		gestures = Gestures()
-		gestures.unsigned()
 		for gest in gestures:
-			yield gest
+			if not gest.displayName:
+				yield gest
@@ -0,0 +1,432 @@
+# export.py
+# Export of the input gestures inventory and the conflict groups to files
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Export of the input gestures inventory and the conflict groups to files.
+All formats are written row by row, so the memory used does not depend on the size of the inventory.
+Supported formats, selected by the file extension:
+- ".jsonl" - JSON Lines: a metadata record, a record for each gesture and a record for each conflict group;
+- ".csv" - CSV table with a row for each gesture, the conflicting gestures have a non-empty "conflict" column,
+	the table is preceded by a comment line that starts with "#" and contains the metadata in JSON;
+- ".cgb" - compact binary columnar format, which consists of the magic bytes, a metadata block and row groups.
+	Each block is preceded by its length as a little-endian uint32, a zero length ends the file.
+	The metadata block contains UTF-8 JSON. A row group is compressed with zlib and contains
+	the number of rows, the strings first used in this group (a count and length-prefixed UTF-8 strings),
+	a column of uint32 string numbers for each field and a column of uint8 conflict flags.
+"""
+
+import csv
+import io
+import json
+import struct
+import zlib
+from abc import ABCMeta, abstractmethod
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from pathlib import Path
+from typing import IO, Any, override
+
+from .base import Gesture, GestureFields, GestureIndex, GestureKey, gestureKey
+
+# Names of the exported gesture fields, in the order of the Gesture constructor arguments
+FIELDS: tuple[str, ...] = ("gesture", "category", "displayName", "className", "moduleName", "scriptName")
+
+
+def metadata(layout: str) -> dict[str, Any]:
+	"""Description of the workstation and NVDA configuration the inventory is exported from.
+	@param layout: the name of the keyboard layout used to detect conflicts
+	@type layout: str
+	@return: metadata stored in the exported file
+	@rtype: dict[str, Any]
+	"""
+	import platform
+	import time
+
+	meta: dict[str, Any] = {
+		"machine": platform.node(),
+		"layout": layout,
+		"created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+	}
+	try:
+		import versionInfo
+
+		meta["nvdaVersion"] = versionInfo.version
+	except ImportError:
+		pass
+	return meta
+
+
+class InventoryFormat(metaclass=ABCMeta):
+	"""Base class of the file formats of the exported gestures inventory."""
+
+	extension: str = ""
+	binary: bool = False
+
+	def __init__(self, stream: IO[Any]) -> None:
+		"""Initialization of the writer.
+		@param stream: the file opened for writing in the mode required by the format
+		@type stream: IO[Any]
+		"""
+		self.stream = stream
+
+	@abstractmethod
+	def writeHeader(self, meta: dict[str, Any]) -> None:
+		"""Write the beginning of the file.
+		@param meta: description of the workstation and NVDA configuration
+		@type meta: dict[str, Any]
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+	@abstractmethod
+	def writeRow(self, gesture: Gesture, key: GestureKey, conflict: bool) -> None:
+		"""Write one gesture of the inventory.
+		@param gesture: an input gesture
+		@type gesture: Gesture
+		@param key: canonical key of the gesture
+		@type key: GestureKey
+		@param conflict: whether the gesture conflicts with another one
+		@type conflict: bool
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+	def writeConflicts(self, groups: dict[GestureKey, list[Gesture]]) -> None:
+		"""Write the groups of the conflicting gestures, if the format stores them separately.
+		@param groups: canonical gesture keys mapped to the conflicting gestures
+		@type groups: dict[GestureKey, list[Gesture]]
+		"""
+
+	def finish(self) -> None:
+		"""Write the end of the file."""
+
+	@classmethod
+	@abstractmethod
+	def read(cls, stream: IO[Any]) -> tuple[dict[str, Any], Iterator[GestureFields]]:
+		"""Read the exported inventory.
+		@param stream: the file opened for reading in the mode required by the format
+		@type stream: IO[Any]
+		@return: metadata and lazily read fields of the gestures
+		@rtype: tuple[dict[str, Any], Iterator[GestureFields]]
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+
+class JSONLinesFormat(InventoryFormat):
+	"""JSON Lines: one JSON object per line, distinguished by the "type" field."""
+
+	extension = ".jsonl"
+
+	@override
+	def writeHeader(self, meta: dict[str, Any]) -> None:
+		"""Write the metadata record.
+		@param meta: description of the workstation and NVDA configuration
+		@type meta: dict[str, Any]
+		"""
+		self.stream.write(json.dumps({"type": "meta", **meta}, ensure_ascii=False) + "\n")
+
+	@override
+	def writeRow(self, gesture: Gesture, key: GestureKey, conflict: bool) -> None:
+		"""Write the gesture record.
+		@param gesture: an input gesture
+		@type gesture: Gesture
+		@param key: canonical key of the gesture
+		@type key: GestureKey
+		@param conflict: whether the gesture conflicts with another one
+		@type conflict: bool
+		"""
+		record: dict[str, Any] = {"type": "gesture", **{field: getattr(gesture, field) for field in FIELDS}}
+		record.update(key=key, conflict=conflict)
+		self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+	@override
+	def writeConflicts(self, groups: dict[GestureKey, list[Gesture]]) -> None:
+		"""Write a record for each group of the conflicting gestures.
+		@param groups: canonical gesture keys mapped to the conflicting gestures
+		@type groups: dict[GestureKey, list[Gesture]]
+		"""
+		for key, group in groups.items():
+			record = {
+				"type": "conflict",
+				"key": key,
+				"bindings": [{field: getattr(gesture, field) for field in FIELDS} for gesture in group],
+			}
+			self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+	@override
+	@classmethod
+	def read(cls, stream: IO[Any]) -> tuple[dict[str, Any], Iterator[GestureFields]]:
+		"""Read the exported inventory.
+		@param stream: the file opened for reading in text mode
+		@type stream: IO[Any]
+		@return: metadata and lazily read fields of the gestures
+		@rtype: tuple[dict[str, Any], Iterator[GestureFields]]
+		"""
+		first = stream.readline()
+		meta: dict[str, Any] = json.loads(first) if first.strip() else {}
+		meta.pop("type", None)
+
+		def rows() -> Iterator[GestureFields]:
+			for line in stream:
+				record = json.loads(line)
+				if record.get("type") == "gesture":
+					yield record["gesture"], *(record[field] or None for field in FIELDS[1:])
+
+		return meta, rows()
+
+
+class CSVFormat(InventoryFormat):
+	"""CSV table with a header row, preceded by a comment line with the metadata."""
+
+	extension = ".csv"
+	COMMENT: str = "#"
+
+	@override
+	def writeHeader(self, meta: dict[str, Any]) -> None:
+		"""Write the metadata line and the header row of the table.
+		@param meta: description of the workstation and NVDA configuration
+		@type meta: dict[str, Any]
+		"""
+		self._writer = csv.writer(self.stream)
+		comment = self.COMMENT + json.dumps(meta, ensure_ascii=False)
+		self.stream.write(comment + self._writer.dialect.lineterminator)
+		self._writer.writerow((*FIELDS, "key", "conflict"))
+
+	@override
+	def writeRow(self, gesture: Gesture, key: GestureKey, conflict: bool) -> None:
+		"""Write the table row.
+		@param gesture: an input gesture
+		@type gesture: Gesture
+		@param key: canonical key of the gesture
+		@type key: GestureKey
+		@param conflict: whether the gesture conflicts with another one
+		@type conflict: bool
+		"""
+		self._writer.writerow((*(getattr(gesture, field) for field in FIELDS), key, key if conflict else ""))
+
+	@override
+	@classmethod
+	def read(cls, stream: IO[Any]) -> tuple[dict[str, Any], Iterator[GestureFields]]:
+		"""Read the exported inventory.
+		The files without the metadata line are also accepted, their metadata is empty.
+		@param stream: the file opened for reading in text mode
+		@type stream: IO[Any]
+		@return: metadata and lazily read fields of the gestures
+		@rtype: tuple[dict[str, Any], Iterator[GestureFields]]
+		"""
+		first: str = stream.readline()
+		meta: dict[str, Any] = {}
+		if first.startswith(cls.COMMENT):
+			meta = json.loads(first[len(cls.COMMENT) :])
+			reader = csv.DictReader(stream)
+		else:
+			reader = csv.DictReader(chain([first], stream))
+
+		def rows() -> Iterator[GestureFields]:
+			for record in reader:
+				yield record["gesture"], *(record[field] or None for field in FIELDS[1:])
+
+		return meta, rows()
+
+
+class ColumnarFormat(InventoryFormat):
+	"""Compact binary columnar format with string deduplication and compressed row groups."""
+
+	extension = ".cgb"
+	binary = True
+	MAGIC: bytes = b"CGB\x01"
+	GROUP_SIZE: int = 4096
+
+	@override
+	def __init__(self, stream: IO[Any]) -> None:
+		"""Initialization of the writer.
+		@param stream: the file opened for writing in binary mode
+		@type stream: IO[Any]
+		"""
+		super(ColumnarFormat, self).__init__(stream)
+		self._strings: dict[str, int] = {}
+		self._newStrings: list[str] = []
+		self._columns: list[array[int]] = [array("I") for _field in range(len(FIELDS) + 1)]
+		self._conflicts = bytearray()
+
+	def _writeBlock(self, data: bytes) -> None:
+		"""Write a length-prefixed block.
+		@param data: contents of the block
+		@type data: bytes
+		"""
+		self.stream.write(struct.pack("<I", len(data)))
+		self.stream.write(data)
+
+	def _stringId(self, value: str) -> int:
+		"""The number of the string in the string table, new strings are added to the table.
+		@param value: a string
+		@type value: str
+		@return: the number of the string
+		@rtype: int
+		"""
+		number = self._strings.get(value)
+		if number is None:
+			number = self._strings[value] = len(self._strings)
+			self._newStrings.append(value)
+		return number
+
+	def _flush(self) -> None:
+		"""Write the accumulated rows as a compressed row group."""
+		if not self._conflicts:
+			return
+		data = io.BytesIO()
+		data.write(struct.pack("<II", len(self._conflicts), len(self._newStrings)))
+		for value in self._newStrings:
+			encoded = value.encode("utf-8")
+			data.write(struct.pack("<I", len(encoded)))
+			data.write(encoded)
+		for column in self._columns:
+			data.write(column.tobytes())
+			del column[:]
+		data.write(bytes(self._conflicts))
+		self._writeBlock(zlib.compress(data.getvalue()))
+		self._newStrings.clear()
+		self._conflicts.clear()
+
+	@override
+	def writeHeader(self, meta: dict[str, Any]) -> None:
+		"""Write the magic bytes and the metadata block.
+		@param meta: description of the workstation and NVDA configuration
+		@type meta: dict[str, Any]
+		"""
+		self.stream.write(self.MAGIC)
+		self._writeBlock(json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+	@override
+	def writeRow(self, gesture: Gesture, key: GestureKey, conflict: bool) -> None:
+		"""Add the gesture to the current row group.
+		@param gesture: an input gesture
+		@type gesture: Gesture
+		@param key: canonical key of the gesture
+		@type key: GestureKey
+		@param conflict: whether the gesture conflicts with another one
+		@type conflict: bool
+		"""
+		for column, value in zip(self._columns, (*(getattr(gesture, field) for field in FIELDS), key)):
+			column.append(self._stringId(value))
+		self._conflicts.append(conflict)
+		if len(self._conflicts) >= self.GROUP_SIZE:
+			self._flush()
+
+	@override
+	def finish(self) -> None:
+		"""Write the last row group and the end of the file."""
+		self._flush()
+		self.stream.write(struct.pack("<I", 0))
+
+	@override
+	@classmethod
+	def read(cls, stream: IO[Any]) -> tuple[dict[str, Any], Iterator[GestureFields]]:
+		"""Read the exported inventory.
+		@param stream: the file opened for reading in binary mode
+		@type stream: IO[Any]
+		@return: metadata and lazily read fields of the gestures
+		@rtype: tuple[dict[str, Any], Iterator[GestureFields]]
+		"""
+		if stream.read(len(cls.MAGIC)) != cls.MAGIC:
+			raise ValueError("Not an exported gestures inventory")
+
+		def block() -> bytes:
+			(length,) = struct.unpack("<I", stream.read(4))
+			return stream.read(length)
+
+		meta: dict[str, Any] = json.loads(block().decode("utf-8"))
+
+		def rows() -> Iterator[GestureFields]:
+			strings: list[str] = []
+			while data := block():
+				data = zlib.decompress(data)
+				count, newStrings = struct.unpack_from("<II", data)
+				offset = 8
+				for _i in range(newStrings):
+					(length,) = struct.unpack_from("<I", data, offset)
+					strings.append(data[offset + 4 : offset + 4 + length].decode("utf-8"))
+					offset += 4 + length
+				columns: list[array[int]] = []
+				for _field in FIELDS:
+					column = array("I")
+					column.frombytes(data[offset : offset + count * column.itemsize])
+					columns.append(column)
+					offset += count * column.itemsize
+				for row in range(count):
+					yield strings[columns[0][row]], *(strings[column[row]] or None for column in columns[1:])
+
+		return meta, rows()
+
+
+FORMATS: dict[str, type[InventoryFormat]] = {
+	fmt.extension: fmt for fmt in (JSONLinesFormat, CSVFormat, ColumnarFormat)
+}
+
+
+def formatFor(path: str | Path) -> type[InventoryFormat]:
+	"""The file format that corresponds to the file extension.
+	@param path: the path to the file
+	@type path: str | Path
+	@return: the class of the file format
+	@rtype: type[InventoryFormat]
+	@raise ValueError: if the extension is not supported
+	"""
+	suffix = Path(path).suffix.lower()
+	if suffix not in FORMATS:
+		raise ValueError("Unsupported file format: %s" % suffix)
+	return FORMATS[suffix]
+
+
+def exportInventory(
+	path: str | Path, gestures: Iterable[Gesture], index: GestureIndex, meta: dict[str, Any]
+) -> int:
+	"""Write the inventory of input gestures and the conflict groups to the file.
+	@param path: the path to the file, its extension determines the format
+	@type path: str | Path
+	@param gestures: all input gestures of the inventory
+	@type gestures: Iterable[Gesture]
+	@param index: index of the same gestures by canonical keys, used to detect conflicts
+	@type index: GestureIndex
+	@param meta: description of the workstation and NVDA configuration
+	@type meta: dict[str, Any]
+	@return: the number of written gestures
+	@rtype: int
+	"""
+	fmt = formatFor(path)
+	count = 0
+	with open(path, "wb") if fmt.binary else open(path, "w", encoding="utf-8", newline="") as stream:
+		writer = fmt(stream)
+		writer.writeHeader(meta)
+		for gesture in gestures:
+			key = gestureKey(gesture.gesture, index.layout)
+			writer.writeRow(gesture, key, index.count(key) > 1)
+			count += 1
+		writer.writeConflicts(index.duplicates())
+		writer.finish()
+	return count
+
+
+def readInventory(path: str | Path) -> tuple[dict[str, Any], Iterator[GestureFields]]:
+	"""Read the exported inventory of input gestures.
+	The file is closed when all gestures have been read.
+	@param path: the path to the file, its extension determines the format
+	@type path: str | Path
+	@return: metadata and lazily read fields of the gestures
+	@rtype: tuple[dict[str, Any], Iterator[GestureFields]]
+	"""
+	fmt = formatFor(path)
+	stream = open(path, "rb") if fmt.binary else open(path, "r", encoding="utf-8", newline="")
+	try:
+		meta, rows = fmt.read(stream)
+	except Exception:
+		stream.close()
+		raise
+
+	def read() -> Iterator[GestureFields]:
+		with stream:
+			yield from rows
+
+	return meta, read()
@@ -7,10 +7,13 @@
 
 from abc import ABCMeta, abstractmethod
 from collections.abc import Callable
+from functools import lru_cache
 from typing import override
 
 import addonHandler
+import config
 import gui
+import languageHandler
 import wx  # type: ignore
 from gui.inputGestures import InputGesturesDialog
 from gui.nvdaControls import AutoWidthColumnListCtrl
@@ -18,7 +21,15 @@ from gui.settingsDialogs import SettingsDialog
 from inputCore import getDisplayTextForGestureIdentifier
 from logHandler import log
 
-from .base import FilteredGestures
+from .base import (
+	Duplicates,
+	FilteredGestures,
+	Gesture,
+	GestureKey,
+	ProfileDuplicates,
+	SearchIndex,
+	timings,
+)
 
 try:
 	addonHandler.initTranslation()
@@ -27,6 +38,54 @@ except addonHandler.AddonError:
 _: Callable[[str], str]
 
 
+class GestureDisplayText:
+	"""Bounded cache of the display text of input gesture identifiers shared by all dialogs.
+	The cache is cleared when the keyboard layout or the NVDA interface language changes.
+	"""
+
+	def __init__(self, maxsize: int = 4096) -> None:
+		"""Initialization of the cache.
+		@param maxsize: the maximum number of cached identifiers
+		@type maxsize: int
+		"""
+		self._context: tuple[str, str] = ("", "")
+		self._format = lru_cache(maxsize=maxsize)(self.format)
+
+	@staticmethod
+	def format(identifier: str, layout: str) -> str:
+		"""Text representation of the input gesture, as displayed in the lists of gestures.
+		@param identifier: gesture identifier
+		@type identifier: str
+		@param layout: the name of the current keyboard layout, which is a part of the cache key
+		@type layout: str
+		@return: display text of the input gesture
+		@rtype: str
+		"""
+		with timings.phase("displayText") as phase:
+			phase.count = 1
+			return "{1} ({0})".format(*getDisplayTextForGestureIdentifier(identifier))
+
+	def __call__(self, identifier: str) -> str:
+		"""Display text of the input gesture, taken from the cache if possible.
+		@param identifier: gesture identifier
+		@type identifier: str
+		@return: display text of the input gesture
+		@rtype: str
+		"""
+		context = (config.conf["keyboard"]["keyboardLayout"], languageHandler.getLanguage())
+		if context != self._context:
+			self.clear()
+			self._context = context
+		return self._format(identifier, context[0])
+
+	def clear(self) -> None:
+		"""Remove all cached display texts."""
+		self._format.cache_clear()
+
+
+gestureDisplayText = GestureDisplayText()
+
+
 class InputGesturesDialogWithSearch(InputGesturesDialog):
 	"""Overridden standard NVDA Input Gestures dialog with search at initialization."""
 
@@ -42,6 +101,46 @@ class InputGesturesDialogWithSearch(InputGesturesDialog):
 			self.filterCtrl.SetValue(search)
 
 
+class ScanProgressDialog(wx.ProgressDialog):
+	"""Progress indicator displayed while input gestures are scanned in the background."""
+
+	def __init__(self, parent: wx.Window, title: str, message: str, onCancel: Callable[[], None]) -> None:
+		"""Initialization of the progress dialog.
+		@param parent: The parent window for this dialog
+		@type parent: wx.Window
+		@param title: the title of the dialog
+		@type title: str
+		@param message: the message displayed in the dialog
+		@type message: str
+		@param onCancel: function called when the user cancels the scan
+		@type onCancel: Callable[[], None]
+		"""
+		super(ScanProgressDialog, self).__init__(
+			title,
+			message,
+			parent=parent,
+			style=wx.PD_APP_MODAL | wx.PD_CAN_ABORT | wx.PD_ELAPSED_TIME,
+		)
+		self._onCancel = onCancel
+		self.timer = wx.PyTimer(self.onTimer)
+		self.timer.Start(250)
+		self.Raise()
+		self.CentreOnScreen()
+
+	def onTimer(self) -> None:
+		"""Update the progress indicator and check whether the user has cancelled the scan."""
+		keepGoing = self.Pulse()[0]
+		if not keepGoing:
+			self.done()
+			self._onCancel()
+
+	def done(self) -> None:
+		"""Close the progress dialog."""
+		self.timer.Stop()
+		self.Hide()
+		self.Destroy()
+
+
 class BaseGesturesDialog(SettingsDialog, metaclass=ABCMeta):
 	"""Base dialog window to display a collection of input gestures.
 	@ivar title: The title of the dialog.
@@ -59,23 +158,87 @@ class BaseGesturesDialog(SettingsDialog, metaclass=ABCMeta):
 		"""
 		self.title = title
 		self.gestures = gestures
+		self._searchIndex: SearchIndex | None = None
 		super(BaseGesturesDialog, self).__init__(parent, *args, **kwargs)
 
+	def addSearchField(self, sHelper: gui.guiHelper.BoxSizerHelper) -> None:
+		"""Add the text field that filters the gestures as the user types.
+		@param sHelper: the helper of the dialog sizer
+		@type sHelper: gui.guiHelper.BoxSizerHelper
+		"""
+		self.searchCtrl = sHelper.addLabeledControl(
+			# Translators: Label of the field that filters the list of found gestures
+			_("&Filter by:"),
+			wx.TextCtrl,
+		)
+		self.searchCtrl.Bind(wx.EVT_TEXT, self.onSearch)
+
+	@abstractmethod
+	def searchTexts(self) -> list[tuple[str | None, ...]]:
+		"""The texts of each item of the dialog that can be found by the search field.
+		@return: the texts of each item in the order of the items
+		@rtype: list[tuple[str | None, ...]]
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+	@abstractmethod
+	def showSearchResults(self, items: list[int]) -> None:
+		"""Display only the items found by the search field.
+		@param items: the numbers of the found items in the order of the items
+		@type items: list[int]
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
+	@staticmethod
+	def gestureTexts(gesture: Gesture) -> tuple[str | None, ...]:
+		"""The texts of the binding that can be found by the search field.
+		@param gesture: the binding of the input gesture
+		@type gesture: Gesture
+		@return: gesture display text, script description and name, category and module name
+		@rtype: tuple[str | None, ...]
+		"""
+		return (
+			gestureDisplayText(gesture.gesture),
+			gesture.displayName,
+			gesture.scriptName,
+			gesture.category,
+			gesture.moduleName,
+		)
+
+	def onSearch(self, evt: wx.CommandEvent) -> None:
+		"""Filter the items as the user types, the index of the items is built on the first keystroke.
+		@param evt: event binder object that handles the changes of the search field
+		@type evt: wx.CommandEvent
+		"""
+		if self._searchIndex is None:
+			with timings.phase("searchIndex") as phase:
+				self._searchIndex = SearchIndex(self.searchTexts())
+				phase.count = len(self._searchIndex)
+		self.showSearchResults(self._searchIndex.search(self.searchCtrl.GetValue()))
+
 	@abstractmethod
+	def gestureInFocus(self) -> Gesture | None:
+		"""The input gesture represented by the item in focus.
+		@return: the selected input gesture or None if nothing is selected
+		@rtype: Gesture | None
+		"""
+		raise NotImplementedError("This method must be overridden in the child class!")
+
 	def isUnsignedInFocus(self) -> bool:
 		"""Check that the selected gesture is not presented in the Input Gestures dialog.
 		@return: an indication of whether the selected gesture is not presented in the Input gestures dialog
 		@rtype: bool
 		"""
-		raise NotImplementedError("This method must be overridden in the child class!")
+		gesture = self.gestureInFocus()
+		return gesture is not None and not gesture.category
 
-	@abstractmethod
 	def scriptNameInFocus(self) -> str:
 		"""Extract script name from the item in focus.
 		@return: the name of the script that binded to gesture
 		@rtype: str
 		"""
-		raise NotImplementedError("This method must be overridden in the child class!")
+		gesture = self.gestureInFocus()
+		return gesture.displayName or gesture.scriptName if gesture else ""
 
 	def unsignedGestureWarning(self) -> bool:
 		"""Display the warning if the selected gesture is not presented in the Input Gestures dialog.
@@ -124,8 +287,26 @@ class BaseGesturesDialog(SettingsDialog, metaclass=ABCMeta):
 		gui.mainFrame.popupSettingsDialog(InputGesturesDialogWithSearch, search=self.scriptNameInFocus())
 
 
-class UnsignedGesturesDialog(BaseGesturesDialog):
-	"""Dialog window to display a collection of unsigned input gestures."""
+class GesturesListDialog(BaseGesturesDialog):
+	"""Base dialog window to display a collection of input gestures in the virtual list.
+	The rows are formatted only when they become visible.
+	"""
+
+	@override
+	def __init__(self, parent: wx.Window, title: str, gestures: FilteredGestures, *args, **kwargs) -> None:
+		"""Initialization of the graphical dialog.
+		@param parent: The parent window for this dialog
+		@type parent: wx.Window
+		@param title: the title of the dialog
+		@type title: str
+		@param gestures: collection of the filtered input gestures
+		@type gestures: FilteredGestures
+		"""
+		with timings.phase("sort") as phase:
+			self.allRows: list[Gesture] = sorted(gestures, key=gestures.key)
+			phase.count = len(self.allRows)
+		self.rows: list[Gesture] = self.allRows
+		super(GesturesListDialog, self).__init__(parent, title, gestures, *args, **kwargs)
 
 	@override
 	def makeSettings(self, sizer: wx.Sizer) -> None:
@@ -134,13 +315,14 @@ class UnsignedGesturesDialog(BaseGesturesDialog):
 		@type sizer: wx.Sizer
 		"""
 		sHelper = gui.guiHelper.BoxSizerHelper(self, sizer=sizer)
+		self.addSearchField(sHelper)
 		self.gesturesList = sHelper.addLabeledControl(
 			# Translators: Label above the list of found gestures
 			_("Select a gesture from the list"),
 			AutoWidthColumnListCtrl,
 			autoSizeColumn=1,  # The replacement column is likely to need the most space
-			itemTextCallable=None,
-			style=wx.LC_REPORT | wx.LC_SINGLE_SEL,
+			itemTextCallable=self.getItemText,
+			style=wx.LC_REPORT | wx.LC_SINGLE_SEL | wx.LC_VIRTUAL,
 		)
 		# Translators: The label for a first column in the list of gestures
 		self.gesturesList.InsertColumn(0, _("Gesture"), width=150)
@@ -152,38 +334,68 @@ class UnsignedGesturesDialog(BaseGesturesDialog):
 		sizer.Fit(self)
 		self.Center(wx.BOTH | wx.Center)
 
-		# Fill in the list of available input gestures
-		gestureDisplayText = lambda gest: "{1} ({0})".format(*getDisplayTextForGestureIdentifier(gest))  # noqa E731 do not assign a lambda expression, use a def
-		for gesture in sorted(self.gestures, key=lambda x: x.gesture):
-			self.gesturesList.Append(
-				(
-					gestureDisplayText(gesture.gesture),
-					gesture.displayName or gesture.scriptName,
-					gesture.category or f"[{gesture.moduleName}]",
-				),
-			)
+		with timings.phase("populate") as phase:
+			self.gesturesList.SetItemCount(len(self.rows))
+			phase.count = len(self.rows)
 		self.gesturesList.SetFocus()
 		self.gesturesList.Focus(0)
 		self.gesturesList.Select(0)
 
-	def isUnsignedInFocus(self) -> bool:
-		"""Check that the selected gesture is not presented in the Input Gestures dialog.
-		@return: an indication of whether the selected gesture is not presented in the Input gestures dialog
-		@rtype: bool
+	def getItemText(self, item: int, column: int) -> str:
+		"""Text of the list cell, requested by the virtual list when the row becomes visible.
+		@param item: the index of the row
+		@type item: int
+		@param column: the index of the column
+		@type column: int
+		@return: text of the cell
+		@rtype: str
 		"""
-		category: str = self.gesturesList.GetItemText(self.gesturesList.GetFocusedItem(), 2)
-		return category.startswith("[") and category.endswith("]")
+		gesture = self.rows[item]
+		if column == 0:
+			return gestureDisplayText(gesture.gesture)
+		if column == 1:
+			return gesture.displayName or gesture.scriptName
+		return gesture.category or f"[{gesture.moduleName}]"
 
-	def scriptNameInFocus(self) -> str:
-		"""Extract script name from the item in focus.
-		@return: the name of the script that binded to gesture
-		@rtype: str
+	@override
+	def searchTexts(self) -> list[tuple[str | None, ...]]:
+		"""The texts of each row of the list that can be found by the search field.
+		@return: the texts of each row in the order of the rows
+		@rtype: list[tuple[str | None, ...]]
+		"""
+		return [self.gestureTexts(gesture) for gesture in self.allRows]
+
+	@override
+	def showSearchResults(self, items: list[int]) -> None:
+		"""Display only the rows found by the search field.
+		@param items: the numbers of the found rows
+		@type items: list[int]
+		"""
+		self.rows = [self.allRows[item] for item in items]
+		self.gesturesList.SetItemCount(len(self.rows))
+		self.gesturesList.Refresh()
+		if self.rows:
+			self.gesturesList.Focus(0)
+			self.gesturesList.Select(0)
+
+	@override
+	def gestureInFocus(self) -> Gesture | None:
+		"""The input gesture represented by the item in focus.
+		@return: the selected input gesture or None if nothing is selected
+		@rtype: Gesture | None
 		"""
-		return self.gesturesList.GetItemText(self.gesturesList.GetFocusedItem(), 1)
+		item: int = self.gesturesList.GetFocusedItem()
+		return self.rows[item] if 0 <= item < len(self.rows) else None
+
+
+class UnsignedGesturesDialog(GesturesListDialog):
+	"""Dialog window to display a collection of unsigned input gestures."""
 
 
 class DuplicatedGesturesDialog(BaseGesturesDialog):
-	"""Dialog window to display a collection of duplicated input gestures."""
+	"""Dialog window to display duplicated input gestures grouped by the conflicting gesture.
+	The bindings of each group are added to the tree only when the group is expanded.
+	"""
 
 	@override
 	def makeSettings(self, sizer: wx.Sizer) -> None:
@@ -192,6 +404,7 @@ class DuplicatedGesturesDialog(BaseGesturesDialog):
 		@type sizer: wx.Sizer
 		"""
 		sHelper = gui.guiHelper.BoxSizerHelper(self, sizer=sizer)
+		self.addSearchField(sHelper)
 		sHelper.addItem(
 			wx.StaticText(
 				self,
@@ -207,51 +420,128 @@ class DuplicatedGesturesDialog(BaseGesturesDialog):
 				style=wx.TR_HAS_BUTTONS | wx.TR_HIDE_ROOT | wx.TR_LINES_AT_ROOT | wx.TR_SINGLE,
 			),
 		)
-		# ***
-		self.gesturesList = sHelper.addLabeledControl(
-			# Translators: Label in the window displaying duplicate gestures
-			_("Select a gesture from the list"),
-			AutoWidthColumnListCtrl,
-			autoSizeColumn=1,  # The replacement column is likely to need the most space
-			itemTextCallable=None,
-			style=wx.LC_REPORT | wx.LC_SINGLE_SEL,
-		)
-		# Translators: The label for a first column in the list of gestures
-		self.gesturesList.InsertColumn(0, _("Gesture"), width=150)
-		# Translators: The label for the second column in the list of gestures
-		self.gesturesList.InsertColumn(1, _("Script description or function name"))
-		# Translators: The label for the third column in the list of gestures
-		self.gesturesList.InsertColumn(2, _("Category"), width=150)
+		self.gesturesList.Bind(wx.EVT_TREE_ITEM_EXPANDING, self.onExpanding)
 
 		sizer.Fit(self)
 		self.Center(wx.BOTH | wx.Center)
 
-		# Fill in the list of available input gestures
-		gestureDisplayText = lambda gest: "{1} ({0})".format(*getDisplayTextForGestureIdentifier(gest))  # noqa E731 do not assign a lambda expression, use a def
-		for gesture in sorted(self.gestures, key=lambda x: x.gesture):
-			self.gesturesList.Append(
-				(
-					gestureDisplayText(gesture.gesture),
-					gesture.displayName or gesture.scriptName,
-					gesture.category or f"[{gesture.moduleName}]",
-				),
-			)
+		self.gesturesList.AddRoot("")
+		self.groups = self.gestures.groups if isinstance(self.gestures, Duplicates) else {}
+		self.keys = sorted(self.groups)
+		self.populate(self.keys)
 		self.gesturesList.SetFocus()
-		self.gesturesList.Focus(0)
-		self.gesturesList.Select(0)
 
-	def isUnsignedInFocus(self) -> bool:
-		"""Check that the selected gesture is not presented in the Input Gestures dialog.
-		@return: an indication of whether the selected gesture is not presented in the Input gestures dialog
-		@rtype: bool
+	def populate(self, keys: list[GestureKey]) -> None:
+		"""Fill the tree with the nodes of the conflicting gestures, the bindings are added on expansion.
+		@param keys: canonical keys of the displayed conflicting gestures
+		@type keys: list[GestureKey]
 		"""
-		category: str = self.gesturesList.GetItemText(self.gesturesList.GetFocusedItem(), 2)
-		return category.startswith("[") and category.endswith("]")
+		root = self.gesturesList.GetRootItem()
+		self.gesturesList.DeleteChildren(root)
+		with timings.phase("populate") as phase:
+			for key in keys:
+				group = self.groups[key]
+				# Translators: The tree node that represents the gesture binded to several functions
+				label = _("{gesture}: {count} bindings").format(
+					gesture=gestureDisplayText(group[0].gesture),
+					count=len(group),
+				)
+				if isinstance(self.gestures, ProfileDuplicates):
+					label = "{0} ({1})".format(label, self.whereText(self.gestures.where(key)))
+				node = self.gesturesList.AppendItem(root, label, data=key)
+				self.gesturesList.SetItemHasChildren(node, True)
+			phase.count = len(keys)
+		first = self.gesturesList.GetFirstChild(root)[0]
+		if first.IsOk():
+			self.gesturesList.SelectItem(first)
 
 	@override
-	def scriptNameInFocus(self) -> str:
-		"""Extract script name from the item in focus.
-		@return: the name of the script that binded to gesture
+	def searchTexts(self) -> list[tuple[str | None, ...]]:
+		"""The texts of each conflicting gesture and all its bindings that can be found by the search field.
+		@return: the texts of each conflicting gesture in the order of the tree nodes
+		@rtype: list[tuple[str | None, ...]]
+		"""
+		return [
+			tuple(text for gesture in self.groups[key] for text in self.gestureTexts(gesture))
+			for key in self.keys
+		]
+
+	@override
+	def showSearchResults(self, items: list[int]) -> None:
+		"""Display only the conflicting gestures found by the search field.
+		@param items: the numbers of the found conflicting gestures
+		@type items: list[int]
+		"""
+		self.gesturesList.Freeze()
+		try:
+			self.populate([self.keys[item] for item in items])
+		finally:
+			self.gesturesList.Thaw()
+
+	@staticmethod
+	def whereText(where: dict[str, list[str]]) -> str:
+		"""Description of the keyboard layouts and configuration profiles in which the gesture is conflicting.
+		@param where: layout names mapped to the names of the profiles that use the layout
+		@type where: dict[str, list[str]]
+		@return: text displayed in the tree node
 		@rtype: str
 		"""
-		return self.gesturesList.GetItemText(self.gesturesList.GetFocusedItem(), 1)
+		parts: list[str] = []
+		for layout, profiles in where.items():
+			# Translators: The name of the normal configuration profile
+			names = [name or _("normal configuration") for name in profiles]
+			if names:
+				# Translators: The keyboard layout and the configuration profiles in which a gesture is conflicting
+				text = _("{layout} layout: {profiles}")
+				parts.append(text.format(layout=layout, profiles=", ".join(names)))
+			else:
+				# Translators: The keyboard layout, not used in any profile, in which a gesture is conflicting
+				parts.append(_("{layout} layout").format(layout=layout))
+		return "; ".join(parts)
+
+	def onExpanding(self, evt: wx.TreeEvent) -> None:
+		"""Add the bindings of the conflicting gesture when its node is expanded for the first time.
+		@param evt: event binder object that handles the expansion of the tree node
+		@type evt: wx.TreeEvent
+		"""
+		node = evt.GetItem()
+		if self.gesturesList.GetChildrenCount(node, recursively=False) == 0:
+			key = self.gesturesList.GetItemData(node)
+			winner = self.gestures.winner(key) if isinstance(self.gestures, Duplicates) else None
+			for gesture in self.groups.get(key, []):
+				label = "{0}: {1}".format(
+					gesture.displayName or gesture.scriptName,
+					gesture.category or f"[{gesture.moduleName}]",
+				)
+				if winner is not None:
+					# Translators: The binding that is executed by NVDA when the conflicting gesture is pressed
+					state = _("runs") if gesture is winner else _("shadowed")
+					label = "{0} ({1})".format(label, state)
+				self.gesturesList.AppendItem(node, label, data=gesture)
+		evt.Skip()
+
+	@override
+	def _enterActivatesOk_ctrlSActivatesApply(self, evt: wx.PyEvent) -> None:
+		"""Expand or collapse the group of bindings by the Enter key instead of activating the OK button.
+		@param evt: event binder object that handles keystrokes
+		@type evt: wx.PyEvent
+		"""
+		node = self.gesturesList.GetSelection()
+		if (
+			evt.KeyCode in (wx.WXK_RETURN, wx.WXK_NUMPAD_ENTER)
+			and node.IsOk()
+			and self.gesturesList.ItemHasChildren(node)
+		):
+			self.gesturesList.Toggle(node)
+			return
+		super(DuplicatedGesturesDialog, self)._enterActivatesOk_ctrlSActivatesApply(evt)
+
+	@override
+	def gestureInFocus(self) -> Gesture | None:
+		"""The input gesture represented by the item in focus.
+		@return: the selected input gesture or None if a group of bindings is selected
+		@rtype: Gesture | None
+		"""
+		node = self.gesturesList.GetSelection()
+		data = self.gesturesList.GetItemData(node) if node.IsOk() else None
+		return data if isinstance(data, Gesture) else None
@@ -0,0 +1,378 @@
+# query.py
+# Query language for custom collections of input gestures
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Query language for custom collections of input gestures.
+A query consists of terms combined with the "and", "or" and "not" operators and parentheses,
+adjacent terms without an operator are combined with "and". A term has the form "field:pattern",
+where the field is one of: gesture, category, name (the script description), class, module, script.
+The pattern is case-insensitive and can contain the wildcards "*" and "?",
+a pattern with spaces is enclosed in double quotes, an empty pattern matches an empty field.
+A term without a field matches the gestures that contain the text in any of the fields,
+a word with an unknown field, such as "kb:nvda+d", is such a text as a whole. For example:
+	module:globalPlugins.* and gesture:kb:* and not category:
+A query is compiled once into a Python function, which is then applied to each gesture of the inventory.
+"""
+
+import json
+import re
+from collections.abc import Callable, Iterator
+from fnmatch import translate
+from typing import override
+
+from .base import FilteredGestures, Gesture, Gestures, gestureKey, timings
+
+Predicate = Callable[[Gesture], bool]
+
+# Names of the fields in the queries mapped to the Gesture attributes
+FIELDS: dict[str, str] = {
+	"gesture": "gesture",
+	"category": "category",
+	"name": "displayName",
+	"class": "className",
+	"module": "moduleName",
+	"script": "scriptName",
+}
+
+_token = re.compile(
+	r"""\s*(?:
+	(?P<paren>[()])
+	|(?P<field>\w+):(?:"(?P<quoted>(?:[^"\\]|\\.)*)"|(?P<value>(?:[^\s()]|\([^\s()]*\))*))
+	|"(?P<text>(?:[^"\\]|\\.)*)"
+	|(?P<word>(?:[^\s()"]|\(\w*\)(?=:))+)
+	)""",
+	re.VERBOSE,
+)
+
+
+class QuerySyntaxError(ValueError):
+	"""The query cannot be parsed."""
+
+
+class GesturePattern:
+	"""Gesture pattern with wildcards, which does not depend on the order of the parts joined with "+",
+	as the canonical gesture keys do. The parts of the pattern without wildcards must be present
+	in the gesture, each of the other parts matches one of the remaining parts of the gesture,
+	and a part that consists only of "*" matches all the remaining parts.
+	A pattern without a colon is matched against the whole canonical key.
+	"""
+
+	def __init__(self, pattern: str, layout: str = "") -> None:
+		"""Compile the pattern.
+		@param pattern: the pattern with wildcards, e.g. "kb:shift+nvda+*"
+		@type pattern: str
+		@param layout: the name of the keyboard layout used to compare the gestures
+		@type layout: str
+		"""
+		prefix, sep, main = pattern.lower().partition(":")
+		if prefix == "kb(%s)" % layout.lower():
+			prefix = "kb"
+		# Without a colon the pattern is matched against the whole key
+		self._whole = not sep
+		self._prefix = self._compile(prefix)
+		parts = main.split("+")
+		self._literals = [part for part in parts if not any(char in part for char in "*?[")]
+		self._wildcards = [
+			self._compile(part) for part in parts if part != "*" and part not in self._literals
+		]
+		self._rest = "*" in parts
+
+	@staticmethod
+	def _compile(pattern: str) -> Callable[[str], object]:
+		"""Function that checks whether a text matches the pattern with wildcards.
+		@param pattern: the pattern with wildcards
+		@type pattern: str
+		@return: the match function of the compiled regular expression
+		@rtype: Callable[[str], object]
+		"""
+		return re.compile(translate(pattern), re.DOTALL).match
+
+	def match(self, key: str) -> bool:
+		"""Check whether the canonical gesture key matches the pattern.
+		@param key: canonical gesture key
+		@type key: str
+		@return: whether the key matches
+		@rtype: bool
+		"""
+		if self._whole:
+			return self._prefix(key) is not None
+		prefix, sep, main = key.partition(":")
+		if not sep or self._prefix(prefix) is None:
+			return False
+		remaining = main.split("+")
+		for part in self._literals:
+			if part not in remaining:
+				return False
+			remaining.remove(part)
+		return self._assign(remaining, 0)
+
+	def _assign(self, remaining: list[str], index: int) -> bool:
+		"""Check whether the parts with wildcards starting from the index match the remaining parts of the key.
+		@param remaining: the parts of the key that are not matched yet
+		@type remaining: list[str]
+		@param index: the index of the first unmatched part with wildcards
+		@type index: int
+		@return: whether each of the parts matches a different part of the key
+		@rtype: bool
+		"""
+		if index == len(self._wildcards):
+			return self._rest or not remaining
+		match = self._wildcards[index]
+		return any(
+			match(part) is not None and self._assign(remaining[:i] + remaining[i + 1 :], index + 1)
+			for i, part in enumerate(remaining)
+		)
+
+
+class Compiler:
+	"""Translator of the terms of a query into the source code of a Python expression.
+	The constants and functions used by the expression are collected in the namespace,
+	so the whole query is evaluated by one function without nested calls of predicates.
+	"""
+
+	def __init__(self, layout: str = "") -> None:
+		"""Initialization of the namespace of the compiled function.
+		@param layout: the name of the keyboard layout used to compare the gestures
+		@type layout: str
+		"""
+		self.layout = layout
+		self.namespace: dict[str, object] = {"gestureKey": gestureKey, "layout": layout}
+
+	def constant(self, value: object) -> str:
+		"""Add the value to the namespace of the compiled function.
+		@param value: a constant or a function used by the expression
+		@type value: object
+		@return: the name under which the value is available in the expression
+		@rtype: str
+		"""
+		name = "c%d" % len(self.namespace)
+		self.namespace[name] = value
+		return name
+
+	def term(self, field: str | None, pattern: str) -> str:
+		"""Source code of the expression that checks a single term of the query for the gesture "g".
+		Simple patterns are checked by string comparison, the rest by a compiled regular expression.
+		@param field: the name of the field in the query or None to search in all fields
+		@type field: str | None
+		@param pattern: the pattern with optional wildcards
+		@type pattern: str
+		@return: source code of the expression
+		@rtype: str
+		@raise QuerySyntaxError: if the field is unknown
+		"""
+		if field is None:
+			text = self.constant(pattern.lower())
+			return " or ".join('%s in (g.%s or "").lower()' % (text, attr) for attr in FIELDS.values())
+		attr = FIELDS.get(field.lower())
+		if attr is None:
+			raise QuerySyntaxError("Unknown field: %s" % field)
+		if not pattern:
+			return "not g.%s" % attr
+		wildcards = any(char in pattern for char in "*?[")
+		if attr == "gesture":
+			# Gestures are compared in the canonical form, which does not depend on the order of the parts
+			value = "gestureKey(g.gesture, layout)"
+			if not wildcards:
+				return "%s == %s" % (value, self.constant(gestureKey(pattern, self.layout)))
+			return "%s(%s)" % (self.constant(GesturePattern(pattern, self.layout).match), value)
+		value = '(g.%s or "").lower()' % attr
+		pattern = pattern.lower()
+		if not wildcards:
+			return "%s == %s" % (value, self.constant(pattern))
+		if pattern.endswith("*") and not any(char in pattern[:-1] for char in "*?["):
+			return "%s.startswith(%s)" % (value, self.constant(pattern[:-1]))
+		match = self.constant(re.compile(translate(pattern), re.DOTALL).match)
+		return "%s(%s) is not None" % (match, value)
+
+
+def tokenize(query: str) -> Iterator[tuple[str, str | None, str]]:
+	"""Split the query into tokens.
+	@param query: the text of the query
+	@type query: str
+	@return: the kind of each token ("(", ")", "and", "or", "not" or "term"), the field and the value
+	@rtype: Iterator[tuple[str, str | None, str]]
+	@raise QuerySyntaxError: if the query contains an unexpected character
+	"""
+	position = 0
+	query = query.strip()
+	while position < len(query):
+		found = _token.match(query, position)
+		if found is None or found.end() == position:
+			raise QuerySyntaxError("Unexpected character at position %d" % position)
+		position = found.end()
+		if found["paren"]:
+			yield found["paren"], None, ""
+		elif found["field"]:
+			value = found["quoted"] if found["quoted"] is not None else found["value"]
+			value = value.replace('\\"', '"')
+			if found["field"].lower() in FIELDS:
+				yield "term", found["field"], value
+			else:
+				# A gesture identifier such as "kb:nvda+d" is searched as a text in all fields
+				yield "term", None, "%s:%s" % (found["field"], value)
+		elif found["text"] is not None:
+			yield "term", None, found["text"].replace('\\"', '"')
+		elif found["word"].lower() in ("and", "or", "not"):
+			yield found["word"].lower(), None, ""
+		else:
+			yield "term", None, found["word"]
+
+
+def compileQuery(query: str, layout: str = "") -> Predicate:
+	"""Compile the query into a predicate function.
+	@param query: the text of the query
+	@type query: str
+	@param layout: the name of the keyboard layout used to compare the gestures
+	@type layout: str
+	@return: function that checks whether the gesture matches the query
+	@rtype: Predicate
+	@raise QuerySyntaxError: if the query cannot be parsed
+	"""
+	tokens = list(tokenize(query))
+	compiler = Compiler(layout)
+	position = 0
+
+	def peek() -> str | None:
+		return tokens[position][0] if position < len(tokens) else None
+
+	def parseOr() -> str:
+		nonlocal position
+		operands = [parseAnd()]
+		while peek() == "or":
+			position += 1
+			operands.append(parseAnd())
+		return "(%s)" % " or ".join(operands)
+
+	def parseAnd() -> str:
+		nonlocal position
+		operands = [parseNot()]
+		while peek() in ("and", "not", "term", "("):
+			if peek() == "and":
+				position += 1
+			operands.append(parseNot())
+		return "(%s)" % " and ".join(operands)
+
+	def parseNot() -> str:
+		nonlocal position
+		if peek() == "not":
+			position += 1
+			return "not %s" % parseNot()
+		return parseAtom()
+
+	def parseAtom() -> str:
+		nonlocal position
+		if position >= len(tokens):
+			raise QuerySyntaxError("Unexpected end of the query")
+		kind, field, value = tokens[position]
+		position += 1
+		if kind == "term":
+			return "(%s)" % compiler.term(field, value)
+		if kind == "(":
+			operand = parseOr()
+			if peek() != ")":
+				raise QuerySyntaxError("Missing closing parenthesis")
+			position += 1
+			return operand
+		raise QuerySyntaxError("Unexpected %r" % kind)
+
+	if not tokens:
+		return lambda gesture: True
+	expression = parseOr()
+	if position < len(tokens):
+		raise QuerySyntaxError("Unexpected %r" % tokens[position][0])
+	# The expression consists only of the attributes of the gesture and the names from the namespace
+	return eval(compile("lambda g: bool(%s)" % expression, "<query>", "eval"), compiler.namespace)
+
+
+class QueryGestures(FilteredGestures):
+	"""Collection of the input gestures that match a query."""
+
+	@override
+	def __init__(self, query: str, name: str = "") -> None:
+		"""Initialization of the collection, the query is compiled immediately.
+		@param query: the text of the query
+		@type query: str
+		@param name: the title of the gestures list dialog
+		@type name: str
+		@raise QuerySyntaxError: if the query cannot be parsed
+		"""
+		super(QueryGestures, self).__init__()
+		self.query = query
+		self.name = name or query
+		self._predicate = compileQuery(query)
+
+	@override
+	def prepare(self) -> Callable[[], None]:
+		"""Read from NVDA everything required to collect the gestures,
+		the query is compiled again for the current keyboard layout.
+		@return: function that filters the inventory and stores the result
+		@rtype: Callable[[], None]
+		"""
+		complete = super(QueryGestures, self).prepare()
+		self._predicate = compileQuery(self.query, self._layout)
+		return complete
+
+	@override
+	def collect(self, gestures: Gestures) -> Iterator[Gesture]:
+		"""Collection of the input gestures that match the query, in a single pass over the inventory.
+		@param gestures: inventory of all input gestures used in NVDA
+		@type gestures: Gestures
+		@return: iterator of the matching input gestures
+		@rtype: Iterator[Gesture]
+		"""
+		with timings.phase("query") as phase:
+			found = list(filter(self._predicate, gestures))
+			phase.count = len(found)
+		return iter(found)
+
+
+def loadViews(path: str) -> list[tuple[str, str]]:
+	"""Read the saved queries from the file, which can be distributed by administrators.
+	The file contains a JSON object with the "views" list of objects with the "name" and "query" keys.
+	The views with invalid queries are skipped.
+	@param path: the path to the file
+	@type path: str
+	@return: the names and queries of the views
+	@rtype: list[tuple[str, str]]
+	"""
+	from logHandler import log
+
+	try:
+		with open(path, "r", encoding="utf-8") as stream:
+			views = json.load(stream)["views"]
+	except FileNotFoundError:
+		return []
+	except (OSError, ValueError, KeyError, TypeError):
+		log.warning("Unable to read the saved views of input gestures from %s", path, exc_info=True)
+		return []
+	result: list[tuple[str, str]] = []
+	for view in views:
+		try:
+			name, query = str(view["name"]), str(view["query"])
+			compileQuery(query)
+		except (KeyError, TypeError, QuerySyntaxError):
+			log.warning("Invalid view of input gestures: %r", view, exc_info=True)
+			continue
+		result.append((name, query))
+	return result
+
+
+def saveView(path: str, name: str, query: str) -> None:
+	"""Add the query to the saved views, replacing the view with the same name.
+	@param path: the path to the file of the saved views
+	@type path: str
+	@param name: the name of the view
+	@type name: str
+	@param query: the text of the query
+	@type query: str
+	@raise QuerySyntaxError: if the query cannot be parsed
+	@raise OSError: if the file cannot be written
+	"""
+	compileQuery(query)
+	views = [{"name": other, "query": saved} for other, saved in loadViews(path) if other != name]
+	views.append({"name": name, "query": query})
+	with open(path, "w", encoding="utf-8") as stream:
+		json.dump({"views": views}, stream, ensure_ascii=False, indent="\t")
@@ -0,0 +1,227 @@
+# watcher.py
+# Automatic check for new conflicts of input gestures
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+import json
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+from typing import Any
+
+import addonHandler
+import config
+import globalVars
+import ui
+import wx  # type: ignore
+from logHandler import log
+
+try:
+	addonHandler.initTranslation()
+except addonHandler.AddonError:
+	log.warning("Unable to init translations. This may be because the addon is running from NVDA scratchpad.")
+_: Callable[[str], str]
+
+
+class ConflictWatcher:
+	"""Checks the input gestures for conflicts after the events that can add them:
+	NVDA startup (add-ons are installed and updated on restart), switching configuration profiles
+	and saving the gestures in the "Input Gestures" dialog.
+	To keep the startup cheap, the check after the startup is performed only if the running add-ons
+	or the version of NVDA have changed since the previous session.
+	Bursts of events are coalesced into one check, which runs in a worker thread and scans only
+	the sources of gestures that have changed since the previous scan.
+	The user is notified only about conflicts that did not exist before,
+	the known conflicts are stored in the NVDA configuration directory between sessions.
+	"""
+
+	def __init__(self, executor: Executor, delay: int = 5000, startupDelay: int = 15000) -> None:
+		"""Initialization of the watcher.
+		@param executor: the executor of background tasks of the add-on
+		@type executor: Executor
+		@param delay: time in milliseconds between the last event and the check
+		@type delay: int
+		@param startupDelay: time in milliseconds between the NVDA startup and the first check
+		@type startupDelay: int
+		"""
+		self._executor = executor
+		self._delay = delay
+		self._startupDelay = startupDelay
+		self._timer: wx.CallLater | None = None
+		self._check: Future[dict[str, str]] | None = None
+		# The original method of the "Input Gestures" dialog and the wrapper installed instead of it
+		self._onOk: Callable[[Any, wx.PyEvent], None] | None = None
+		self._wrapper: Callable[[Any, wx.PyEvent], None] | None = None
+		self._path: str = os.path.join(globalVars.appArgs.configPath, "checkGestures.json")
+		self._known: set[str] | None = None
+		# The running add-ons and the version of NVDA, and whether they differ from the stored ones
+		self._environment: list[str] = []
+		self._environmentChanged: bool = False
+
+	def start(self) -> None:
+		"""Subscribe to the events and schedule the first check if the add-ons or NVDA have changed."""
+		from gui.inputGestures import InputGesturesDialog
+
+		config.post_configProfileSwitch.register(self.schedule)
+		config.post_configReset.register(self.schedule)
+		self._onOk = vars(InputGesturesDialog).get("onOk")
+		onOk = InputGesturesDialog.onOk
+		watcher = self
+
+		def onOkAndCheck(dialog: Any, evt: wx.PyEvent) -> None:
+			onOk(dialog, evt)
+			# The wrapper stays inert if it could not be removed because it was wrapped by someone else
+			if watcher._wrapper is onOkAndCheck:
+				watcher.schedule()
+
+		InputGesturesDialog.onOk = self._wrapper = onOkAndCheck
+		stored = self.read()
+		self._known = self.load(stored)
+		self._environment = self.environment()
+		self._environmentChanged = stored.get("environment") != self._environment
+		if self._known is None or self._environmentChanged:
+			self.schedule(self._startupDelay)
+
+	def stop(self) -> None:
+		"""Unsubscribe from the events and cancel the scheduled check."""
+		from gui.inputGestures import InputGesturesDialog
+
+		config.post_configProfileSwitch.unregister(self.schedule)
+		config.post_configReset.unregister(self.schedule)
+		# The method is restored only if no one else has wrapped it after us, otherwise their wrapper would be lost
+		if self._wrapper is not None and vars(InputGesturesDialog).get("onOk") is self._wrapper:
+			if self._onOk is not None:
+				InputGesturesDialog.onOk = self._onOk
+			else:
+				del InputGesturesDialog.onOk
+		self._onOk = self._wrapper = None
+		if self._timer is not None:
+			self._timer.Stop()
+			self._timer = None
+		self._check = None
+
+	def schedule(self, delay: int | None = None) -> None:
+		"""Postpone the check until no events have occurred for the given time.
+		Can be called from any thread.
+		@param delay: time in milliseconds, the default delay of the watcher if not specified
+		@type delay: int | None
+		"""
+		if not wx.IsMainThread():
+			wx.CallAfter(self.schedule, delay)
+			return
+		delay = delay or self._delay
+		if self._timer is not None and self._timer.IsRunning():
+			self._timer.Start(delay)
+		else:
+			self._timer = wx.CallLater(delay, self.check)
+
+	def check(self) -> None:
+		"""Read the state of NVDA and check the conflicts in the worker thread.
+		If the previous check is not finished yet, the check is postponed.
+		"""
+		if self._check is not None:
+			self.schedule()
+			return
+		from . import base
+
+		pipeline = base.GesturesPipeline()
+		future = self._check = self._executor.submit(pipeline.conflicts)
+		future.add_done_callback(lambda done: wx.CallAfter(self.onChecked, done))
+
+	def onChecked(self, future: Future[dict[str, str]]) -> None:
+		"""Called in the main thread when the check is finished, notifies about the new conflicts.
+		@param future: the background task of the check
+		@type future: Future[dict[str, str]]
+		"""
+		if future is not self._check:
+			return
+		self._check = None
+		if future.cancelled():
+			return
+		if future.exception() is not None:
+			log.error("Error while checking input gestures", exc_info=future.exception())
+			return
+		conflicts = future.result()
+		known = self._known
+		if known is None:
+			# Conflicts found at the first run are not new, they are only remembered
+			self._known = set(conflicts)
+			self.save(self._known)
+			return
+		new = [identifier for key, identifier in conflicts.items() if key not in known]
+		if new or self._environmentChanged:
+			# The known conflicts are accumulated, so a conflict that disappears and comes back,
+			# e.g. after switching the profile back and forth, is not announced again
+			self._known = known | set(conflicts)
+			self.save(self._known)
+		if new:
+			from .graphui import gestureDisplayText
+
+			ui.message(
+				# Translators: Notification of the conflicting gestures that have appeared since the previous check
+				_("New input gesture conflicts: {gestures}").format(
+					gestures=", ".join(sorted(map(gestureDisplayText, new))),
+				),
+			)
+
+	@staticmethod
+	def environment() -> list[str]:
+		"""The running add-ons and the version of NVDA, new conflicts can appear at startup only if they change.
+		@return: names and versions
+		@rtype: list[str]
+		"""
+		import buildVersion
+
+		addons = sorted("%s %s" % (addon.name, addon.version) for addon in addonHandler.getRunningAddons())
+		return ["NVDA %s" % buildVersion.version, *addons]
+
+	def read(self) -> dict[str, Any]:
+		"""Read the state stored in the previous session.
+		@return: the stored state or an empty dictionary if it cannot be read
+		@rtype: dict[str, Any]
+		"""
+		try:
+			with open(self._path, "r", encoding="utf-8") as stream:
+				stored = json.load(stream)
+			if not isinstance(stored, dict):
+				raise TypeError("Unexpected content")
+			return stored
+		except FileNotFoundError:
+			return {}
+		except (OSError, ValueError, TypeError):
+			log.warning("Unable to read the known input gesture conflicts from %s", self._path, exc_info=True)
+			return {}
+
+	def load(self, stored: dict[str, Any] | None = None) -> set[str] | None:
+		"""The conflicts known from the previous session.
+		@param stored: the state returned by the read method, the file is read if not specified
+		@type stored: dict[str, Any] | None
+		@return: canonical keys of the conflicting gestures or None if they have never been stored
+		@rtype: set[str] | None
+		"""
+		stored = self.read() if stored is None else stored
+		try:
+			return set(stored["conflicts"])
+		except (KeyError, TypeError):
+			return None
+
+	def save(self, conflicts: set[str]) -> None:
+		"""Store the known conflicts for the next session.
+		@param conflicts: canonical keys of the conflicting gestures
+		@type conflicts: set[str]
+		"""
+		if globalVars.appArgs.secure:
+			return
+		try:
+			with open(self._path, "w", encoding="utf-8") as stream:
+				json.dump(
+					{"conflicts": sorted(conflicts), "environment": self._environment},
+					stream,
+					ensure_ascii=False,
+				)
+		except OSError:
+			log.warning("Unable to store the known input gesture conflicts to %s", self._path, exc_info=True)
+			return
+		self._environmentChanged = False
@@ -0,0 +1,31 @@
+# Headless benchmarks of the NVDA Check Input Gestures add-on
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Benchmarks of the gesture collections that run without NVDA.
+The NVDA modules used by the add-on are replaced with the stubs from the "stubs" directory,
+which are filled with synthetic inventories of the given size.
+Run with: python -m benchmarks --help
+"""
+
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import tools
+
+STUBS = Path(__file__).resolve().parent / "stubs"
+
+
+def loadAddonModule(name: str) -> ModuleType:
+	"""Import a module of the add-on package with the NVDA modules replaced by the stubs.
+	@param name: the name of the module inside the add-on package, e.g. "base"
+	@type name: str
+	@return: imported module
+	@rtype: ModuleType
+	"""
+	if str(STUBS) not in sys.path:
+		sys.path.insert(0, str(STUBS))
+	return tools.loadAddonModule(name)
@@ -0,0 +1,161 @@
+# Command line interface of the headless benchmarks
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from . import loadAddonModule
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+# Metrics in which the smaller value is better and which are compared with the baseline
+METRICS: tuple[str, ...] = ("scan", "rescan", "duplicates", "peakMemory", "allocations")
+
+
+def best(func: Callable[[], Any], repeat: int) -> float:
+	"""The shortest execution time of the function among several runs.
+	@param func: measured function
+	@type func: Callable[[], Any]
+	@param repeat: the number of runs
+	@type repeat: int
+	@return: execution time in seconds
+	@rtype: float
+	"""
+	times: list[float] = []
+	for _i in range(repeat):
+		gc.collect()
+		start = time.perf_counter()
+		func()
+		times.append(time.perf_counter() - start)
+	return min(times)
+
+
+def measure(size: int, duplicateRatio: float, repeat: int) -> dict[str, float]:
+	"""Measure the performance of the gesture collections on a synthetic inventory.
+	@param size: the number of gesture bindings in the inventory
+	@type size: int
+	@param duplicateRatio: the share of bindings that reuse the gesture of another binding
+	@type duplicateRatio: float
+	@param repeat: the number of runs of each measurement
+	@type repeat: int
+	@return: metrics: time in seconds, memory in bytes and the number of memory blocks
+	@rtype: dict[str, float]
+	"""
+	base = loadAddonModule("base")
+	from . import synthetic
+
+	synthetic.populate(size, duplicateRatio)
+	layout = "laptop"
+
+	def scan() -> Any:
+		# Full scan of all sources by the scanners the add-on uses, without the cached results
+		base.scanners.invalidate()
+		gestures = base.Gestures()
+		gestures.update(base.scanners.prepare(base.scanners.fingerprint())())
+		return gestures
+
+	cache = base.GesturesCache()
+	cache.get()
+
+	def rescan() -> Any:
+		cache.invalidate()
+		return cache.get()
+
+	gestures = scan()
+	metrics: dict[str, float] = {
+		"bindings": float(len(gestures)),
+		"conflicts": float(len(base.GestureIndex(layout, gestures).duplicates())),
+		"scan": best(scan, repeat),
+		"rescan": best(rescan, repeat),
+		"duplicates": best(lambda: base.GestureIndex(layout, gestures).duplicates(), repeat),
+	}
+	del gestures
+	gc.collect()
+	tracemalloc.start()
+	gestures = scan()
+	base.GestureIndex(layout, gestures).duplicates()
+	metrics["peakMemory"] = float(tracemalloc.get_traced_memory()[1])
+	metrics["allocations"] = float(
+		sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+	)
+	tracemalloc.stop()
+	return metrics
+
+
+def compare(
+	results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float
+) -> bool:
+	"""Print the comparison of the results with the baseline.
+	@param results: metrics grouped by the benchmark name
+	@type results: dict[str, dict[str, float]]
+	@param baseline: previously saved metrics grouped by the benchmark name
+	@type baseline: dict[str, dict[str, float]]
+	@param tolerance: allowed relative growth of a metric, e.g. 0.1 for 10%
+	@type tolerance: float
+	@return: whether none of the metrics has regressed beyond the tolerance
+	@rtype: bool
+	"""
+	success = True
+	for name, metrics in results.items():
+		previous = baseline.get(name)
+		if previous is None:
+			print(f"{name}: no baseline")
+			continue
+		for metric in METRICS:
+			if not previous.get(metric):
+				continue
+			change = metrics[metric] / previous[metric] - 1
+			regressed = change > tolerance
+			success = success and not regressed
+			print(f"{name} {metric}: {change:+.1%}{' REGRESSION' if regressed else ''}")
+	return success
+
+
+def main() -> int:
+	"""Run the benchmarks with the command line arguments.
+	@return: exit code
+	@rtype: int
+	"""
+	parser = argparse.ArgumentParser(
+		prog="python -m benchmarks",
+		description="Headless benchmarks of the input gesture collections on synthetic inventories.",
+	)
+	parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+	parser.add_argument("--duplicates", type=float, default=0.05, help="share of duplicated bindings")
+	parser.add_argument("--repeat", type=int, default=5)
+	parser.add_argument("--baseline", type=Path, default=BASELINE)
+	parser.add_argument("--save", action="store_true", help="save the results as the new baseline")
+	parser.add_argument("--compare", action="store_true", help="compare the results with the baseline")
+	parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+	args = parser.parse_args()
+
+	results: dict[str, dict[str, float]] = {}
+	for size in args.sizes:
+		name = f"{size}x{args.duplicates}"
+		results[name] = metrics = measure(size, args.duplicates, args.repeat)
+		print(
+			f"{name}: {int(metrics['bindings'])} bindings, {int(metrics['conflicts'])} conflicts, "
+			f"scan {metrics['scan'] * 1000:.1f} ms, rescan {metrics['rescan'] * 1000:.1f} ms, "
+			f"duplicates {metrics['duplicates'] * 1000:.1f} ms, "
+			f"peak memory {metrics['peakMemory'] / 1024:.0f} KiB, {int(metrics['allocations'])} allocations",
+		)
+	success = True
+	if args.compare:
+		baseline: dict[str, dict[str, float]] = json.loads(args.baseline.read_text(encoding="utf-8"))
+		success = compare(results, baseline, args.tolerance)
+	if args.save:
+		args.baseline.write_text(json.dumps(results, indent="\t"), encoding="utf-8")
+	return 0 if success else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,186 @@
+# Startup cost of the NVDA Check Input Gestures add-on
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Measure the time NVDA spends on the add-on at startup.
+The add-on package is imported in a new interpreter with "python -X importtime",
+after the stubs of the NVDA modules and the standard modules that NVDA has already imported
+when it loads the global plugins, so only the cost of the add-on itself is counted.
+The start of the conflict watcher is measured separately: the installation of its hooks,
+and the snapshot of the gestures taken in the main thread by the check after the startup,
+which is performed only in the first session and after the add-ons or NVDA have changed.
+Run with: python -m benchmarks.startup --help
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+from . import STUBS
+
+ADDON = Path(__file__).resolve().parent.parent / "addon"
+PACKAGE = "globalPlugins.checkGestures"
+# Modules imported by NVDA before the global plugins are loaded
+PRELOADED: tuple[str, ...] = (
+	"collections.abc",
+	"concurrent.futures",
+	"json",
+	"re",
+	"threading",
+	"typing",
+	"addonHandler",
+	"api",
+	"braille",
+	"config",
+	"globalPluginHandler",
+	"globalVars",
+	"gui",
+	"gui.inputGestures",
+	"gui.nvdaControls",
+	"gui.settingsDialogs",
+	"inputCore",
+	"languageHandler",
+	"logHandler",
+	"scriptHandler",
+	"ui",
+	"vision",
+	"wx",
+	"buildVersion",
+)
+SCRIPT = """
+import sys
+sys.path[:0] = [{stubs!r}, {addon!r}]
+for name in {preloaded!r}:
+	__import__(name)
+import {package}
+import json
+print(json.dumps(sorted(name for name in sys.modules if name.startswith({package!r}))))
+"""
+
+
+def importTime(addon: Path) -> tuple[float, list[str]]:
+	"""Import the add-on package in a new interpreter.
+	@param addon: the "addon" directory of the add-on source tree
+	@type addon: Path
+	@return: cumulative import time of the package in milliseconds and the names of the imported modules
+	@rtype: tuple[float, list[str]]
+	"""
+	script = SCRIPT.format(stubs=str(STUBS), addon=str(addon), preloaded=PRELOADED, package=PACKAGE)
+	result = subprocess.run(
+		[sys.executable, "-X", "importtime", "-c", script],
+		capture_output=True,
+		text=True,
+		check=True,
+	)
+	# Lines of the report: "import time: self [us] | cumulative | imported package"
+	cumulative = 0
+	for line in result.stderr.splitlines():
+		fields = line.split("|")
+		if len(fields) == 3 and fields[2].strip() == PACKAGE:
+			cumulative = int(fields[1])
+	return cumulative / 1000, json.loads(result.stdout)
+
+
+WATCHER_SCRIPT = """
+import sys
+sys.path[:0] = [{stubs!r}, {addon!r}, {root!r}]
+for name in {preloaded!r}:
+	__import__(name)
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+import globalVars
+from {package}.watcher import ConflictWatcher
+from benchmarks import synthetic
+
+synthetic.populate({bindings})
+globalVars.appArgs.configPath = tempfile.mkdtemp()
+result = {{}}
+for session in ("first", "next"):
+	watcher = ConflictWatcher(ThreadPoolExecutor(max_workers=1))
+	start = time.perf_counter()
+	watcher.start()
+	result[session] = (time.perf_counter() - start) * 1000
+	result[session + "Scheduled"] = watcher._timer is not None
+	if session == "first":
+		from {package} import base
+		start = time.perf_counter()
+		pipeline = base.GesturesPipeline()
+		result["snapshot"] = (time.perf_counter() - start) * 1000
+		watcher._check = future = watcher._executor.submit(pipeline.conflicts)
+		future.result()
+		watcher.onChecked(future)
+	watcher.stop()
+print(json.dumps(result))
+"""
+
+
+def watcherCost(addon: Path, bindings: int) -> dict[str, Any]:
+	"""Start the conflict watcher in a new interpreter, in the first session and in the next unchanged one.
+	@param addon: the "addon" directory of the add-on source tree
+	@type addon: Path
+	@param bindings: the number of gesture bindings of the synthetic inventory
+	@type bindings: int
+	@return: the start times in milliseconds, whether the check after the startup was scheduled
+		and the time of the snapshot taken in the main thread by the check
+	@rtype: dict[str, Any]
+	"""
+	script = WATCHER_SCRIPT.format(
+		stubs=str(STUBS),
+		addon=str(addon),
+		root=str(ADDON.parent),
+		preloaded=PRELOADED,
+		package=PACKAGE,
+		bindings=bindings,
+	)
+	result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+	return json.loads(result.stdout)
+
+
+def main() -> int:
+	"""Measure the import time of the add-on given in the command line.
+	@return: exit code
+	@rtype: int
+	"""
+	parser = argparse.ArgumentParser(
+		prog="python -m benchmarks.startup",
+		description="Measure the import time of the add-on package with the NVDA modules replaced by stubs.",
+	)
+	parser.add_argument("--repeat", type=int, default=20, help="the number of imports")
+	parser.add_argument(
+		"--addon", type=Path, default=ADDON, help="the addon directory of another source tree to measure"
+	)
+	parser.add_argument(
+		"--bindings", type=int, default=3000, help="the number of gesture bindings for the watcher check"
+	)
+	args = parser.parse_args()
+
+	times: list[float] = []
+	modules: list[str] = []
+	for _i in range(args.repeat):
+		elapsed, modules = importTime(args.addon)
+		times.append(elapsed)
+	print("Import of %s: min %.2f ms, median %.2f ms" % (PACKAGE, min(times), statistics.median(times)))
+	print("Imported modules: " + ", ".join(modules))
+	if not (args.addon / "globalPlugins" / "checkGestures" / "watcher.py").is_file():
+		return 0
+	cost = watcherCost(args.addon, args.bindings)
+	print(
+		"Watcher start: first session %.2f ms, check scheduled: %s; next session %.2f ms, check scheduled: %s"
+		% (cost["first"], cost["firstScheduled"], cost["next"], cost["nextScheduled"])
+	)
+	print(
+		"Snapshot of %d bindings in the main thread by the check: %.2f ms" % (args.bindings, cost["snapshot"])
+	)
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
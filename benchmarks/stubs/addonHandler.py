@@ -0,0 +1,50 @@
+# Stub of the NVDA addonHandler module for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+import sys
+from typing import Any
+
+
+class AddonError(Exception):
+	"""Error of the add-on handling."""
+
+
+class Addon:
+	"""The add-on whose code is running."""
+
+	def __init__(self) -> None:
+		"""Initialization of the manifest fields used by the add-on."""
+		self.manifest: dict[str, Any] = {"name": "checkGestures", "summary": "Check Input Gestures"}
+		self.name: str = self.manifest["name"]
+		self.version: str = "dev"
+
+	def getDocFilePath(self) -> str | None:
+		"""The path to the documentation of the add-on.
+		@return: the path or None if there is no documentation
+		@rtype: str | None
+		"""
+		return None
+
+
+def getCodeAddon() -> Addon:
+	"""The add-on whose code is calling this function.
+	@return: the add-on
+	@rtype: Addon
+	"""
+	return Addon()
+
+
+def getRunningAddons() -> list[Addon]:
+	"""The add-ons running in this session.
+	@return: the add-ons
+	@rtype: list[Addon]
+	"""
+	return [Addon()]
+
+
+def initTranslation() -> None:
+	"""Install the translation function into the namespace of the calling module, as NVDA does."""
+	sys._getframe(1).f_globals["_"] = lambda text: text
@@ -0,0 +1,39 @@
+# Stub of the NVDA api module for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+
+class AppModule:
+	"""Application module of the focused object."""
+
+
+class NVDAObject:
+	"""Focused object with the attributes used by the add-on."""
+
+	def __init__(self) -> None:
+		"""Initialization of the object attributes."""
+		self.appModule = AppModule()
+		self.treeInterceptor = None
+
+
+focusObject = NVDAObject()
+# Ancestors of the focused object, starting from the root
+focusAncestors: list[NVDAObject] = []
+
+
+def getFocusObject() -> NVDAObject:
+	"""The object that currently has the focus.
+	@return: focused object
+	@rtype: NVDAObject
+	"""
+	return focusObject
+
+
+def getFocusAncestors() -> list[NVDAObject]:
+	"""The ancestors of the focused object.
+	@return: the objects from the root to the parent of the focused object
+	@rtype: list[NVDAObject]
+	"""
+	return focusAncestors
@@ -0,0 +1,18 @@
+# Stub of the NVDA braille module for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+from typing import Any
+
+
+class BrailleHandler:
+	"""Braille handler without an active display."""
+
+	def __init__(self) -> None:
+		"""Initialization of the handler."""
+		self.display: Any = None
+
+
+handler = BrailleHandler()
@@ -0,0 +1,42 @@
+# Stub of the NVDA config module for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+from collections.abc import Callable
+from typing import Any
+
+conf: dict[str, dict[str, Any]] = {"keyboard": {"keyboardLayout": "laptop"}}
+isAppX: bool = False
+
+
+class Action:
+	"""Minimal replacement of the NVDA extension point."""
+
+	def __init__(self) -> None:
+		"""Initialization of the list of handlers."""
+		self.handlers: list[Callable[..., None]] = []
+
+	def register(self, handler: Callable[..., None]) -> None:
+		"""Register the handler of the extension point.
+		@param handler: function that will be called on notification
+		@type handler: Callable[..., None]
+		"""
+		self.handlers.append(handler)
+
+	def unregister(self, handler: Callable[..., None]) -> None:
+		"""Unregister the handler of the extension point.
+		@param handler: previously registered function
+		@type handler: Callable[..., None]
+		"""
+		self.handlers.remove(handler)
+
+	def notify(self) -> None:
+		"""Call all registered handlers."""
+		for handler in self.handlers:
+			handler()
+
+
+post_configProfileSwitch = Action()
+post_configReset = Action()
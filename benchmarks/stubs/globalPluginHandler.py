@@ -0,0 +1,22 @@
+# Stub of the NVDA globalPluginHandler module for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+from collections.abc import Callable
+from typing import Any
+
+
+class GlobalPlugin:
+	"""Global plugin with a map of gestures binded to its scripts."""
+
+	def __init__(self) -> None:
+		"""Initialization of the gesture map."""
+		self._gestureMap: dict[str, Callable[..., Any]] = {}
+
+	def terminate(self) -> None:
+		"""Called when the plugin is terminated."""
+
+
+runningPlugins: set[GlobalPlugin] = set()
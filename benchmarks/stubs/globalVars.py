@@ -0,0 +1,19 @@
+# Stub of the NVDA globalVars module for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+import tempfile
+
+
+class AppArgs:
+	"""Command line arguments of NVDA."""
+
+	def __init__(self) -> None:
+		"""Initialization of the arguments used by the add-on."""
+		self.secure: bool = False
+		self.configPath: str = tempfile.gettempdir()
+
+
+appArgs = AppArgs()
@@ -0,0 +1,24 @@
+# Stub of the NVDA gui package for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+from typing import Any
+
+from . import guiHelper
+
+__all__ = ["guiHelper", "mainFrame", "messageBox"]
+
+# The main frame of NVDA, which does not exist outside NVDA
+mainFrame: Any = None
+
+
+def messageBox(message: str, caption: str = "", style: int = 0, parent: Any = None) -> int:
+	"""Display a message box.
+	@param message: the message
+	@type message: str
+	@return: the identifier of the pressed button, always 0
+	@rtype: int
+	"""
+	return 0
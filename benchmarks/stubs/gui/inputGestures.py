@@ -0,0 +1,17 @@
+# Stub of the NVDA gui.inputGestures module for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+from typing import Any
+
+
+class InputGesturesDialog:
+	"""The Input Gestures dialog."""
+
+	def onOk(self, evt: Any) -> None:
+		"""Called when the OK button is activated.
+		@param evt: the event of the button
+		@type evt: Any
+		"""
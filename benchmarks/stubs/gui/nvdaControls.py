@@ -0,0 +1,9 @@
+# Stub of the NVDA gui.nvdaControls module for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+
+class AutoWidthColumnListCtrl:
+	"""List control with an automatically resized column."""
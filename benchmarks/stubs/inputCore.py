@@ -0,0 +1,69 @@
+# Stub of the NVDA inputCore module for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+
+class InputGesture:
+	"""Input gesture pressed by the user."""
+
+
+class AllGesturesScriptInfo:
+	"""Description of a script and the gestures binded to it, as displayed in the Input Gestures dialog."""
+
+	def __init__(
+		self,
+		category: str,
+		displayName: str,
+		className: str,
+		moduleName: str,
+		scriptName: str,
+		gestures: list[str],
+	) -> None:
+		"""Initialization of the script description fields."""
+		self.category = category
+		self.displayName = displayName
+		self.className = className
+		self.moduleName = moduleName
+		self.scriptName = scriptName
+		self.gestures = gestures
+
+
+class GlobalGestureMap:
+	"""Map of gestures to the scripts loaded from the configuration."""
+
+	def __init__(self) -> None:
+		"""Initialization of the map."""
+		self._map: dict[str, list[tuple[str, str, str | None]]] = {}
+
+
+class InputManager:
+	"""Manager that provides all gesture mappings of the synthetic inventory."""
+
+	def __init__(self) -> None:
+		"""Initialization of the gesture maps."""
+		self.mapping: dict[str, dict[str, AllGesturesScriptInfo]] = {}
+		self.userGestureMap = GlobalGestureMap()
+		self.localeGestureMap = GlobalGestureMap()
+
+	def getAllGestureMappings(self) -> dict[str, dict[str, AllGesturesScriptInfo]]:
+		"""All scripts with the text description grouped by category.
+		@return: scripts grouped by category
+		@rtype: dict[str, dict[str, AllGesturesScriptInfo]]
+		"""
+		return self.mapping
+
+
+manager = InputManager()
+
+
+def getDisplayTextForGestureIdentifier(identifier: str) -> tuple[str, str]:
+	"""Source and main part of the gesture identifier.
+	@param identifier: gesture identifier
+	@type identifier: str
+	@return: source and display text of the gesture
+	@rtype: tuple[str, str]
+	"""
+	source, main = identifier.split(":", 1)
+	return source, main
@@ -0,0 +1,13 @@
+# Stub of the NVDA languageHandler module for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+
+def getLanguage() -> str:
+	"""The language of the NVDA interface.
+	@return: language code
+	@rtype: str
+	"""
+	return "en"
@@ -0,0 +1,22 @@
+# Stub of the NVDA scriptHandler module for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+from collections.abc import Callable
+from typing import Any
+
+
+def script(**kwargs: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+	"""Decorator of the script functions, which stores the keyword arguments as attributes of the function.
+	@return: the decorator
+	@rtype: Callable[[Callable[..., Any]], Callable[..., Any]]
+	"""
+
+	def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+		for name, value in kwargs.items():
+			setattr(func, name, value)
+		return func
+
+	return decorate
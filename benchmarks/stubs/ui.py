@@ -0,0 +1,16 @@
+# Stub of the NVDA ui module for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+# Messages announced by the add-on
+messages: list[str] = []
+
+
+def message(text: str) -> None:
+	"""Announce the message.
+	@param text: the text of the message
+	@type text: str
+	"""
+	messages.append(text)
@@ -0,0 +1,21 @@
+# Stub of the NVDA vision module for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+from typing import Any
+
+
+class VisionHandler:
+	"""Vision handler without active providers."""
+
+	def getActiveProviderInstances(self) -> list[Any]:
+		"""Active vision enhancement providers.
+		@return: provider instances
+		@rtype: list[Any]
+		"""
+		return []
+
+
+handler = VisionHandler()
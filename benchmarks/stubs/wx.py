@@ -0,0 +1,73 @@
+# Stub of the wxPython package for running benchmarks outside NVDA
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Only the functions used outside of the dialogs are implemented,
+the rest of the names are placeholder classes, so the modules that refer to them can be imported.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+_placeholders: dict[str, type] = {}
+
+
+def CallAfter(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+	"""Call the function immediately, since there is no event loop.
+	@param func: the function to call
+	@type func: Callable[..., Any]
+	"""
+	func(*args, **kwargs)
+
+
+def IsMainThread() -> bool:
+	"""Whether the caller runs in the main thread.
+	@return: always True, since there is no event loop
+	@rtype: bool
+	"""
+	return True
+
+
+class CallLater:
+	"""Timer that is never started, the function is called only explicitly by the tests."""
+
+	def __init__(self, millis: int, func: Callable[..., Any], *args: Any) -> None:
+		"""Initialization of the timer.
+		@param millis: delay in milliseconds
+		@type millis: int
+		@param func: the function to call
+		@type func: Callable[..., Any]
+		"""
+		self.millis = millis
+		self.func = func
+
+	def Start(self, millis: int | None = None) -> None:
+		"""Restart the timer.
+		@param millis: new delay in milliseconds
+		@type millis: int | None
+		"""
+		self.millis = millis or self.millis
+
+	def Stop(self) -> None:
+		"""Stop the timer."""
+
+	def IsRunning(self) -> bool:
+		"""Whether the timer is running.
+		@return: always False
+		@rtype: bool
+		"""
+		return False
+
+
+def __getattr__(name: str) -> Any:
+	"""Placeholder class for any other name of the package.
+	@param name: the name of the attribute
+	@type name: str
+	@return: the placeholder class
+	@rtype: Any
+	"""
+	if name.startswith("__"):
+		raise AttributeError(name)
+	return _placeholders.setdefault(name, type(name, (), {}))
@@ -0,0 +1,80 @@
+# synthetic.py
+# Generation of synthetic input gestures inventories for the benchmarks
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+import random
+from collections.abc import Callable
+from typing import Any
+
+import globalPluginHandler
+import inputCore
+
+MODIFIERS: tuple[str, ...] = ("NVDA", "shift", "control", "alt", "windows")
+CATEGORIES: int = 30
+
+
+def makeScript(name: str, module: str) -> Callable[..., Any]:
+	"""Create a script function without a text description.
+	@param name: the name of the script without the "script_" prefix
+	@type name: str
+	@param module: the name of the module to which the script belongs
+	@type module: str
+	@return: script function
+	@rtype: Callable[..., Any]
+	"""
+
+	def script(gesture: object) -> None:
+		pass
+
+	script.__name__ = "script_" + name
+	script.__module__ = module
+	script.__doc__ = None
+	return script
+
+
+def populate(size: int, duplicateRatio: float = 0.05, unsignedRatio: float = 0.1, seed: int = 0) -> None:
+	"""Fill the stub NVDA modules with a synthetic inventory of input gestures.
+	@param size: the total number of gesture bindings
+	@type size: int
+	@param duplicateRatio: the share of bindings that reuse the gesture of another binding
+	@type duplicateRatio: float
+	@param unsignedRatio: the share of bindings to scripts without a text description
+	@type unsignedRatio: float
+	@param seed: initial value of the random number generator
+	@type seed: int
+	"""
+	rnd = random.Random(seed)
+	identifiers: list[str] = []
+	mapping: dict[str, dict[str, inputCore.AllGesturesScriptInfo]] = {}
+	plugins: dict[int, globalPluginHandler.GlobalPlugin] = {}
+	for i in range(size):
+		if identifiers and rnd.random() < duplicateRatio:
+			# Reuse an existing gesture, written with a different order and case of the modifiers
+			prefix, main = rnd.choice(identifiers).split(":", 1)
+			*modifiers, key = main.split("+")
+			rnd.shuffle(modifiers)
+			identifier = "%s:%s" % (prefix, "+".join([mod.lower() for mod in modifiers] + [key]))
+		else:
+			modifiers = rnd.sample(MODIFIERS, rnd.randint(1, 3))
+			layout = rnd.choice(("", "", "(laptop)", "(desktop)"))
+			identifier = "kb%s:%s+key%d" % (layout, "+".join(modifiers), i)
+			identifiers.append(identifier)
+		if rnd.random() < unsignedRatio:
+			number = i % max(1, size // 200)
+			plugin = plugins.setdefault(number, globalPluginHandler.GlobalPlugin())
+			plugin._gestureMap[identifier] = makeScript("unsigned%d" % i, "addon%d" % number)
+		else:
+			category = "Category %d" % (i % CATEGORIES)
+			mapping.setdefault(category, {})["script%d" % i] = inputCore.AllGesturesScriptInfo(
+				category=category,
+				displayName="Description of the script %d" % i,
+				className="GlobalPlugin",
+				moduleName="module%d" % (i % (CATEGORIES * 3)),
+				scriptName="script%d" % i,
+				gestures=[identifier],
+			)
+	inputCore.manager.mapping = mapping
+	globalPluginHandler.runningPlugins = set(plugins.values())
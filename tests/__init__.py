@@ -0,0 +1,17 @@
+# Unit tests of the NVDA Check Input Gestures add-on
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Unit tests that run without NVDA.
+The NVDA modules used by the add-on are replaced with the stubs of the benchmarks.
+Run with: python -m unittest
+"""
+
+import sys
+
+from benchmarks import STUBS
+
+if str(STUBS) not in sys.path:
+	sys.path.insert(0, str(STUBS))
@@ -0,0 +1,440 @@
+# Tests of the gestures inventory and its indexes
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+import pickle
+import random
+import re
+import unittest
+from types import SimpleNamespace
+from typing import Any
+
+import api
+import braille
+import globalPluginHandler
+import inputCore
+
+from benchmarks import loadAddonModule, synthetic
+
+base = loadAddonModule("base")
+
+LAYOUT = "laptop"
+SCANNERS: tuple[type, ...] = (
+	base.SignedScanner,
+	base.GlobalPluginsScanner,
+	base.AppModulesScanner,
+	base.BrailleDisplayScanner,
+	base.VisionProvidersScanner,
+)
+
+
+def freshScan() -> Any:
+	"""Scan all input gestures with a new registry, without any cached results.
+	@return: collection of all input gestures
+	@rtype: base.Gestures
+	"""
+	registry = base.ScannerRegistry(scanner() for scanner in SCANNERS)
+	gestures = base.Gestures()
+	gestures.update(registry.prepare(registry.fingerprint())())
+	return gestures
+
+
+def groupSets(groups: dict[Any, list[Any]]) -> dict[Any, frozenset[Any]]:
+	"""Conflict groups in a form that does not depend on the order of the gestures.
+	@param groups: canonical gesture keys mapped to the lists of gestures
+	@type groups: dict[Any, list[Any]]
+	@return: canonical gesture keys mapped to the sets of gestures
+	@rtype: dict[Any, frozenset[Any]]
+	"""
+	return {key: frozenset(group) for key, group in groups.items()}
+
+
+class GestureTest(unittest.TestCase):
+	"""Description of one input gesture."""
+
+	def test_immutable(self) -> None:
+		"""The fields cannot be changed or deleted, the gesture can still be pickled."""
+		gesture = base.Gesture("kb:nvda+x", "Category", "Description", "Cls", "globalPlugins.a", "x")
+		with self.assertRaises(AttributeError):
+			gesture._gesture = "kb:nvda+y"
+		with self.assertRaises(AttributeError):
+			del gesture._category
+		with self.assertRaises(AttributeError):
+			gesture.extra = 1
+		copy = pickle.loads(pickle.dumps(gesture))
+		self.assertEqual((copy, hash(copy)), (gesture, hash(gesture)))
+
+
+class GestureKeyTest(unittest.TestCase):
+	"""Canonical form of the gesture identifiers."""
+
+	def test_orderOfParts(self) -> None:
+		"""The order of all parts does not matter, even if the main key is not the last one."""
+		keys = {
+			base.gestureKey(gesture) for gesture in ("kb:d+nvda+shift", "kb:shift+d+nvda", "kb:NVDA+shift+d")
+		}
+		self.assertEqual(keys, {"kb:d+nvda+shift"})
+		self.assertEqual(base.gestureKey("br(x):a+b"), base.gestureKey("br(x):B+A"))
+		self.assertNotEqual(base.gestureKey("br(x):a+b"), base.gestureKey("br(y):a+b"))
+
+	def test_layout(self) -> None:
+		"""The keyboard layout is dropped only if it matches the given one."""
+		self.assertEqual(base.gestureKey("kb(laptop):shift+D+NVDA", "laptop"), "kb:d+nvda+shift")
+		self.assertEqual(base.gestureKey("kb(laptop):shift+D+NVDA", "desktop"), "kb(laptop):d+nvda+shift")
+
+
+class GesturesUpdateTest(unittest.TestCase):
+	"""Incremental update of the cached inventory."""
+
+	def setUp(self) -> None:
+		"""Fill the NVDA stubs with a synthetic inventory."""
+		synthetic.populate(3000, duplicateRatio=0.1)
+		base.scanners.invalidate()
+
+	def change(self) -> None:
+		"""Remove, replace and add some gestures in the NVDA stubs."""
+		mapping = inputCore.manager.mapping
+		del mapping["Category 1"]
+		mapping["Category 2"] = dict(list(mapping["Category 2"].items())[::2])
+		mapping["New category"] = {
+			"newScript": inputCore.AllGesturesScriptInfo(
+				category="New category",
+				displayName="New script",
+				className="GlobalPlugin",
+				moduleName="newModule",
+				scriptName="newScript",
+				gestures=["kb:NVDA+shift+key0", "kb(laptop):nvda+x"],
+			),
+		}
+		plugins = sorted(globalPluginHandler.runningPlugins, key=id)
+		globalPluginHandler.runningPlugins.remove(plugins[0])
+		plugins[1]._gestureMap["kb:control+nvda+key1"] = synthetic.makeScript("added", "addedModule")
+
+	def test_updateMatchesFreshScan(self) -> None:
+		"""After the update the inventory and its index are the same as after a full scan."""
+		cache = base.GesturesCache()
+		gestures = cache.get()
+		index = gestures.index(LAYOUT)
+		self.change()
+		cache.invalidate()
+		updated = cache.get()
+		fresh = freshScan()
+		self.assertIs(updated, gestures)
+		self.assertIs(updated.index(LAYOUT), index)
+		self.assertEqual(set(updated), set(fresh))
+		self.assertEqual(len(updated), len(fresh))
+		self.assertEqual(
+			groupSets(updated.index(LAYOUT).duplicates()),
+			groupSets(base.GestureIndex(LAYOUT, fresh).duplicates()),
+		)
+
+	def test_unchangedSourcesAreSkipped(self) -> None:
+		"""A repeated update with the same gestures does not add or remove anything."""
+		gestures = freshScan()
+		registry = base.ScannerRegistry(scanner() for scanner in SCANNERS)
+		self.assertEqual(gestures.update(registry.prepare(registry.fingerprint())()), (0, 0))
+
+	def test_repeatedGesturesAreCounted(self) -> None:
+		"""A gesture that comes from two sources stays in the inventory until both are removed."""
+		row = ("kb:nvda+x", None, None, None, "module", "script")
+		gestures = base.Gestures()
+		gestures.update({"first": [row], "second": [row]})
+		self.assertEqual(len(gestures), 1)
+		gestures.update({"second": [row]})
+		self.assertIn(base.Gesture(*row), gestures)
+		gestures.update({})
+		self.assertEqual(len(gestures), 0)
+		self.assertEqual(gestures.index(LAYOUT).count(base.gestureKey("kb:nvda+x", LAYOUT)), 0)
+
+	def test_conflictsFor(self) -> None:
+		"""The lookup of one gesture returns its group only if it is conflicting and reuses the cached inventory."""
+		cache = base.GesturesCache()
+		groups = base.GestureIndex(LAYOUT, freshScan()).duplicates()
+		group = next(iter(groups.values()))
+		lookup = cache.conflictsFor([group[0].gesture, group[0].gesture.upper()], LAYOUT)
+		self.assertEqual(cache.misses, 1)
+		self.assertEqual(set(lookup()), set(group))
+		self.assertEqual(cache.conflictsFor(["kb:nvda+shift+notBound"], LAYOUT)(), [])
+		self.assertEqual(cache.hits, 1)
+
+
+class SignedScannerTest(unittest.TestCase):
+	"""The mappings of the "Input Gestures" dialog are scanned again whenever the context changes."""
+
+	def tearDown(self) -> None:
+		"""Restore the focus and remove the braille display."""
+		api.focusObject = api.NVDAObject()
+		api.focusAncestors.clear()
+		braille.handler.display = None
+
+	def test_fingerprintFollowsContext(self) -> None:
+		"""Focus changes within one application and switching the braille display change the fingerprint."""
+		scanner = base.SignedScanner()
+		appModule = api.focusObject.appModule
+
+		class Document(api.NVDAObject):
+			pass
+
+		fingerprints = [scanner.fingerprint()]
+		api.focusObject = Document()
+		api.focusObject.appModule = appModule
+		fingerprints.append(scanner.fingerprint())
+		api.focusAncestors.append(Document())
+		fingerprints.append(scanner.fingerprint())
+		braille.handler.display = SimpleNamespace(_gestureMap={})
+		fingerprints.append(scanner.fingerprint())
+		self.assertEqual(len(set(fingerprints)), len(fingerprints))
+		self.assertEqual(scanner.fingerprint(), fingerprints[-1])
+
+
+class ConflictMatrixTest(unittest.TestCase):
+	"""Conflicts of all keyboard layouts computed in one pass."""
+
+	def setUp(self) -> None:
+		"""Fill the NVDA stubs with a synthetic inventory."""
+		synthetic.populate(5000, duplicateRatio=0.1)
+		base.scanners.invalidate()
+
+	def test_matrixMatchesIndexPerLayout(self) -> None:
+		"""The conflicts of each layout are the same as those of a separate index built for the layout."""
+		gestures = freshScan()
+		matrix = base.conflictMatrix(gestures)
+		self.assertEqual(set(matrix), set(base.LAYOUTS))
+		for layout in base.LAYOUTS:
+			with self.subTest(layout=layout):
+				self.assertEqual(
+					groupSets(matrix[layout]),
+					groupSets(base.GestureIndex(layout, gestures).duplicates()),
+				)
+
+	def test_layoutSpecificConflicts(self) -> None:
+		"""A gesture bound for one layout conflicts only in that layout."""
+		gestures = base.Gestures()
+		gestures.extend(
+			[
+				("kb:nvda+x", None, None, None, "first", "x"),
+				("kb(laptop):NVDA+x", None, None, None, "second", "x"),
+				("kb(desktop):nvda+y", None, None, None, "first", "y"),
+				("kb(desktop):NVDA+y", None, None, None, "second", "y"),
+			],
+		)
+		matrix = base.conflictMatrix(gestures)
+		self.assertIn("kb:nvda+x", matrix["laptop"])
+		self.assertNotIn("kb:nvda+y", matrix["laptop"])
+		self.assertEqual(set(matrix["desktop"]), {"kb:nvda+y"})
+
+	def test_profileViewDoesNotMarkWinners(self) -> None:
+		"""The groups that merge several layouts have no executed binding."""
+		duplicates = base.ProfileDuplicates()
+		duplicates._profiles = {"": "desktop"}
+		duplicates._resolver = base.DispatchResolver.read(LAYOUT)
+		duplicates._gestures = list(duplicates.collect(freshScan()))
+		self.assertTrue(duplicates.groups)
+		self.assertTrue(all(duplicates.winner(key) is None for key in duplicates.groups))
+
+
+class SearchIndexTest(unittest.TestCase):
+	"""Filtering of the gestures lists as the user types."""
+
+	def setUp(self) -> None:
+		"""Index the texts of a synthetic inventory."""
+		synthetic.populate(1000, duplicateRatio=0.1)
+		self.rows = [
+			(gesture.gesture, gesture.displayName, gesture.category, gesture.moduleName, gesture.scriptName)
+			for gesture in freshScan()
+		]
+		self.index = base.SearchIndex(self.rows)
+		self.rowWords = [
+			[word for text in row if text for word in re.findall(r"\w+", text.lower())] for row in self.rows
+		]
+		self.words = sorted({word for words in self.rowWords for word in words})
+
+	def bruteForce(self, query: str) -> list[int]:
+		"""Rows in which each word of the query is the beginning of a word, found by checking every row.
+		@param query: search query
+		@type query: str
+		@return: the numbers of the matching rows in ascending order
+		@rtype: list[int]
+		"""
+		words = re.findall(r"\w+", query.lower())
+		return [
+			number
+			for number, rowWords in enumerate(self.rowWords)
+			if all(any(rowWord.startswith(word) for rowWord in rowWords) for word in words)
+		]
+
+	def test_matchesBruteForce(self) -> None:
+		"""Random queries of one and several words, including the partially typed ones, as well as typing."""
+		rng = random.Random(1)
+		queries = ["", "   ", "+", "NVDA", "kb nvda", "zzz", "category 1"]
+		for _i in range(40):
+			words = rng.sample(self.words, rng.randint(1, 3))
+			queries.append(" ".join(word[: rng.randint(1, len(word))] for word in words))
+		for query in queries:
+			# Typing character by character goes through the cache of the previous prefixes
+			for end in range(1, len(query) + 1):
+				self.assertEqual(self.index.search(query[:end]), self.bruteForce(query[:end]), query[:end])
+		self.assertEqual(self.index.search(""), list(range(len(self.rows))))
+		self.assertEqual(len(self.index), len(self.rows))
+
+
+class DispatchResolverTest(unittest.TestCase):
+	"""Order in which NVDA looks for the scripts of conflicting gestures."""
+
+	def setUp(self) -> None:
+		"""Create the resolver with a focus context of an application, an object and its ancestor."""
+		self.resolver = base.DispatchResolver(
+			LAYOUT,
+			[[("globalPlugins.first", "GlobalPlugin")], [("globalPlugins.second", "GlobalPlugin")]],
+			[("appModules.notepad", "AppModule")],
+			[("browseMode", "BrowseModeDocumentTreeInterceptor")],
+			[[("NVDAObjects.IAccessible", "IAccessible")], [("NVDAObjects.window", "Window")]],
+			[("kb:nvda+z", "NVDAObjects.window", "Window", "user")],
+		)
+
+	def binding(self, gesture: str, module: str, className: str | None, script: str = "script") -> Any:
+		"""Create the binding of the gesture.
+		@return: the binding
+		@rtype: base.Gesture
+		"""
+		return base.Gesture(
+			gesture, "Category", "Description" if className else None, className, module, script
+		)
+
+	def resolve(self, *bindings: Any) -> Any:
+		"""The winner of the group of bindings of the same gesture.
+		@return: the winning binding or None
+		@rtype: base.Gesture | None
+		"""
+		group = list(bindings)
+		return self.resolver.resolve({"key": group}).get("key")
+
+	def test_focusChainOrder(self) -> None:
+		"""The focused object takes precedence over its ancestors, the tree interceptor over both."""
+		focus = self.binding("kb:nvda+x", "NVDAObjects.IAccessible", "IAccessible")
+		ancestor = self.binding("kb:nvda+x", "NVDAObjects.window", "Window")
+		treeInterceptor = self.binding("kb:nvda+x", "browseMode", "BrowseModeDocumentTreeInterceptor")
+		self.assertIs(self.resolve(ancestor, focus), focus)
+		self.assertIs(self.resolve(ancestor, focus, treeInterceptor), treeInterceptor)
+		self.assertIs(
+			self.resolve(focus, self.binding("kb:nvda+x", "globalCommands", "GlobalCommands")), focus
+		)
+
+	def test_modulesOutsideFocusAreInactive(self) -> None:
+		"""Objects and applications that are not in focus never run, even before the global commands."""
+		other = self.binding("kb:nvda+x", "NVDAObjects.UIA", "UIA")
+		app = self.binding("kb:nvda+x", "appModules.word", "AppModule")
+		commands = self.binding("kb:nvda+x", "globalCommands", "GlobalCommands")
+		self.assertEqual(self.resolver.rank(other)[0], self.resolver.INACTIVE_LEVEL)
+		self.assertIs(self.resolve(other, app, commands), commands)
+		self.assertIsNone(self.resolve(other, app))
+
+	def test_globalPluginOverlayClasses(self) -> None:
+		"""Overlay classes defined in a global plugin run only if they are in focus."""
+		plugin = self.binding("kb:nvda+x", "globalPlugins.second", "GlobalPlugin")
+		overlay = self.binding("kb:nvda+x", "globalPlugins.first", "Overlay")
+		focus = self.binding("kb:nvda+x", "NVDAObjects.IAccessible", "IAccessible")
+		self.assertEqual(self.resolver.rank(overlay)[0], self.resolver.INACTIVE_LEVEL)
+		self.assertIs(self.resolve(overlay, focus), focus)
+		self.assertIs(self.resolve(overlay, focus, plugin), plugin)
+		self.assertIsNone(self.resolve(overlay, self.binding("kb:nvda+x", "appModules.word", "AppModule")))
+		self.assertIs(
+			self.resolve(plugin, self.binding("kb:nvda+x", "globalPlugins.first", None)).moduleName,
+			"globalPlugins.first",
+		)
+
+	def test_unsignedAndUserBindings(self) -> None:
+		"""Bindings without a class name match by module, the user bindings win within a level."""
+		unsigned = self.binding("kb:nvda+x", "appModules.notepad", None)
+		self.assertEqual(self.resolver.rank(unsigned)[0], self.resolver.LEVELS["appModules"])
+		default = self.binding("kb:nvda+z", "NVDAObjects.window", "Window", "default")
+		user = self.binding("kb:nvda+z", "NVDAObjects.window", "Window", "user")
+		self.assertIs(self.resolve(default, user), user)
+
+	def test_readFocusAncestry(self) -> None:
+		"""The classes of the focused object and its ancestors are read from NVDA."""
+
+		class Window(api.NVDAObject):
+			pass
+
+		class Focus(Window):
+			pass
+
+		class Root(api.NVDAObject):
+			pass
+
+		api.focusObject = Focus()
+		api.focusAncestors[:] = [Root(), Window()]
+		try:
+			resolver = base.DispatchResolver.read(LAYOUT)
+		finally:
+			api.focusObject = api.NVDAObject()
+			api.focusAncestors.clear()
+		focus, window, root = (
+			self.binding("kb:nvda+x", __name__, name) for name in ("Focus", "Window", "Root")
+		)
+		# The window class is found first in the class of the focused object, the root is the farthest ancestor
+		(focusLevel, focusOrder), (windowLevel, windowOrder), (rootLevel, rootOrder) = (
+			resolver.rank(gesture)[:2] for gesture in (focus, window, root)
+		)
+		self.assertEqual((focusLevel, windowLevel, rootLevel), (5, 5, 5))
+		self.assertEqual(focusOrder, windowOrder)
+		self.assertEqual(rootOrder, focusOrder + 2)
+		self.assertIsNone(
+			resolver.resolve({"key": [self.binding("kb:nvda+x", __name__, "Other")]}).get("key")
+		)
+
+
+class GesturesPipelineTest(unittest.TestCase):
+	"""Conflicts found by the pipeline of the background check."""
+
+	def setUp(self) -> None:
+		"""Fill the NVDA stubs with a synthetic inventory and a braille display that shares a gesture with it."""
+		synthetic.populate(2000, duplicateRatio=0.1)
+		self.shared: str = next(iter(inputCore.manager.mapping["Category 3"].values())).gestures[0]
+		braille.handler.display = SimpleNamespace(
+			_gestureMap={self.shared: synthetic.makeScript("display", "brailleDisplayDrivers.stub")},
+		)
+		base.scanners.invalidate()
+
+	def tearDown(self) -> None:
+		"""Remove the braille display and the application module in focus."""
+		braille.handler.display = None
+		api.focusObject = api.NVDAObject()
+
+	def test_conflictsMatchInventory(self) -> None:
+		"""The pipeline finds the same conflicts as the index of the inventory, including all scanners."""
+		pipeline = base.GesturesPipeline(LAYOUT)
+		expected = base.GestureIndex(LAYOUT, freshScan()).duplicates()
+		self.assertEqual(set(pipeline.conflicts()), set(expected))
+		self.assertIn(base.gestureKey(self.shared, LAYOUT), expected)
+
+	def test_noConflicts(self) -> None:
+		"""Without duplicated gestures no conflict is reported."""
+		synthetic.populate(500, duplicateRatio=0.0)
+		braille.handler.display = None
+		self.assertEqual(base.GesturesPipeline(LAYOUT).conflicts(), {})
+
+	def test_appModulesOfOtherApplications(self) -> None:
+		"""Only the application module in focus is scanned, so modules of different applications do not conflict."""
+		braille.handler.display = None
+		gesture = "kb:nvda+shift+appKey"
+		for name in ("appModules.first", "appModules.second"):
+			api.focusObject.appModule = SimpleNamespace(
+				_gestureMap={gesture: synthetic.makeScript("app", name)}
+			)
+			conflicts = base.GesturesPipeline(LAYOUT).conflicts()
+			self.assertNotIn(base.gestureKey(gesture, LAYOUT), conflicts)
+			modules = {gest.moduleName for gest in freshScan() if gest.gesture == gesture}
+			self.assertEqual(modules, {name})
+		# The application module still conflicts with the gestures of the rest of NVDA
+		api.focusObject.appModule._gestureMap[self.shared] = synthetic.makeScript(
+			"shared", "appModules.second"
+		)
+		self.assertIn(base.gestureKey(self.shared, LAYOUT), base.GesturesPipeline(LAYOUT).conflicts())
+
+
+if __name__ == "__main__":
+	unittest.main()
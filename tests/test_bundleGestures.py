@@ -0,0 +1,107 @@
+# Tests of the static extraction of input gestures from add-on bundles
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from tools import bundleGestures
+
+SOURCE = """
+from scriptHandler import script
+import globalPluginHandler
+
+class GlobalPlugin(globalPluginHandler.GlobalPlugin):
+	scriptCategory = _("Sample")
+	__gestures = {"kb:NVDA+control+y": "other"}
+
+	@script(description=_("Says x"), gestures=["kb:NVDA+shift+x", "kb:shift+nvda+x"])
+	def script_sayX(self, gesture):
+		pass
+
+	def script_other(self, gesture):
+		pass
+"""
+
+
+class BundleGesturesTest(unittest.TestCase):
+	"""Extraction of the gestures and prediction of the conflicts."""
+
+	def setUp(self) -> None:
+		"""Write a sample add-on bundle to a temporary directory."""
+		directory = tempfile.TemporaryDirectory()
+		self.addCleanup(directory.cleanup)
+		self.path = os.path.join(directory.name, "sample.nvda-addon")
+		with zipfile.ZipFile(self.path, "w") as bundle:
+			bundle.writestr("manifest.ini", 'name = sample\nversion = "1.2"\n')
+			bundle.writestr("globalPlugins/sample/__init__.py", SOURCE)
+			bundle.writestr("globalPlugins/broken.py", "def broken(:\n")
+
+	def test_extract(self) -> None:
+		"""The spellings of one gesture are bound once, the gestures without description are kept."""
+		result = bundleGestures.analyzeBundle(self.path, cache=None)
+		self.assertEqual((result["name"], result["version"]), ("sample", "1.2"))
+		self.assertEqual(len(result["errors"]), 1)
+		self.assertEqual(
+			sorted(result["gestures"]),
+			[
+				("kb:NVDA+control+y", None, None, None, "globalPlugins.sample", "other"),
+				("kb:NVDA+shift+x", "Sample", "Says x", "GlobalPlugin", "globalPlugins.sample", "sayX"),
+			],
+		)
+
+	def test_multiLineManifest(self) -> None:
+		"""Manifests with multi-line values are read, a broken manifest is reported as an error."""
+		manifest = (
+			'name = sample\nsummary = "Sample"\ndescription = """First line.\n'
+			"version = 9\n[not a section\n\"\"\"\nversion = 2.0\nchangelog = '''Fixed.'''\n"
+		)
+		with zipfile.ZipFile(self.path, "w") as bundle:
+			bundle.writestr("manifest.ini", manifest)
+			bundle.writestr("globalPlugins/sample/__init__.py", SOURCE)
+		result = bundleGestures.analyzeBundle(self.path, cache=None)
+		self.assertEqual((result["name"], result["version"], result["errors"]), ("sample", "2.0", []))
+		self.assertEqual(len(result["gestures"]), 2)
+		with zipfile.ZipFile(self.path, "w") as bundle:
+			bundle.writestr("manifest.ini", 'name = sample\ndescription = """Not terminated\n')
+		result = bundleGestures.analyzeBundle(self.path, cache=None)
+		self.assertEqual(result["name"], "sample")
+		self.assertEqual(len(result["errors"]), 1)
+
+	def test_noSelfConflicts(self) -> None:
+		"""A script bound to several spellings of the same gesture does not conflict with itself."""
+		bundle = bundleGestures.analyzeBundle(self.path, cache=None)
+		bundle["gestures"].append(
+			("kb:shift+NVDA+x", "Sample", "Says x", "GlobalPlugin", "globalPlugins.sample", "sayX"),
+		)
+		self.assertEqual(bundleGestures.predictConflicts([bundle], [], "desktop"), {})
+
+	def test_conflictsWithInventory(self) -> None:
+		"""A gesture already used on the workstation is reported as a conflict."""
+		bundle = bundleGestures.analyzeBundle(self.path, cache=None)
+		inventory = [
+			("kb(laptop):nvda+control+y", "Other", "Does y", "GlobalCommands", "globalCommands", "y")
+		]
+		conflicts = bundleGestures.predictConflicts([bundle], inventory, "laptop")
+		self.assertEqual(
+			conflicts,
+			{"kb:control+nvda+y": [("globalCommands", "Does y"), ("globalPlugins.sample", "other")]},
+		)
+		self.assertEqual(bundleGestures.predictConflicts([bundle], inventory, "desktop"), {})
+
+	def test_cache(self) -> None:
+		"""The result is cached by the hash of the bundle content."""
+		with tempfile.TemporaryDirectory() as cache:
+			first = bundleGestures.analyzeBundle(self.path, cache=Path(cache))
+			self.assertEqual(len(os.listdir(cache)), 1)
+			second = bundleGestures.analyzeBundle(self.path, cache=Path(cache))
+		self.assertEqual(first, second)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,158 @@
+# Tests of the export of the gestures inventory
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+import os
+import tempfile
+import unittest
+from typing import Any
+
+from benchmarks import loadAddonModule
+
+base = loadAddonModule("base")
+export = loadAddonModule("export")
+
+LAYOUT = "laptop"
+META: dict[str, Any] = {"machine": "Робоча станція, 1", "layout": LAYOUT, "created": "2026-01-01T00:00:00"}
+
+
+def inventory(size: int) -> Any:
+	"""Inventory with the values that are hard to store: empty fields, separators, quotes and non-ASCII text.
+	@param size: the number of additional generated gestures
+	@type size: int
+	@return: collection of input gestures
+	@rtype: base.Gestures
+	"""
+	gestures = base.Gestures()
+	gestures.extend(
+		[
+			(
+				"kb:NVDA+shift+x",
+				"Категорія",
+				'Says "hello", then waits',
+				"GlobalPlugin",
+				"globalPlugins.a",
+				"x",
+			),
+			("kb(laptop):shift+nvda+x", None, None, None, "globalPlugins.b", "y"),
+			("kb(desktop):nvda+x", "Text\nwith a line break", "Description; #1", "Cls", "appModules.c", "z"),
+			("br(freedomScientific):leftWizWheelUp", "", "", "", "", "wheel"),
+		],
+	)
+	gestures.extend(
+		(
+			"kb:control+key%d" % (i % (size // 2 + 1)),
+			"Category %d" % (i % 7),
+			"Script %d" % i,
+			"Cls",
+			"m",
+			"s%d" % i,
+		)
+		for i in range(size)
+	)
+	return gestures
+
+
+def fields(gesture: Any) -> tuple[Any, ...]:
+	"""Fields of the gesture as they are read from the exported file.
+	@param gesture: an input gesture
+	@type gesture: base.Gesture
+	@return: fields in the order of the Gesture constructor arguments, empty fields are None
+	@rtype: tuple[Any, ...]
+	"""
+	return (gesture.gesture, *(getattr(gesture, field) or None for field in export.FIELDS[1:]))
+
+
+class ExportRoundTripTest(unittest.TestCase):
+	"""Each format reads back exactly what was written."""
+
+	def setUp(self) -> None:
+		"""Create a temporary directory for the exported files."""
+		self.directory = tempfile.TemporaryDirectory()
+		self.addCleanup(self.directory.cleanup)
+
+	def roundTrip(self, extension: str, size: int) -> None:
+		"""Export the inventory and compare the file contents with it.
+		@param extension: the extension of the file, which selects the format
+		@type extension: str
+		@param size: the number of additional generated gestures
+		@type size: int
+		"""
+		gestures = inventory(size)
+		index = gestures.index(LAYOUT)
+		path = os.path.join(self.directory.name, "inventory" + extension)
+		self.assertEqual(export.exportInventory(path, gestures, index, META), len(gestures))
+		meta, rows = export.readInventory(path)
+		read = list(rows)
+		self.assertEqual({key: meta[key] for key in META}, META)
+		self.assertEqual(read, [fields(gesture) for gesture in gestures])
+		restored = base.Gestures()
+		restored.extend(read)
+		self.assertEqual(
+			{key: set(group) for key, group in base.GestureIndex(LAYOUT, restored).duplicates().items()},
+			{key: set(group) for key, group in index.duplicates().items()},
+		)
+
+	def test_jsonLines(self) -> None:
+		"""JSON Lines format."""
+		self.roundTrip(".jsonl", 100)
+
+	def test_csv(self) -> None:
+		"""CSV table, including the metadata line."""
+		self.roundTrip(".csv", 100)
+
+	def test_columnar(self) -> None:
+		"""Binary columnar format with several row groups."""
+		self.roundTrip(".cgb", export.ColumnarFormat.GROUP_SIZE * 2 + 10)
+
+	def test_csvWithoutMetadata(self) -> None:
+		"""CSV files without the metadata line are read with empty metadata."""
+		path = os.path.join(self.directory.name, "plain.csv")
+		with open(path, "w", encoding="utf-8", newline="") as stream:
+			stream.write("gesture,category,displayName,className,moduleName,scriptName,key,conflict\r\n")
+			stream.write("kb:nvda+x,,,,globalPlugins.a,x,kb:nvda+x,\r\n")
+		meta, rows = export.readInventory(path)
+		self.assertEqual(list(rows), [("kb:nvda+x", None, None, None, "globalPlugins.a", "x")])
+		self.assertEqual(meta, {})
+
+	def test_analyzerUsesCsvMetadata(self) -> None:
+		"""The offline analyzer takes the keyboard layout and the machine name from a CSV file."""
+		from tools import analyzeInventories
+
+		path = os.path.join(self.directory.name, "station.csv")
+		gestures = inventory(0)
+		export.exportInventory(path, gestures, gestures.index(LAYOUT), META)
+		report = analyzeInventories.analyzeFile(path)
+		self.assertEqual(report["machine"], META["machine"])
+		self.assertEqual(report["layout"], LAYOUT)
+		self.assertIn("kb:nvda+shift+x", report["conflicts"])
+
+	def test_analyzerSkipsMalformedFiles(self) -> None:
+		"""A truncated file is reported as failed, while the rest of the files are analyzed."""
+		from tools import analyzeInventories
+
+		gestures = inventory(20)
+		paths = [os.path.join(self.directory.name, name) for name in ("a.jsonl", "b.cgb", "c.csv")]
+		for path in paths:
+			export.exportInventory(path, gestures, gestures.index(LAYOUT), META)
+		with open(paths[1], "r+b") as stream:
+			stream.truncate(os.path.getsize(paths[1]) // 2)
+		reports = analyzeInventories.analyzeFiles(paths, None, 2)
+		self.assertEqual([report["file"] for report in reports], paths)
+		self.assertIn("error", reports[1])
+		self.assertNotIn("error", reports[0])
+		summary = analyzeInventories.aggregate(reports, 5)
+		self.assertEqual(summary["failedFiles"], [paths[1]])
+		self.assertEqual(summary["machines"], 2)
+		self.assertEqual(summary["bindings"], 2 * len(gestures))
+
+	def test_unsupportedExtension(self) -> None:
+		"""An unknown extension is rejected."""
+		with self.assertRaises(ValueError):
+			export.formatFor("inventory.txt")
+
+
+if __name__ == "__main__":
+	unittest.main()
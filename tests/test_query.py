@@ -0,0 +1,111 @@
+# Tests of the query language for custom collections of input gestures
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+import unittest
+
+import config
+
+from benchmarks import loadAddonModule
+
+base = loadAddonModule("base")
+query = loadAddonModule("query")
+
+GESTURES: tuple[tuple[str | None, ...], ...] = (
+	("kb(laptop):NVDA+shift+d", "Speech", "Say all", "GlobalCommands", "globalCommands", "sayAll"),
+	("kb:NVDA+d", None, None, None, "globalPlugins.example", "example"),
+	(
+		"br(freedomScientific):routing",
+		"Braille",
+		"Route to cell",
+		"BrailleDisplayDriver",
+		"brailleDisplayDrivers.fs",
+		"route",
+	),
+)
+
+
+class QueryParserTest(unittest.TestCase):
+	"""Queries accepted and rejected by the parser."""
+
+	def test_accepted(self) -> None:
+		"""Valid queries are compiled."""
+		for text in (
+			"",
+			"module:globalPlugins.* and gesture:kb:* and not category:",
+			'(name:"say all" or script:sayAll) speech',
+			'"quoted \\"text\\""',
+			"class:Global?ommands",
+			"gesture:kb(laptop):nvda+d",
+			"kb:nvda+d",
+			"kb(laptop):nvda+d or br(freedomScientific):routing",
+			"not not category:speech",
+		):
+			with self.subTest(text):
+				self.assertTrue(callable(query.compileQuery(text)))
+
+	def test_rejected(self) -> None:
+		"""Invalid queries raise QuerySyntaxError."""
+		for text in ("(module:a", "module:a)", ")", "and", "not", "module:a or", '"unterminated', "a and ()"):
+			with self.subTest(text):
+				with self.assertRaises(query.QuerySyntaxError):
+					query.compileQuery(text)
+
+	def test_unknownFieldIsText(self) -> None:
+		"""A word with an unknown field, such as a gesture identifier, is a full-text term."""
+		self.assertEqual(list(query.tokenize("kb:nvda+d")), [("term", None, "kb:nvda+d")])
+		self.assertEqual(list(query.tokenize("kb(laptop):nvda+d")), [("term", None, "kb(laptop):nvda+d")])
+		self.assertEqual(list(query.tokenize("Module:a")), [("term", "Module", "a")])
+		gestures = [base.Gesture(*row) for row in GESTURES]
+		self.assertEqual([g.scriptName for g in gestures if query.compileQuery("kb:nvda+d")(g)], ["example"])
+
+
+class QueryLayoutTest(unittest.TestCase):
+	"""Gesture terms are compared in the keyboard layout used for the scan."""
+
+	def test_compiledForLayout(self) -> None:
+		"""The layout-specific gesture matches the generic one only in its own layout."""
+		gesture = base.Gesture(*GESTURES[0])
+		self.assertTrue(query.compileQuery("gesture:kb:shift+nvda+d", "laptop")(gesture))
+		self.assertFalse(query.compileQuery("gesture:kb:shift+nvda+d", "desktop")(gesture))
+		self.assertTrue(query.compileQuery("gesture:kb:*", "laptop")(gesture))
+		self.assertFalse(query.compileQuery("gesture:kb:*", "desktop")(gesture))
+
+	def test_reorderedWildcardPattern(self) -> None:
+		"""Wildcard patterns of gestures do not depend on the order of the parts either."""
+		gesture = base.Gesture("kb:NVDA+shift+d", None, None, None, "globalPlugins.example", "example")
+		for pattern, expected in (
+			("gesture:kb:shift+nvda+*", True),
+			("gesture:kb:nvda+shift+*", True),
+			("gesture:kb:*+shift", True),
+			("gesture:kb:shift+?", False),
+			("gesture:kb:shift+nvda+?", True),
+			("gesture:kb:control+nvda+*", False),
+			("gesture:kb:*", True),
+			("gesture:br(*):*", False),
+			("gesture:*nvda*", True),
+		):
+			with self.subTest(pattern):
+				self.assertEqual(query.compileQuery(pattern, "desktop")(gesture), expected)
+		chord = base.Gesture("br(x):dot2+dot1+space", None, None, None, "brailleDisplayDrivers.x", "chord")
+		self.assertTrue(query.compileQuery("gesture:br(*):space+dot?+dot1")(chord))
+
+	def test_queryGesturesUseCurrentLayout(self) -> None:
+		"""The collection compiles the query for the layout read during the preparation."""
+		gestures = base.Gestures()
+		gestures.extend(GESTURES)
+		layout = config.conf["keyboard"]["keyboardLayout"]
+		try:
+			for current, expected in (("laptop", ["sayAll"]), ("desktop", [])):
+				config.conf["keyboard"]["keyboardLayout"] = current
+				collection = query.QueryGestures("gesture:kb:nvda+shift+d")
+				collection.prepare()
+				self.assertEqual([g.scriptName for g in collection.collect(gestures)], expected)
+		finally:
+			config.conf["keyboard"]["keyboardLayout"] = layout
+
+
+if __name__ == "__main__":
+	unittest.main()
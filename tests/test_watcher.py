@@ -0,0 +1,117 @@
+# Tests of the automatic check for new conflicts of input gestures
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+import tempfile
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+import addonHandler
+import globalVars
+import ui
+from gui.inputGestures import InputGesturesDialog
+
+from benchmarks import loadAddonModule
+
+watcher = loadAddonModule("watcher")
+
+
+class ConflictWatcherTest(unittest.TestCase):
+	"""Notifications about new conflicts and the hook of the "Input Gestures" dialog."""
+
+	def setUp(self) -> None:
+		"""Create the watcher that stores the known conflicts in a temporary directory."""
+		self.directory = tempfile.TemporaryDirectory()
+		self.configPath = globalVars.appArgs.configPath
+		globalVars.appArgs.configPath = self.directory.name
+		self.executor = ThreadPoolExecutor(max_workers=1)
+		self.watcher = watcher.ConflictWatcher(self.executor)
+		self.original = vars(InputGesturesDialog)["onOk"]
+		ui.messages.clear()
+
+	def tearDown(self) -> None:
+		"""Restore the dialog and remove the temporary directory."""
+		InputGesturesDialog.onOk = self.original
+		globalVars.appArgs.configPath = self.configPath
+		self.executor.shutdown()
+		self.directory.cleanup()
+
+	def checked(self, *keys: str) -> None:
+		"""Pass the result of a finished check to the watcher.
+		@param keys: canonical keys of the conflicting gestures
+		@type keys: str
+		"""
+		future: Future[dict[str, str]] = Future()
+		future.set_result({key: key for key in keys})
+		self.watcher._check = future
+		self.watcher.onChecked(future)
+
+	def test_knownConflictsAreMerged(self) -> None:
+		"""A conflict is announced only once, even if it disappears and comes back."""
+		self.checked("kb:nvda+a", "kb:nvda+b")
+		self.assertEqual(ui.messages, [])
+		self.checked("kb:nvda+a")
+		self.checked("kb:nvda+a", "kb:nvda+b")
+		self.assertEqual(ui.messages, [])
+		self.checked("kb:nvda+c")
+		self.assertEqual(len(ui.messages), 1)
+		self.assertIn("nvda+c", ui.messages[0].lower())
+		self.assertEqual(self.watcher.load(), {"kb:nvda+a", "kb:nvda+b", "kb:nvda+c"})
+
+	def test_startupCheckOnlyAfterChanges(self) -> None:
+		"""The check after the startup is performed in the first session and after the add-ons change."""
+		self.watcher.start()
+		self.assertIsNotNone(self.watcher._timer)
+		self.checked("kb:nvda+a")
+		self.watcher.stop()
+		self.watcher.start()
+		self.assertIsNone(self.watcher._timer)
+		self.watcher.stop()
+		running = addonHandler.getRunningAddons
+
+		def updated() -> list[Any]:
+			addons = running()
+			addons[0].version = "next"
+			return addons
+
+		addonHandler.getRunningAddons = updated
+		try:
+			self.watcher.start()
+		finally:
+			addonHandler.getRunningAddons = running
+		self.assertIsNotNone(self.watcher._timer)
+		self.checked("kb:nvda+a")
+		self.assertEqual(ui.messages, [])
+		self.assertIn("checkGestures next", self.watcher.read()["environment"])
+		self.watcher.stop()
+
+	def test_stopRestoresTheDialog(self) -> None:
+		"""The original method of the dialog is restored when the watcher stops."""
+		self.watcher.start()
+		self.assertIsNot(vars(InputGesturesDialog)["onOk"], self.original)
+		self.watcher.stop()
+		self.assertIs(vars(InputGesturesDialog)["onOk"], self.original)
+
+	def test_stopKeepsWrapperOfAnotherAddon(self) -> None:
+		"""If the method was wrapped after the watcher, the other wrapper is kept and ours does nothing."""
+		self.watcher.start()
+		ours = InputGesturesDialog.onOk
+		calls: list[Any] = []
+
+		def other(dialog: Any, evt: Any) -> None:
+			calls.append(evt)
+			ours(dialog, evt)
+
+		InputGesturesDialog.onOk = other
+		self.watcher.stop()
+		self.assertIs(vars(InputGesturesDialog)["onOk"], other)
+		InputGesturesDialog().onOk("event")
+		self.assertEqual(calls, ["event"])
+		self.assertIsNone(self.watcher._timer)
+
+
+if __name__ == "__main__":
+	unittest.main()
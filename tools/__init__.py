@@ -0,0 +1,32 @@
+# Command line tools of the NVDA Check Input Gestures add-on
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Tools that reuse the add-on modules outside NVDA."""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+from types import ModuleType
+
+ROOT = Path(__file__).resolve().parent.parent
+ADDON_PACKAGE = ROOT / "addon" / "globalPlugins" / "checkGestures"
+
+
+def loadAddonModule(name: str) -> ModuleType:
+	"""Import a module of the add-on package without running the package initialization,
+	which requires the NVDA graphical interface.
+	Only the modules that import NVDA lazily, such as "base" and "export", can be used without NVDA.
+	@param name: the name of the module inside the add-on package, e.g. "base"
+	@type name: str
+	@return: imported module
+	@rtype: ModuleType
+	"""
+	if "checkGestures" not in sys.modules:
+		package = types.ModuleType("checkGestures")
+		package.__path__ = [str(ADDON_PACKAGE)]
+		sys.modules["checkGestures"] = package
+	return importlib.import_module("checkGestures." + name)
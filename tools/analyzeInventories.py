@@ -0,0 +1,173 @@
+# analyzeInventories.py
+# Offline analysis of the input gestures inventories exported from many workstations
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Detect input gesture conflicts in the inventories exported by the add-on, without NVDA.
+The files are processed in parallel by a pool of processes, one file per task.
+The files that cannot be read are listed in the report, the rest of the files are still analyzed.
+Run with: python -m tools.analyzeInventories --help
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from . import loadAddonModule
+
+base = loadAddonModule("base")
+export = loadAddonModule("export")
+
+
+def analyzeFile(path: str, layout: str | None = None) -> dict[str, Any]:
+	"""Detect conflicts in one exported inventory.
+	@param path: the path to the exported file
+	@type path: str
+	@param layout: the keyboard layout used to detect conflicts, the one from the file metadata if not specified
+	@type layout: str | None
+	@return: the machine name, the number of bindings and the conflict groups
+	@rtype: dict[str, Any]
+	"""
+	meta, rows = export.readInventory(path)
+	gestures = base.Gestures()
+	gestures.extend(rows)
+	layout = layout or meta.get("layout") or "desktop"
+	conflicts = {
+		key: sorted({(gest.moduleName, gest.displayName or gest.scriptName) for gest in group})
+		for key, group in base.GestureIndex(layout, gestures).duplicates().items()
+	}
+	return {
+		"file": path,
+		"machine": meta.get("machine") or Path(path).stem,
+		"layout": layout,
+		"bindings": len(gestures),
+		"conflicts": conflicts,
+	}
+
+
+def analyzeSafely(path: str, layout: str | None = None) -> dict[str, Any]:
+	"""Detect conflicts in one exported inventory, a file that cannot be read does not stop the analysis.
+	@param path: the path to the exported file
+	@type path: str
+	@param layout: the keyboard layout used to detect conflicts, the one from the file metadata if not specified
+	@type layout: str | None
+	@return: the result of analyzeFile or the file and the error if the file cannot be analyzed
+	@rtype: dict[str, Any]
+	"""
+	try:
+		return analyzeFile(path, layout)
+	except Exception as e:
+		# Exported files can be truncated or corrupted in many ways, including errors of the decompression
+		return {"file": path, "error": "%s: %s" % (type(e).__name__, e)}
+
+
+def analyzeFiles(paths: list[str], layout: str | None, jobs: int | None) -> list[dict[str, Any]]:
+	"""Detect conflicts in the exported inventories by a pool of processes.
+	@param paths: the paths to the exported files
+	@type paths: list[str]
+	@param layout: the keyboard layout used to detect conflicts instead of the exported one
+	@type layout: str | None
+	@param jobs: the number of worker processes, the number of processors if not specified
+	@type jobs: int | None
+	@return: the results of analyzeSafely for each file
+	@rtype: list[dict[str, Any]]
+	"""
+	with ProcessPoolExecutor(max_workers=jobs) as executor:
+		chunksize = max(1, len(paths) // ((jobs or os.cpu_count() or 1) * 4))
+		return list(executor.map(analyzeSafely, paths, [layout] * len(paths), chunksize=chunksize))
+
+
+def aggregate(reports: list[dict[str, Any]], top: int) -> dict[str, Any]:
+	"""Statistics of the conflicts on all workstations.
+	@param reports: results of the analysis of each file, including the files that could not be analyzed
+	@type reports: list[dict[str, Any]]
+	@param top: the number of the most frequent items in each rating
+	@type top: int
+	@return: aggregated statistics
+	@rtype: dict[str, Any]
+	"""
+	failed = [report["file"] for report in reports if "error" in report]
+	reports = [report for report in reports if "error" not in report]
+	keys: Counter[str] = Counter()
+	modules: Counter[str] = Counter()
+	for report in reports:
+		keys.update(report["conflicts"].keys())
+		modules.update({module for group in report["conflicts"].values() for module, _name in group})
+	return {
+		"machines": len(reports),
+		"machinesWithConflicts": sum(1 for report in reports if report["conflicts"]),
+		"bindings": sum(report["bindings"] for report in reports),
+		"conflicts": sum(len(report["conflicts"]) for report in reports),
+		"topGestures": keys.most_common(top),
+		"topModules": modules.most_common(top),
+		"failedFiles": failed,
+	}
+
+
+def main() -> int:
+	"""Analyze the exported inventories given in the command line.
+	@return: exit code
+	@rtype: int
+	"""
+	parser = argparse.ArgumentParser(
+		prog="python -m tools.analyzeInventories",
+		description="Detect input gesture conflicts in the inventories exported from many workstations.",
+	)
+	parser.add_argument("files", nargs="+", type=Path, help="exported files or directories with them")
+	parser.add_argument(
+		"--layout", help="keyboard layout used to detect conflicts instead of the exported one"
+	)
+	parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="the number of worker processes")
+	parser.add_argument("--top", type=int, default=20, help="the length of the aggregated ratings")
+	parser.add_argument("--json", action="store_true", help="print the full results in JSON")
+	args = parser.parse_args()
+
+	paths: list[str] = []
+	for item in args.files:
+		if item.is_dir():
+			paths.extend(
+				str(path) for path in sorted(item.iterdir()) if path.suffix.lower() in export.FORMATS
+			)
+		else:
+			paths.append(str(item))
+	reports = analyzeFiles(paths, args.layout, args.jobs)
+	summary = aggregate(reports, args.top)
+	status = 1 if summary["failedFiles"] else 0
+
+	if args.json:
+		json.dump({"summary": summary, "machines": reports}, sys.stdout, ensure_ascii=False, indent="\t")
+		print()
+		return status
+	for report in reports:
+		if "error" in report:
+			print(f"{report['file']}: not analyzed, {report['error']}")
+			continue
+		print(f"{report['machine']}: {report['bindings']} bindings, {len(report['conflicts'])} conflicts")
+		for key, bindings in sorted(report["conflicts"].items()):
+			print(f"\t{key}: " + "; ".join(f"{name} [{module}]" for module, name in bindings))
+	print(
+		f"Total: {summary['machines']} machines, {summary['machinesWithConflicts']} with conflicts, "
+		f"{summary['bindings']} bindings, {summary['conflicts']} conflicts",
+	)
+	print("Most frequent conflicting gestures:")
+	for key, count in summary["topGestures"]:
+		print(f"\t{key}: {count} machines")
+	print("Modules most often involved in conflicts:")
+	for module, count in summary["topModules"]:
+		print(f"\t{module}: {count} machines")
+	if summary["failedFiles"]:
+		print(f"Files not analyzed: {len(summary['failedFiles'])}")
+		for path in summary["failedFiles"]:
+			print(f"\t{path}")
+	return status
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,320 @@
+# bundleGestures.py
+# Static extraction of input gestures from NVDA add-on bundles
+# A part of the NVDA Check Input Gestures add-on
+# This file is covered by the GNU General Public License.
+# See the file COPYING for more details.
+# Copyright (C) 2021-2026 Olexandr Gryshchenko <grisov.nvaccess@mailnull.com>
+
+"""Extract the input gestures of an add-on from its ".nvda-addon" bundle without importing its code.
+The Python sources of the bundle are parsed with the ast module, the gestures are taken
+from the "__gestures" dictionaries of the classes and from the "gesture" and "gestures" arguments
+of the "@script" decorators. Only literal values are taken into account.
+The results are cached for each bundle by the SHA-256 hash of its content.
+The gestures of the bundles can be checked for conflicts with each other and with the inventories
+exported from workstations, to predict the conflicts before the add-on is deployed.
+Run with: python -m tools.bundleGestures --help
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import sys
+import zipfile
+from pathlib import Path
+from typing import Any
+
+from . import loadAddonModule
+
+base = loadAddonModule("base")
+export = loadAddonModule("export")
+
+# Changing the version invalidates the results cached by the previous versions of the parser
+PARSER_VERSION: int = 3
+CACHE = Path.home() / ".cache" / "checkGestures" / "bundles"
+
+
+def literal(node: ast.expr | None) -> str | None:
+	"""The string value of the node, including the strings marked for translation with _("...").
+	@param node: the node of the syntax tree
+	@type node: ast.expr | None
+	@return: the string or None if the value is not a string literal
+	@rtype: str | None
+	"""
+	if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in ("_", "pgettext"):
+		node = node.args[-1] if node.args else None
+	if isinstance(node, ast.Constant) and isinstance(node.value, str):
+		return node.value
+	return None
+
+
+def literals(node: ast.expr | None) -> list[str]:
+	"""String values of the list, tuple or set literal.
+	@param node: the node of the syntax tree
+	@type node: ast.expr | None
+	@return: the strings found among the elements
+	@rtype: list[str]
+	"""
+	if isinstance(node, ast.List | ast.Tuple | ast.Set):
+		return [value for value in map(literal, node.elts) if value]
+	return []
+
+
+def moduleNameOf(member: str) -> str:
+	"""The name under which NVDA imports the module stored in the bundle.
+	@param member: the path to the file inside the bundle, e.g. "globalPlugins/myAddon/__init__.py"
+	@type member: str
+	@return: the name of the module, e.g. "globalPlugins.myAddon"
+	@rtype: str
+	"""
+	parts = list(Path(member).with_suffix("").parts)
+	if parts[-1] == "__init__":
+		parts.pop()
+	return ".".join(parts)
+
+
+def extractFromSource(source: str | bytes, moduleName: str) -> list[base.GestureFields]:
+	"""Extract the input gestures bound in the classes of a Python module.
+	Identifiers that differ only in case or in the order of the keys are bound only once, as in NVDA.
+	@param source: the source code of the module
+	@type source: str | bytes
+	@param moduleName: the name under which NVDA imports the module
+	@type moduleName: str
+	@return: fields of the gestures in the order of the Gesture constructor arguments
+	@rtype: list[base.GestureFields]
+	"""
+	rows: list[base.GestureFields] = []
+	for cls in ast.walk(ast.parse(source)):
+		if not isinstance(cls, ast.ClassDef):
+			continue
+		classCategory: str | None = None
+		# Canonical gesture key: the identifier as written in the source and the script name
+		bindings: dict[base.GestureKey, tuple[str, str]] = {}
+		# Script name: description, category, gestures from the decorator
+		scripts: dict[str, tuple[str | None, str | None, list[str]]] = {}
+		for node in cls.body:
+			if (
+				isinstance(node, ast.Assign)
+				and len(node.targets) == 1
+				and isinstance(node.targets[0], ast.Name)
+			):
+				if node.targets[0].id == "scriptCategory":
+					classCategory = literal(node.value)
+				elif node.targets[0].id == "__gestures" and isinstance(node.value, ast.Dict):
+					for key, value in zip(node.value.keys, node.value.values):
+						gesture, script = literal(key), literal(value)
+						if gesture and script:
+							bindings[base.gestureKey(gesture)] = (gesture, script)
+			elif isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef) and node.name.startswith("script_"):
+				description, category, gestures = ast.get_docstring(node), None, []
+				for decorator in node.decorator_list:
+					if not (
+						isinstance(decorator, ast.Call) and getattr(decorator.func, "id", None) == "script"
+					):
+						continue
+					for keyword in decorator.keywords:
+						if keyword.arg == "description":
+							description = literal(keyword.value)
+						elif keyword.arg == "category":
+							category = literal(keyword.value)
+						elif keyword.arg == "gesture":
+							gestures.extend(filter(None, [literal(keyword.value)]))
+						elif keyword.arg == "gestures":
+							gestures.extend(literals(keyword.value))
+				scripts[node.name[len("script_") :]] = (description, category, gestures)
+		for name, (_description, _category, gestures) in scripts.items():
+			for gesture in gestures:
+				bindings.setdefault(base.gestureKey(gesture), (gesture, name))
+		for gesture, name in bindings.values():
+			description, category, _gestures = scripts.get(name, (None, None, []))
+			if description:
+				rows.append((gesture, category or classCategory, description, cls.name, moduleName, name))
+			else:
+				rows.append((gesture, None, None, None, moduleName, name))
+	return rows
+
+
+def readManifest(text: str) -> dict[str, str]:
+	"""Read the single-line values of the add-on manifest.
+	The manifest is a configobj file, in which values such as the description and the changelog
+	can span several lines in triple quotes, so it cannot be read by configparser.
+	The multi-line values are skipped, since only the name and the version of the add-on are used.
+	@param text: the content of the manifest
+	@type text: str
+	@return: the keys mapped to the values without the surrounding quotes
+	@rtype: dict[str, str]
+	@raise ValueError: if a multi-line value is not terminated
+	"""
+	values: dict[str, str] = {}
+	quote: str | None = None
+	start = 0
+	for number, line in enumerate(text.splitlines(), 1):
+		if quote is not None:
+			if quote in line:
+				quote = None
+			continue
+		key, sep, value = line.partition("=")
+		key, value = key.strip(), value.strip()
+		if not sep or not key or key.startswith("#"):
+			continue
+		for triple in ('"""', "'''"):
+			if value.startswith(triple):
+				if value.count(triple) < 2:
+					quote, start = triple, number
+				break
+		else:
+			values[key] = value.strip("\"'")
+	if quote is not None:
+		raise ValueError("Unterminated multi-line value at line %d" % start)
+	return values
+
+
+def extractFromBundle(path: str | Path) -> dict[str, Any]:
+	"""Extract the input gestures from all Python sources of the add-on bundle.
+	@param path: the path to the ".nvda-addon" file
+	@type path: str | Path
+	@return: the name and version of the add-on, the sources that could not be parsed and the gestures
+	@rtype: dict[str, Any]
+	"""
+	rows: list[base.GestureFields] = []
+	errors: list[str] = []
+	info: dict[str, str] = {}
+	with zipfile.ZipFile(path) as bundle:
+		for member in bundle.namelist():
+			if member == "manifest.ini":
+				try:
+					info = readManifest(bundle.read(member).decode("utf-8", "replace"))
+				except ValueError as e:
+					errors.append("%s: %s" % (member, e))
+			elif member.endswith(".py"):
+				try:
+					rows.extend(extractFromSource(bundle.read(member), moduleNameOf(member)))
+				except (SyntaxError, ValueError) as e:
+					errors.append("%s: %s" % (member, e))
+	return {
+		"name": info.get("name") or Path(path).stem,
+		"version": info.get("version", ""),
+		"errors": errors,
+		"gestures": rows,
+	}
+
+
+def bundleHash(path: str | Path) -> str:
+	"""SHA-256 hash of the bundle content.
+	@param path: the path to the ".nvda-addon" file
+	@type path: str | Path
+	@return: hexadecimal digest
+	@rtype: str
+	"""
+	digest = hashlib.sha256()
+	with open(path, "rb") as stream:
+		while chunk := stream.read(1 << 20):
+			digest.update(chunk)
+	return digest.hexdigest()
+
+
+def analyzeBundle(path: str | Path, cache: Path | None = CACHE) -> dict[str, Any]:
+	"""Extract the input gestures from the bundle, using the result cached for the same content if any.
+	@param path: the path to the ".nvda-addon" file
+	@type path: str | Path
+	@param cache: the directory of cached results or None to disable the cache
+	@type cache: Path | None
+	@return: the result of extractFromBundle with the hash of the bundle
+	@rtype: dict[str, Any]
+	"""
+	digest = bundleHash(path)
+	cached = cache / ("%s.v%d.json" % (digest, PARSER_VERSION)) if cache else None
+	if cached and cached.is_file():
+		result = json.loads(cached.read_text(encoding="utf-8"))
+		result["gestures"] = [tuple(row) for row in result["gestures"]]
+	else:
+		result = extractFromBundle(path)
+		result["hash"] = digest
+		if cached:
+			cached.parent.mkdir(parents=True, exist_ok=True)
+			cached.write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+	result["file"] = str(path)
+	return result
+
+
+def predictConflicts(
+	bundles: list[dict[str, Any]], inventory: list[base.GestureFields], layout: str
+) -> dict[str, list[tuple[str, str]]]:
+	"""Conflicts that would appear after the installation of the add-ons.
+	Only the conflict groups that include at least one gesture of the add-ons
+	and at least two different scripts are returned.
+	@param bundles: the results of analyzeBundle
+	@type bundles: list[dict[str, Any]]
+	@param inventory: fields of the gestures already present on the workstation
+	@type inventory: list[base.GestureFields]
+	@param layout: the keyboard layout used to detect conflicts
+	@type layout: str
+	@return: module names and script descriptions or names grouped by canonical gesture keys
+	@rtype: dict[str, list[tuple[str, str]]]
+	"""
+	gestures = base.Gestures()
+	gestures.extend(inventory)
+	candidates: set[base.Gesture] = set()
+	for bundle in bundles:
+		for row in bundle["gestures"]:
+			gesture = base.Gesture(*row)
+			candidates.add(gesture)
+			gestures.append(gesture)
+	conflicts: dict[str, list[tuple[str, str]]] = {}
+	for key, group in base.GestureIndex(layout, gestures).duplicates().items():
+		# The same script bound to several spellings of the gesture does not conflict with itself
+		scripts = {(gest.moduleName, gest.className, gest.scriptName) for gest in group}
+		if len(scripts) > 1 and not candidates.isdisjoint(group):
+			conflicts[key] = sorted(
+				{(gest.moduleName, gest.displayName or gest.scriptName) for gest in group}
+			)
+	return conflicts
+
+
+def main() -> int:
+	"""Analyze the add-on bundles given in the command line.
+	@return: exit code, 1 if conflicts are predicted
+	@rtype: int
+	"""
+	parser = argparse.ArgumentParser(
+		prog="python -m tools.bundleGestures",
+		description="Extract input gestures from NVDA add-on bundles and predict their conflicts.",
+	)
+	parser.add_argument("bundles", nargs="+", type=Path, help=".nvda-addon files")
+	parser.add_argument("--inventory", type=Path, help="the inventory exported from a workstation")
+	parser.add_argument(
+		"--layout", help="keyboard layout used to detect conflicts instead of the exported one"
+	)
+	parser.add_argument("--cache", type=Path, default=CACHE, help="the directory of cached results")
+	parser.add_argument("--no-cache", action="store_true", help="do not read or write cached results")
+	parser.add_argument("--json", action="store_true", help="print the full results in JSON")
+	args = parser.parse_args()
+
+	bundles = [analyzeBundle(path, None if args.no_cache else args.cache) for path in args.bundles]
+	inventory: list[base.GestureFields] = []
+	layout = args.layout
+	if args.inventory:
+		meta, rows = export.readInventory(args.inventory)
+		inventory = list(rows)
+		layout = layout or meta.get("layout")
+	conflicts = predictConflicts(bundles, inventory, layout or "desktop")
+
+	if args.json:
+		json.dump({"bundles": bundles, "conflicts": conflicts}, sys.stdout, ensure_ascii=False, indent="\t")
+		print()
+		return 1 if conflicts else 0
+	for bundle in bundles:
+		unsigned = sum(1 for row in bundle["gestures"] if not row[2])
+		print(
+			f"{bundle['name']} {bundle['version']}: {len(bundle['gestures'])} gestures, {unsigned} unsigned",
+		)
+		for error in bundle["errors"]:
+			print(f"\tnot parsed: {error}")
+	print(f"Predicted conflicts: {len(conflicts)}")
+	for key, bindings in sorted(conflicts.items()):
+		print(f"\t{key}: " + "; ".join(f"{name} [{module}]" for module, name in bindings))
+	return 1 if conflicts else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())